@@ -2,6 +2,8 @@ import random
 import time
 from termcolor import colored
 
+from kernel import SUIT_INDEX, TRICK_RANK, card_index
+
 
 # This is the card game Euchre. Rules: https://bicyclecards.com/how-to-play/euchre/
 # Cards used are 9 up to Ace. 'Going alone' for a round is not a feature of this script
@@ -21,6 +23,15 @@ class Card:
         self.display = display
         self.card_string = card_string
         self.clincher = clincher
+        self.index = card_index(suit, rank)  # Position in the deck (0-23), used to look up kernel tables
+
+    def reset(self):
+        # Clears everything the card picked up during a round, so the same Card can be dealt again next round
+        self.point = 0
+        self.left_bower = False
+        self.left_bower_suit = self.suit
+        self.owner = None
+        self.clincher = False
 
     def show(self):
         if self.suit == 'Clubs':
@@ -61,6 +72,12 @@ class Deck:
         self.cards = []
         self.suits = ['Clubs', 'Diamonds', 'Hearts', 'Spades']
         self.ranks = ['9', '10', 'Jack', 'Queen', 'King', 'Ace']
+        self.all_cards = []  # The 24 Card objects. They are made once and reused every round
+        for suit in self.suits:  # for every suit and rank, creates a card that is added to cards list
+            for rank in self.ranks:
+                card = Card(suit, rank, point=0, clincher=False, left_bower=False, left_bower_suit=suit, owner=None,
+                            display='', card_string=f'{rank} of {suit}')
+                self.all_cards.append(card)
         self.build()
 
     def __len__(self):
@@ -71,36 +88,42 @@ class Deck:
             c.show()
 
     def build(self):
-        # This creates the deck of 24 cards
-        for suit in self.suits:  # for every suit and rank, creates a card that is added to cards list
-            for rank in self.ranks:
-                card = Card(suit, rank, point=0, clincher=False, left_bower=False, left_bower_suit=suit, owner=None,
-                            display='', card_string=f'{rank} of {suit}')
-                self.cards.append(card)
+        # This puts all 24 cards back in the deck, cleared of anything from the last round, and shuffles them.
+        # Dealing then just takes cards off the top, so the whole round comes from this one shuffle
+        for card in self.all_cards:
+            card.reset()
+        self.cards = list(self.all_cards)
+        random.shuffle(self.cards)
+
+    def deal_from(self, order):
+        # Stacks the deck in a given order of the 24 card indexes (0-23, see kernel.py) instead of shuffling
+        # The first 5 cards go to the first player dealt to, and so on. The flipped card is the 21st card
+        for card in self.all_cards:
+            card.reset()
+        self.cards = [self.all_cards[i] for i in order]
 
     def destroy(self):
         # This empties out the cards in the deck. Used at the end of each round to help simulate reshuffling
         self.cards = []
 
     def deal_cards(self, player_name):
-        # Deals 5 random cards to each player
-        for i in range(5):
-            random_card = random.choice(self.cards)
-            self.cards.remove(random_card)
-            player_name.hand.append(random_card)
+        # Deals the top 5 cards of the shuffled deck to a player
+        player_name.hand.extend(self.cards[:5])
+        del self.cards[:5]
         return player_name.hand
 
     def flip_card(self):
         # Flips one card on the table. Players have option to tell dealer to pick up this card to make its suit clincher
         # This is called after all players have 5 cards
-        flipped = random.choice(self.cards)
+        flipped = self.cards[0]
         return flipped
 
 
 class Player:
-    def __init__(self, number):
+    def __init__(self, number, human=False):
         self.number = number
         self.name = 'Player' + str(number)
+        self.human = human  # True for the seat controlled by the user through input()
         self.hand = []
         self.card_values = [0, 0, 0, 0]
         self.tricks_won = 0
@@ -157,20 +180,28 @@ class Team:
 # If their hand has 30+ points in a given suit, they will call it clincher
 points_to_call_suit = 30
 
-# Create the 4 players and the deck out of the 24 possible cards.
-# Randomly assign 5 cards to each player (no repeats)
-# Flip one remaining card
+# Set to False to silence the table talk printed by the computer players. Headless code uses Quiet instead, which
+# puts the setting back when it is done
+verbose = True
+
+
+class Quiet:
+    # Context manager that turns verbose off for the duration of a with block
+    def __enter__(self):
+        global verbose
+        self.saved = verbose
+        verbose = False
+        return self
 
-d = Deck()
-d.show()
+    def __exit__(self, *exc_info):
+        global verbose
+        verbose = self.saved
 
-player_1 = Player(1)
-player_2 = Player(2)
-player_3 = Player(3)
-player_4 = Player(4)
 
-team_1 = Team(player_1, player_3, 0, 0)
-team_2 = Team(player_2, player_4, 0, 0)
+def announce(message):
+    # Prints a message from the computer players, unless output has been turned off with the verbose variable
+    if verbose:
+        print(message)
 
 
 def user_order_up_card(p, flipped_c, suit, dealer_):
@@ -205,7 +236,7 @@ def user_order_up_card(p, flipped_c, suit, dealer_):
                     dealer_.hand.pop(dealer_.hand.index(discard))
                 except ValueError:
                     len_hand = len(dealer_.hand)
-                    dealer_.hand.pop(random.randint(0, len_hand))
+                    dealer_.hand.pop(random.randint(0, len_hand - 1))
                 was_suit_picked = True
                 caller = p
 
@@ -387,7 +418,7 @@ def computer_order_up_card(p, flipped_c, suit, dealer_, pts_to_call_suit):
         suit = flipped_c.suit
         was_card_picked_up = True
         caller = p
-        if dealer_.name == 'Player1':  # If player1 is the dealer, then the user has option of which card to drop
+        if dealer_.human:  # If the user is the dealer, then they have the option of which card to drop
             dealer_ = user_drop_card(dealer_, flipped_c, p)
         else:  # If players 2-4 are dealer, make dealer choose lowest off-suit card to drop
             dealer_.hand.append(flipped_c)
@@ -408,7 +439,7 @@ def computer_order_up_card(p, flipped_c, suit, dealer_, pts_to_call_suit):
     else:
         was_card_picked_up = False
         caller = None
-        print(f'{p.name}: Pass')
+        announce(f'{p.name}: Pass')
     return p, suit, was_card_picked_up, dealer_, caller
 
 
@@ -443,9 +474,9 @@ def computer_pick_up_card(p, flipped_c, suit, pts_to_call_suit):
             p.hand.pop(p.hand.index(discard))
         except ValueError:  # If the dealer has no non-clincher cards to discard, discard a random one
             len_hand = len(p.hand)
-            p.hand.pop(random.randint(0, len_hand))
+            p.hand.pop(random.randint(0, len_hand - 1))
     else:
-        print(f'{p.name}: Pass')
+        announce(f'{p.name}: Pass')
 
     return p, suit, was_card_picked_up, caller
 
@@ -459,14 +490,14 @@ def computer_choose_call_suit(p, flipped_c, suit, pts_to_call_suit):
     best_suit_idx = p.card_values.index(max(p.card_values))
     if p.card_values[best_suit_idx] < pts_to_call_suit:
         caller = None
-        print(f'{p.name}: Pass')
+        announce(f'{p.name}: Pass')
         pass
     elif suits[best_suit_idx] == flipped_c.suit:  # Comp may not call suit that was turned down earlier
         p.card_values[best_suit_idx] = 0
         second_best_suit_idx = p.card_values.index(max(p.card_values))
         if p.card_values[second_best_suit_idx] < pts_to_call_suit:
             caller = None
-            print(f'{p.name}: Pass')
+            announce(f'{p.name}: Pass')
             pass
         else:
             was_suit_declared = True
@@ -584,79 +615,13 @@ def assign_points(hand, best, lead):
     # This is called at the start of every round after the 1st card is played
     # This gives point values to every card that could potentially win the round (clincher > suit of 1st card)
     # This will act as a ranking system to determine which was the best card played that round
+    # The point values are looked up in kernel.TRICK_RANK, which is built once when the game starts:
+    # clincher 7-13 (9 up to the right bower), suit of the 1st card 1-6 (9 up to Ace), anything else 0
 
-    c_clincher = {'Jack of Clubs': 13, 'Jack of Spades': 12, 'Ace of Clubs': 11, 'King of Clubs': 10,
-                  'Queen of Clubs': 9, '10 of Clubs': 8, '9 of Clubs': 7}
-    d_clincher = {'Jack of Diamonds': 13, 'Jack of Hearts': 12, 'Ace of Diamonds': 11, 'King of Diamonds': 10,
-                  'Queen of Diamonds': 9, '10 of Diamonds': 8, '9 of Diamonds': 7}
-    h_clincher = {'Jack of Hearts': 13, 'Jack of Diamonds': 12, 'Ace of Hearts': 11, 'King of Hearts': 10,
-                  'Queen of Hearts': 9, '10 of Hearts': 8, '9 of Hearts': 7}
-    s_clincher = {'Jack of Spades': 13, 'Jack of Clubs': 12, 'Ace of Spades': 11, 'King of Spades': 10,
-                  'Queen of Spades': 9, '10 of Spades': 8, '9 of Spades': 7}
-    c_lead = {'Ace of Clubs': 6, 'King of Clubs': 5, 'Queen of Clubs': 4, 'Jack of Clubs': 3,
-              '10 of Clubs': 2, '9 of Clubs': 1}
-    d_lead = {'Ace of Diamonds': 6, 'King of Diamonds': 5, 'Queen of Diamonds': 4, 'Jack of Diamonds': 3,
-              '10 of Diamonds': 2, '9 of Diamonds': 1}
-    h_lead = {'Ace of Hearts': 6, 'King of Hearts': 5, 'Queen of Hearts': 4, 'Jack of Hearts': 3,
-              '10 of Hearts': 2, '9 of Hearts': 1}
-    s_lead = {'Ace of Spades': 6, 'King of Spades': 5, 'Queen of Spades': 4, 'Jack of Spades': 3,
-              '10 of Spades': 2, '9 of Spades': 1}
-
-    if best == 'Clubs':
-        if lead.left_bower_suit == 'Spades':
-            s_lead.pop('Jack of Spades')
-            c_clincher.update(s_lead)
-        elif lead.left_bower_suit == 'Hearts':
-            c_clincher.update(h_lead)
-        elif lead.left_bower_suit == 'Diamonds':
-            c_clincher.update(d_lead)
-        elif lead.left_bower_suit == 'Clubs':
-            pass
-        lead.point = c_clincher.get(lead.card_string, 0)
-        for crd in hand:
-            crd.point = c_clincher.get(crd.card_string, 0)
-
-    elif best == 'Diamonds':
-        if lead.left_bower_suit == 'Clubs':
-            d_clincher.update(c_lead)
-        elif lead.left_bower_suit == 'Diamonds':
-            pass
-        elif lead.left_bower_suit == 'Hearts':
-            h_lead.pop('Jack of Hearts')
-            d_clincher.update(h_lead)
-        elif lead.left_bower_suit == 'Spades':
-            d_clincher.update(s_lead)
-        lead.point = d_clincher.get(lead.card_string, 0)
-        for crd in hand:
-            crd.point = d_clincher.get(crd.card_string, 0)
-
-    elif best == 'Hearts':
-        if lead.left_bower_suit == 'Clubs':
-            h_clincher.update(c_lead)
-        elif lead.left_bower_suit == 'Diamonds':
-            d_lead.pop('Jack of Diamonds')
-            h_clincher.update(d_lead)
-        elif lead.left_bower_suit == 'Hearts':
-            pass
-        elif lead.left_bower_suit == 'Spades':
-            h_clincher.update(s_lead)
-        lead.point = h_clincher.get(lead.card_string, 0)
-        for crd in hand:
-            crd.point = h_clincher.get(crd.card_string, 0)
-
-    elif best == 'Spades':
-        if lead.left_bower_suit == 'Clubs':
-            c_lead.pop('Jack of Clubs')
-            s_clincher.update(c_lead)
-        elif lead.left_bower_suit == 'Diamonds':
-            s_clincher.update(d_lead)
-        elif lead.left_bower_suit == 'Hearts':
-            s_clincher.update(h_lead)
-        elif lead.left_bower_suit == 'Spades':
-            pass
-        lead.point = s_clincher.get(lead.card_string, 0)
-        for crd in hand:
-            crd.point = s_clincher.get(crd.card_string, 0)
+    ranks = TRICK_RANK[SUIT_INDEX[best]][SUIT_INDEX[lead.left_bower_suit]]
+    lead.point = ranks[lead.index]
+    for crd in hand:
+        crd.point = ranks[crd.index]
     return hand
 
 
@@ -669,80 +634,81 @@ def assign_clincher(best, hand):
     return hand
 
 
-def computer_follow_suit(lead_c, hand, played):
-    if len(hand) == 1:
-        card_to_play = hand[0]
-    else:
-        currently_winning_card = played[0]
-        cards_to_follow_suit = {}
-        for c in hand:
-            if c.left_bower_suit == lead_c.left_bower_suit:  # If the card in hand has the same suit as card lead then..
-                cards_to_follow_suit[c] = c.point  # Add that card to dict of cards that follow suit
-            else:
-                pass
-
-        for played_card in played:  # This looks at all cards played already and determines which is winning so far
-            if played_card.point > currently_winning_card.point:
-                currently_winning_card = played_card
-
-        best_card = max(cards_to_follow_suit, key=cards_to_follow_suit.get)
-        worst_card = min(cards_to_follow_suit, key=cards_to_follow_suit.get)
-
-        if best_card.point > currently_winning_card.point:
-            if len(played) == 3 and played.index(currently_winning_card) == 1:
-                card_to_play = worst_card
-            else:
-                card_to_play = best_card
-        else:
-            card_to_play = worst_card
-    hand.pop(hand.index(card_to_play))
-
-    return card_to_play, hand
-
-
-def computer_play_clincher(hand, played, winner, calling_player):
-    clinchers = {}
-    currently_winning_card = played[0]
-    players_yet_to_play = ['1', '2', '3', '4']
-
-    for played_card in played:
-        if played_card.point > currently_winning_card.point:
-            currently_winning_card = played_card
-        players_yet_to_play.pop(players_yet_to_play.index(str(played_card.owner)))
-
-    for card in hand:  # this makes a dictionary of the clinchers in the computers hand. This is used to
-        if card.get_clincher:  # decide which card to play later
-            clinchers[card] = card.point
-
-    card_to_play = max(clinchers, key=clinchers.get)
-
-    for card in played:
-        winning_card = played[0]
-        if card.point > winning_card.point:
-            winning_card = card
+class Trick(list):
+    # The cards played to a trick so far, in order. As each card is appended it keeps track of the card winning the
+    # trick, so it never has to be found again by looking through the cards: winning_card, winner (the seat that
+    # played it) and winning_point (its point value). Ties go to the card played first, as in best_card_played
+    # Cards must have their points assigned (assign_points) before they are appended
+    def __init__(self, cards=()):
+        super().__init__()
+        self.winning_card = None
+        self.winner = None
+        self.winning_point = -1
+        for c in cards:
+            self.append(c)
+
+    def append(self, card):
+        super().append(card)
+        if card.point > self.winning_point:
+            self.winning_card = card
+            self.winner = card.owner
+            self.winning_point = card.point
+
+
+def following_cards(lead_c, hand):
+    # The legal move generator for following: the cards in hand that follow the suit of the card lead. When this is
+    # empty any card in the hand may be played
+    lead_suit = lead_c.left_bower_suit
+    return [c for c in hand if c.left_bower_suit == lead_suit]
+
+
+def playable_cards(lead_c, hand):
+    # Every card the player may play to a trick lead with lead_c. These are what the computer policies choose from
+    # (see computer_play_card): either all of them follow suit, or none do and any card may be played
+    return following_cards(lead_c, hand) or hand
+
+
+def follow_suit_card(following, played):
+    # The computer's choice from the cards that follow suit: the best of them if it takes the lead, unless it is last
+    # to play and its partner is winning, otherwise the worst. played is a Trick
+    if len(following) == 1:
+        return following[0]
+    currently_winning_card = played.winning_card
+
+    best_card = max(following, key=Card.get_point)
+    worst_card = min(following, key=Card.get_point)
+
+    if best_card.point > currently_winning_card.point:
+        if len(played) == 3 and played.winner == played[1].owner:
+            return worst_card
+        return best_card
+    return worst_card
+
+
+def clincher_card(hand, played):
+    # The card the computer plays to try to take the trick when it can't follow suit, or None if it shouldn't:
+    # its best card can't beat the card winning the trick, or it plays last and its partner is winning
+    # Every card in hand is counted as a candidate, the way the game always has. played is a Trick
+    card_to_play = max(hand, key=Card.get_point)
+    winning_card = played.winning_card
 
     if card_to_play.point < winning_card.point:  # If the computer's clincher cannot win the round,
-        raise ValueError  # then raise an error and discard a bad card instead
+        return None  # then discard a bad card instead
 
-    elif len(played) == 3 and played.index(winning_card) == 1:  # If the computer is last to play and teammate is
-        raise ValueError  # winning, raise ValueError to discard bad card
+    elif len(played) == 3 and played.winner == played[1].owner:  # If the computer is last to play and teammate is
+        return None  # winning, discard a bad card
 
-    elif len(clinchers) > 1 and calling_player.number not in players_yet_to_play:  # If comp has >1 clincher and
-        lowest_winning_card = card_to_play  # the player who called suit has yet to play, play lowest clincher
-        for c in clinchers:  # that will still take the lead in the trick
+    elif len(hand) > 1:  # If comp has >1 clincher, play the lowest clincher that will still take the lead in the trick
+        lowest_winning_card = card_to_play
+        for c in hand:
             if winning_card.point < c.point < lowest_winning_card.point:
                 lowest_winning_card = c
         card_to_play = lowest_winning_card
-        hand.pop(hand.index(card_to_play))
-    else:
-        hand.pop(hand.index(card_to_play))
-    return card_to_play, hand
+    return card_to_play
 
 
-def computer_discard_bad_card(hand, suit):
-    # This makes the computer discard their lowest rank, non-clincher card
-    # If all cards are clincher, the lowest clincher will be played
-    bad_card = None
+def discard_card(hand, suit):
+    # The computer's lowest rank, non-clincher card. If all cards are clincher, the lowest clincher
     ranks = ['9', '10', 'Jack', 'Queen', 'King', 'Ace']
     clincher_ranks = ['9', '10', 'Queen', 'King', 'Ace', 'Jack']
 
@@ -754,20 +720,63 @@ def computer_discard_bad_card(hand, suit):
         for rank in clincher_ranks:
             for each_card in hand:
                 if each_card.get_rank() == rank:
-                    bad_card = each_card
-                    break
-            else:
-                continue
-            break
+                    return each_card
     else:
         for rank in ranks:
             for each_card in hand:
                 if each_card.get_rank() == rank and each_card.left_bower_suit != suit:
-                    bad_card = each_card
-                    break
-            else:
-                continue
-            break
+                    return each_card
+    return None
+
+
+def computer_play_card(hand, lead_c, played, partner_winning, suit, follow=None, clincher=None, discard=None):
+    # Picks, removes and returns (card, hand) for a computer player following the cards played (a Trick): follow suit
+    # if it can, otherwise try to take the trick with a clincher unless its partner is already winning, else discard
+    # follow, clincher and discard are the policies choosing from the legal cards; clincher returns None to pass
+    # Left as None they are follow_suit_card, clincher_card and discard_card, looked up when called (not bound as
+    # defaults) so that replacing them in this module, as profiling.enable does, takes effect
+    follow = follow or follow_suit_card
+    clincher = clincher or clincher_card
+    discard = discard or discard_card
+    legal = playable_cards(lead_c, hand)
+    if legal[0].left_bower_suit == lead_c.left_bower_suit:
+        card = follow(legal, played)
+    else:
+        card = None if partner_winning else clincher(legal, played)
+        if card is None:
+            card = discard(legal, suit)
+    hand.remove(card)
+    return card, hand
+
+
+def computer_follow_suit(lead_c, hand, played):
+    # Plays follow_suit_card, raising ValueError if the computer can't follow suit
+    if len(hand) == 1:
+        card_to_play = hand[0]
+    else:
+        following = following_cards(lead_c, hand)
+        if not following:
+            raise ValueError
+        card_to_play = follow_suit_card(following, played if isinstance(played, Trick) else Trick(played))
+    hand.pop(hand.index(card_to_play))
+
+    return card_to_play, hand
+
+
+def computer_play_clincher(hand, played, winner, calling_player):
+    # Plays clincher_card, raising ValueError when the computer should discard instead. winner and calling_player are
+    # not used; they are kept so existing callers don't break
+    card_to_play = clincher_card(hand, played if isinstance(played, Trick) else Trick(played))
+    if card_to_play is None:
+        raise ValueError
+    hand.pop(hand.index(card_to_play))
+    return card_to_play, hand
+
+
+def computer_discard_bad_card(hand, suit):
+    # This makes the computer discard their lowest rank, non-clincher card
+    # If all cards are clincher, the lowest clincher will be played
+    bad_card = discard_card(hand, suit)
     hand.pop(hand.index(bad_card))
     return bad_card, hand
 
@@ -776,31 +785,7 @@ def user_follow_suit(lead_c, hand, played):
     # This allows the user to follow suit of the first card played
     # User must follow suit, per rules of Euchre
     # If user cannot follow suit, ValueError is raised, and user is allowed to choose any card
-    legal_cards = []
-    if lead_c.left_bower_suit == 'Clubs':
-        for c in hand:
-            if c.left_bower_suit == 'Clubs':
-                legal_cards.append(c)
-            else:
-                pass
-    if lead_c.left_bower_suit == 'Diamonds':
-        for c in hand:
-            if c.left_bower_suit == 'Diamonds':
-                legal_cards.append(c)
-            else:
-                pass
-    if lead_c.left_bower_suit == 'Hearts':
-        for c in hand:
-            if c.left_bower_suit == 'Hearts':
-                legal_cards.append(c)
-            else:
-                pass
-    if lead_c.left_bower_suit == 'Spades':
-        for c in hand:
-            if c.left_bower_suit == 'Spades':
-                legal_cards.append(c)
-            else:
-                pass
+    legal_cards = following_cards(lead_c, hand)
 
     if len(legal_cards) == 0:
         raise ValueError
@@ -834,17 +819,6 @@ def user_choose_card(hand):
             break
 
 
-def determine_winning_trick_so_far(played):
-    # This function determines which played is currently winning the trick, as in who has played the best card so far
-    # Used to help the computer make strategic decisions about which card to play
-
-    points_scored = {}
-    for pc in played:
-        points_scored[pc.owner] = pc.point
-    player_in_lead = max(points_scored, key=points_scored.get)
-    return player_in_lead
-
-
 def assign_point_trick_winner(winning_play, play1, play2, play3, play4):
     #  Keeps track of the numbers of tricks each player has won
     if winning_play == 1:
@@ -858,23 +832,38 @@ def assign_point_trick_winner(winning_play, play1, play2, play3, play4):
     return play1, play2, play3, play4
 
 
+def best_card_played(played):
+    # Returns the card with the highest point value out of the cards played so far. Ties go to the card played first
+    return max(played, key=Card.get_point)
+
+
 def determine_trick_winner(played):
     # After all 4 cards are played, this function finds the one with the highest point value. that card wins the trick
     # and the winning player (owner of that card) is returned
-    cards_points = {}
-    for c in played:
-        cards_points[c] = c.point
     print('\n')
-    for crd in cards_points:
+    for crd in played:
         print(f'{crd.display} (P{crd.owner})')
         time.sleep(.4)
     time.sleep(1)
-    winning_card = max(cards_points, key=cards_points.get)
+    winning_card = best_card_played(played)
     winner = winning_card.owner
     print(f'\nPlayer{winner} won with the {winning_card.display}')
     return winner
 
 
+def score_round(team1_tricks, team2_tricks, caller_number):
+    # Returns the points (team1, team2) scored at the end of a round. The team that took the most tricks scores 1 point,
+    # or 2 points if they took all 5 tricks or if the other team called clincher (the callers were euchred)
+    caller_on_team1 = caller_number in (1, 3)
+    if team1_tricks > team2_tricks:
+        if not caller_on_team1 or team1_tricks == 5:
+            return 2, 0
+        return 1, 0
+    if caller_on_team1 or team2_tricks == 5:
+        return 0, 2
+    return 0, 1
+
+
 def play_trick(p1, p2, p3, p4, round_leader, best_suit, caller):
     # The user can now play a card by choosing the index (1-5) of the card to play. That suit is lead
     # and must be followed by other players
@@ -885,191 +874,41 @@ def play_trick(p1, p2, p3, p4, round_leader, best_suit, caller):
     p3.hand = assign_clincher(best_suit, p3.hand)
     p4.hand = assign_clincher(best_suit, p4.hand)
 
-    if round_leader == 1:
-        lead_card, p1.hand = user_lead_card(p1.hand)
-    elif round_leader == 2:
-        lead_card, p2.hand = computer_lead_card(p2.hand)
-    elif round_leader == 3:
-        lead_card, p3.hand = computer_lead_card(p3.hand)
-    elif round_leader == 4:
-        lead_card, p4.hand = computer_lead_card(p4.hand)
-
-    played_cards = [lead_card]
-    lead_suit = lead_card.left_bower_suit
+    players = [p1, p2, p3, p4]
+    leader = players[round_leader - 1]
+    if leader.human:
+        lead_card, leader.hand = user_lead_card(leader.hand)
+    else:
+        lead_card, leader.hand = computer_lead_card(leader.hand)
 
     p1.hand = assign_points(p1.hand, best_suit, lead_card)
     p2.hand = assign_points(p2.hand, best_suit, lead_card)
     p3.hand = assign_points(p3.hand, best_suit, lead_card)
     p4.hand = assign_points(p4.hand, best_suit, lead_card)
 
-    time.sleep(1.75)
-    if round_leader == 1:
-        player_in_lead = 1
-        try:
-            p2_card, p2.hand = computer_follow_suit(lead_card, p2.hand, played_cards)
-        except ValueError:
-            try:
-                p2_card, p2.hand = computer_play_clincher(p2.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p2_card, p2.hand = computer_discard_bad_card(p2.hand, best_suit)
-
-        played_cards.append(p2_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p3_card, p3.hand = computer_follow_suit(lead_card, p3.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 1:
-                    raise ValueError
-                else:
-                    p3_card, p3.hand = computer_play_clincher(p3.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p3_card, p3.hand = computer_discard_bad_card(p3.hand, best_suit)
-
-        played_cards.append(p3_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p4_card, p4.hand = computer_follow_suit(lead_card, p4.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 2:
-                    raise ValueError
-                else:
-                    p4_card, p4.hand = computer_play_clincher(p4.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p4_card, p4.hand = computer_discard_bad_card(p4.hand, best_suit)
-
-        played_cards.append(p4_card)
-
-    elif round_leader == 2:
-        player_in_lead = 2
-        try:
-            p3_card, p3.hand = computer_follow_suit(lead_card, p3.hand, played_cards)
-        except ValueError:
-            try:
-                p3_card, p3.hand = computer_play_clincher(p3.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p3_card, p3.hand = computer_discard_bad_card(p3.hand, best_suit)
-
-        played_cards.append(p3_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p4_card, p4.hand = computer_follow_suit(lead_card, p4.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 2:
-                    raise ValueError
-                else:
-                    p4_card, p4.hand = computer_play_clincher(p4.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p4_card, p4.hand = computer_discard_bad_card(p4.hand, best_suit)
-
-        played_cards.append(p4_card)
-
-        try:
-            print('\nThe cards played so far are: ')
-            for pc in played_cards:
-                time.sleep(.4)
-                print(f'{pc.display} (P{pc.owner})')
-            time.sleep(1)
-            print('\nYour hand is: \n')
-            for c in p1.hand:
-                print(c.display)
-            p1_card, p1.hand = user_follow_suit(lead_card, p1.hand, played_cards)
-        except ValueError:
-            p1_card, p1.hand = user_choose_card(p1.hand)
-
-        played_cards.append(p1_card)
-
-    elif round_leader == 3:
-        player_in_lead = 3
-        try:
-            p4_card, p4.hand = computer_follow_suit(lead_card, p4.hand, played_cards)
-        except ValueError:
-            try:
-                p4_card, p4.hand = computer_play_clincher(p4.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p4_card, p4.hand = computer_discard_bad_card(p4.hand, best_suit)
-
-        played_cards.append(p4_card)
+    played_cards = Trick([lead_card])
 
-        try:
-            print('\nThe cards played so far are: ')
-            for pc in played_cards:
-                time.sleep(.4)
-                print(f'{pc.display} (P{pc.owner})')
-            time.sleep(1)
-            print('\nYour hand is: \n')
-            for c in p1.hand:
-                print(c.display)
-            p1_card, p1.hand = user_follow_suit(lead_card, p1.hand, played_cards)
-        except ValueError:
-            p1_card, p1.hand = user_choose_card(p1.hand)
-
-        played_cards.append(p1_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p2_card, p2.hand = computer_follow_suit(lead_card, p2.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 4:
-                    raise ValueError
-                else:
-                    p2_card, p2.hand = computer_play_clincher(p2.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p2_card, p2.hand = computer_discard_bad_card(p2.hand, best_suit)
-
-        played_cards.append(p2_card)
-
-    elif round_leader == 4:
-        player_in_lead = 4
-        try:
+    time.sleep(1.75)
+    for i in range(1, 4):  # The other 3 players follow in turn, to the left of the leader
+        p = players[(round_leader + i - 1) % 4]
+        if p.human:
             print('\nThe cards played so far are: ')
             for pc in played_cards:
                 time.sleep(.4)
                 print(f'{pc.display} (P{pc.owner})')
             time.sleep(1)
             print('\nYour hand is: \n')
-            for c in p1.hand:
+            for c in p.hand:
                 print(c.display)
-
-            p1_card, p1.hand = user_follow_suit(lead_card, p1.hand, played_cards)
-        except ValueError:
-            p1_card, p1.hand = user_choose_card(p1.hand)
-
-        played_cards.append(p1_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p2_card, p2.hand = computer_follow_suit(lead_card, p2.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 4:
-                    raise ValueError
-                else:
-                    p2_card, p2.hand = computer_play_clincher(p2.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p2_card, p2.hand = computer_discard_bad_card(p2.hand, best_suit)
-
-        played_cards.append(p2_card)
-        player_in_lead = determine_winning_trick_so_far(played_cards)
-
-        try:
-            p3_card, p3.hand = computer_follow_suit(lead_card, p3.hand, played_cards)
-        except ValueError:
-            try:
-                if player_in_lead == 1:
-                    raise ValueError
-                else:
-                    p3_card, p3.hand = computer_play_clincher(p3.hand, played_cards, player_in_lead, caller)
-            except ValueError:
-                p3_card, p3.hand = computer_discard_bad_card(p3.hand, best_suit)
-
-        played_cards.append(p3_card)
+            if following_cards(lead_card, p.hand):
+                card, p.hand = user_follow_suit(lead_card, p.hand, played_cards)
+            else:
+                card, p.hand = user_choose_card(p.hand)
+        else:
+            partner = (p.number + 1) % 4 + 1
+            partner_winning = played_cards.winner == partner
+            card, p.hand = computer_play_card(p.hand, lead_card, played_cards, partner_winning, best_suit)
+        played_cards.append(card)
 
     winning_player = determine_trick_winner(played_cards)
 
@@ -1272,20 +1111,17 @@ def play_round(team1, team2, player1, player2, player3, player4, deck, dlr_index
     team1.tricks = player1.tricks_won + player3.tricks_won
     team2.tricks = player2.tricks_won + player4.tricks_won
 
-    if team1.tricks > team2.tricks:
-        if calling_player.name == 'Player2' or calling_player.name == 'Player4' or team1.tricks == 5:
-            team1.points += 2
-            print(f'\nYou win! Team 1 won, taking {team1.tricks} tricks. Your team scored 2 points!')
-        else:
-            team1.points += 1
-            print(f'\nYou win! Team 1 won, taking {team1.tricks} tricks. Your team scored 1 point!')
-    elif team2.tricks > team1.tricks:
-        if calling_player.name == 'Player1' or calling_player.name == 'Player3' or team2.tricks == 5:
-            team2.points += 2
-            print(f'\nYou lost this round! Team 2 won, taking {team2.tricks} tricks. They scored 2 points!')
-        else:
-            team2.points += 1
-            print(f'\nYou lost this round! Team 2 won, taking {team2.tricks} tricks. They scored 1 point!')
+    team1_points, team2_points = score_round(team1.tricks, team2.tricks, calling_player.number)
+    team1.points += team1_points
+    team2.points += team2_points
+    if team1_points == 2:
+        print(f'\nYou win! Team 1 won, taking {team1.tricks} tricks. Your team scored 2 points!')
+    elif team1_points == 1:
+        print(f'\nYou win! Team 1 won, taking {team1.tricks} tricks. Your team scored 1 point!')
+    elif team2_points == 2:
+        print(f'\nYou lost this round! Team 2 won, taking {team2.tricks} tricks. They scored 2 points!')
+    else:
+        print(f'\nYou lost this round! Team 2 won, taking {team2.tricks} tricks. They scored 1 point!')
 
     time.sleep(2.5)
     print(f'\nThe game score is {team1.points}-{team2.points}')
@@ -1294,21 +1130,43 @@ def play_round(team1, team2, player1, player2, player3, player4, deck, dlr_index
     return team1, team2, player1, player2, player3, player4
 
 
-players = {player_1: 1, player_2: 2, player_3: 3, player_4: 4}
-dealer, dealer_index = random.choice(list(players.items()))
-leader_index = (dealer_index % 4) + 1
-
-while team_1.points < 11 and team_2.points < 11:
-    team_1, team_2, player_1, player_2, player_3, player_4 = play_round(team_1, team_2, player_1, player_2, player_3,
-                                                                        player_4, d, dealer_index, dealer, leader_index)
-    dealer_index = dealer_index % 4 + 1
-    leader_index = leader_index % 4 + 1
-    dealer = list(players.keys())[list(players.values()).index(dealer_index)]
-    d.destroy()
-    d.build()
-    if team_1.points >= 11:
-        print(f'You win the game! Final Score: {team_1.points}-{team_2.points}')
-        break
-    elif team_2.points >= 11:
-        print(f'You lose the game! Final Score: {team_1.points}-{team_2.points}')
-        break
+def main():
+    # Runs the interactive game in the terminal until one team reaches 11 points
+    # Create the 4 players and the deck out of the 24 possible cards.
+    # Randomly assign 5 cards to each player (no repeats)
+    # Flip one remaining card
+
+    d = Deck()
+    d.show()
+
+    player_1 = Player(1, human=True)
+    player_2 = Player(2)
+    player_3 = Player(3)
+    player_4 = Player(4)
+
+    team_1 = Team(player_1, player_3, 0, 0)
+    team_2 = Team(player_2, player_4, 0, 0)
+
+    players = {player_1: 1, player_2: 2, player_3: 3, player_4: 4}
+    dealer, dealer_index = random.choice(list(players.items()))
+    leader_index = (dealer_index % 4) + 1
+
+    while team_1.points < 11 and team_2.points < 11:
+        team_1, team_2, player_1, player_2, player_3, player_4 = play_round(team_1, team_2, player_1, player_2,
+                                                                            player_3, player_4, d, dealer_index,
+                                                                            dealer, leader_index)
+        dealer_index = dealer_index % 4 + 1
+        leader_index = leader_index % 4 + 1
+        dealer = list(players.keys())[list(players.values()).index(dealer_index)]
+        d.destroy()
+        d.build()
+        if team_1.points >= 11:
+            print(f'You win the game! Final Score: {team_1.points}-{team_2.points}')
+            break
+        elif team_2.points >= 11:
+            print(f'You lose the game! Final Score: {team_1.points}-{team_2.points}')
+            break
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import Euchre
+from Euchre import (Deck, Player, Team, Trick, assign_clincher, assign_left_bower, assign_points,
+                    computer_choose_call_suit, computer_follow_suit, computer_lead_card, computer_must_call_suit,
+                    computer_order_up_card, computer_pick_up_card, computer_play_card, computer_play_clincher,
+                    determine_trick_winner, play_round, play_trick)
+from kernel import SUITS
+from simulate import play_computer_game
+
+
+# Benchmarks for the rules and the game loop
+# Micro benchmarks time single calls of the Euchre.py functions on a fixed set of positions made from seeded deals,
+# macro benchmarks time a whole play_trick, play_round and computer-only game. play_trick and play_round are the
+# interactive functions, so they run inside Headless: no sleeps, no printing, and seat 1 played by the computer
+#
+# Every benchmark is run for a few warmup rounds, then timed `repeats` times. Each repeat calls it enough times to
+# last at least min_time seconds and the result is the time per operation. The median and the interquartile range
+# (IQR) of the repeats are reported, which hold still from run to run far better than the mean and the minimum
+#
+#   python bench.py                      run everything
+#   python bench.py --save base.json     ...and save the results as a baseline
+#   python bench.py --compare base.json  ...and compare against a saved baseline
+#   python bench.py -k follow            only benchmarks with 'follow' in their name
+
+SCENARIOS = 200  # Positions each micro benchmark cycles through
+SEED = 2024
+
+
+class Headless:
+    # Context manager that turns the interactive Euchre.py functions into headless ones for the duration of a with
+    # block: time.sleep and print do nothing, and seat 1's user_* decisions are made by the computer functions
+    def __enter__(self):
+        self.saved = {name: getattr(Euchre, name) for name in USER_FUNCTIONS}
+        self.saved_time = Euchre.time
+        Euchre.time = NoSleep
+        Euchre.print = no_print
+        for name, function in USER_FUNCTIONS.items():
+            setattr(Euchre, name, function)
+        return self
+
+    def __exit__(self, *exc_info):
+        Euchre.time = self.saved_time
+        del Euchre.print
+        for name, function in self.saved.items():
+            setattr(Euchre, name, function)
+
+
+class NoSleep:
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def no_print(*args, **kwargs):
+    pass
+
+
+USER_FUNCTIONS = {
+    'user_order_up_card': lambda p, flipped_c, suit, dealer_:
+        computer_order_up_card(p, flipped_c, suit, dealer_, Euchre.points_to_call_suit),
+    'user_pick_up_card': lambda p, flipped_c, suit:
+        computer_pick_up_card(p, flipped_c, suit, Euchre.points_to_call_suit),
+    'user_choose_call_suit': lambda p, flipped_c, suit:
+        computer_choose_call_suit(p, flipped_c, suit, Euchre.points_to_call_suit),
+    'user_must_call_suit': lambda p, suit, flipped_c: computer_must_call_suit(p, flipped_c, suit),
+    'user_lead_card': computer_lead_card,
+    'user_follow_suit': computer_follow_suit,
+    'user_choose_card': computer_lead_card,  # Can't follow suit, so any card will do
+}
+
+
+class Position:
+    # A dealt round just after the first card of a trick was led, with its own deck so the card objects of different
+    # positions never share point or clincher values
+    def __init__(self, rng):
+        self.deck = Deck()
+        self.deck.build()
+        self.players = [Player(1), Player(2), Player(3), Player(4)]
+        for p in self.players:
+            self.deck.deal_cards(p)
+        self.order = [c.index for p in self.players for c in p.hand] + [c.index for c in self.deck.cards]
+        self.trump = SUITS[rng.randrange(4)]
+        self.caller = self.players[rng.randrange(4)]
+        self.dealer = rng.randrange(1, 5)
+        for p in self.players:
+            for c in p.hand:
+                c.owner = p.number
+            assign_left_bower(self.trump, p.hand)
+            assign_clincher(self.trump, p.hand)
+        self.hands = [list(p.hand) for p in self.players]
+
+        self.leader = rng.randrange(1, 5)
+        self.lead_card = computer_lead_card(list(self.hands[self.leader - 1]))[0]
+        for hand in self.hands:
+            assign_points(hand, self.trump, self.lead_card)
+        self.hands[self.leader - 1].remove(self.lead_card)
+        # The next seat's hand and the cards played before it, for the follow suit and clincher decisions
+        self.follower_hand = self.hands[self.leader % 4]
+        self.played = Trick([self.lead_card])
+        # A whole trick played out by the computer, for determine_trick_winner
+        self.trick = Trick([self.lead_card])
+        for i in range(3):
+            hand = list(self.hands[(self.leader + i) % 4])
+            self.trick.append(computer_play_card(hand, self.lead_card, self.trick, True, self.trump)[0])
+
+    def reset_players(self):
+        # Puts the dealt hands back, before the lead, for play_trick
+        for p, hand in zip(self.players, self.hands):
+            p.hand = list(hand)
+            p.tricks_won = 0
+        self.players[self.leader - 1].hand.append(self.lead_card)
+
+
+def make_positions(count=SCENARIOS, seed=SEED):
+    random.seed(seed)
+    rng = random.Random(seed)
+    return [Position(rng) for _ in range(count)]
+
+
+# Each benchmark maker gets the positions and returns (function, operations done by one call of it)
+
+def bench_evaluate_cards(positions):
+    players = []
+    for position in positions:
+        for seat, hand in enumerate(position.hands, 1):
+            players.append(Player(seat))
+            players[-1].hand = list(hand)
+
+    def run():
+        for p in players:
+            p.evaluate_cards()
+    return run, len(players)
+
+
+def bench_assign_points(positions):
+    cases = [(hand, position.trump, position.lead_card) for position in positions for hand in position.hands]
+
+    def run():
+        for hand, trump, lead in cases:
+            assign_points(hand, trump, lead)
+    return run, len(cases)
+
+
+def bench_assign_left_bower(positions):
+    cases = [(position.trump, hand) for position in positions for hand in position.hands]
+
+    def run():
+        for trump, hand in cases:
+            assign_left_bower(trump, hand)
+    return run, len(cases)
+
+
+def bench_computer_follow_suit(positions):
+    cases = [(position.lead_card, position.follower_hand, position.played) for position in positions]
+
+    def run():
+        for lead, hand, played in cases:
+            try:
+                computer_follow_suit(lead, list(hand), played)
+            except ValueError:
+                pass
+    return run, len(cases)
+
+
+def bench_computer_play_clincher(positions):
+    cases = [(position.follower_hand, position.played, position.leader, position.caller) for position in positions]
+
+    def run():
+        for hand, played, winner, caller in cases:
+            try:
+                computer_play_clincher(list(hand), played, winner, caller)
+            except ValueError:
+                pass
+    return run, len(cases)
+
+
+def bench_computer_play_card(positions):
+    cases = [(position.follower_hand, position.lead_card, position.played, position.trump) for position in positions]
+
+    def run():
+        for hand, lead, played, trump in cases:
+            computer_play_card(list(hand), lead, played, False, trump)
+    return run, len(cases)
+
+
+def bench_determine_trick_winner(positions):
+    tricks = [position.trick for position in positions]
+
+    def run():
+        for trick in tricks:
+            determine_trick_winner(trick)
+    return run, len(tricks)
+
+
+def bench_play_trick(positions):
+    def run():
+        for position in positions:
+            position.reset_players()
+            p1, p2, p3, p4 = position.players
+            play_trick(p1, p2, p3, p4, position.leader, position.trump, position.caller)
+    return run, len(positions)
+
+
+def bench_play_round(positions):
+    cases = []
+    for position in positions:
+        players = [Player(1), Player(2), Player(3), Player(4)]
+        team1 = Team(players[0], players[2], 0, 0)
+        team2 = Team(players[1], players[3], 0, 0)
+        cases.append((position.order, position.dealer, players, team1, team2, Deck()))
+
+    def run():
+        for order, dealer, players, team1, team2, deck in cases:
+            deck.deal_from(order)
+            for p in players:
+                p.hand = []
+            p1, p2, p3, p4 = players
+            play_round(team1, team2, p1, p2, p3, p4, deck, dealer, players[dealer - 1], dealer % 4 + 1)
+    return run, len(cases)
+
+
+def bench_game(positions):
+    def run():
+        random.seed(SEED)
+        for _ in range(20):
+            play_computer_game()
+    return run, 20
+
+
+BENCHMARKS = [
+    ('evaluate_cards', bench_evaluate_cards),
+    ('assign_points', bench_assign_points),
+    ('assign_left_bower', bench_assign_left_bower),
+    ('computer_follow_suit', bench_computer_follow_suit),
+    ('computer_play_clincher', bench_computer_play_clincher),
+    ('computer_play_card', bench_computer_play_card),
+    ('determine_trick_winner', bench_determine_trick_winner),
+    ('play_trick', bench_play_trick),
+    ('play_round', bench_play_round),
+    ('game', bench_game),
+]
+
+
+def measure(run, operations, repeats=15, warmup=3, min_time=0.05):
+    # Returns the per-operation time in seconds of every repeat
+    for _ in range(warmup):
+        run()
+    start = time.perf_counter()
+    run()
+    calls = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        times.append((time.perf_counter() - start) / (calls * operations))
+    return times
+
+
+def summarize(times):
+    q1, median, q3 = statistics.quantiles(times, n=4) if len(times) > 1 else (times[0],) * 3
+    return {'median': median, 'iqr': q3 - q1, 'repeats': len(times)}
+
+
+def run_benchmarks(names=None, repeats=15, warmup=3, min_time=0.05):
+    # Returns {benchmark name: summary}. names limits the run to benchmarks containing one of the given strings
+    results = {}
+    with Headless(), Euchre.Quiet():
+        positions = make_positions()
+        for name, maker in BENCHMARKS:
+            if names and not any(part in name for part in names):
+                continue
+            run, operations = maker(positions)
+            results[name] = summarize(measure(run, operations, repeats, warmup, min_time))
+    return results
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.2f} ms'
+    if seconds >= 1e-6:
+        return f'{seconds * 1e6:.2f} us'
+    return f'{seconds * 1e9:.0f} ns'
+
+
+def compare_results(results, baseline, threshold=0.05):
+    # Lines comparing each result with the baseline. A change only counts when it is bigger than threshold and
+    # bigger than the noise (the two IQRs added together)
+    lines = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        ratio = result['median'] / old['median']
+        noise = (result['iqr'] + old['iqr']) / old['median']
+        if abs(ratio - 1) <= max(threshold, noise):
+            verdict = 'same'
+        else:
+            verdict = 'faster' if ratio < 1 else 'SLOWER'
+        lines.append(f'{name:24} {format_time(old["median"]):>10} -> {format_time(result["median"]):>10} '
+                     f'{ratio:6.2f}x  {verdict}')
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Euchre rules and game loop')
+    parser.add_argument('-k', dest='names', action='append', help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.05, help='seconds each repeat runs for at least')
+    parser.add_argument('--save', metavar='PATH', help='save the results as a baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results against a saved baseline')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.names, args.repeats, args.warmup, args.min_time)
+    for name, result in results.items():
+        print(f'{name:24} {format_time(result["median"]):>10} +- {format_time(result["iqr"] / 2):>10} '
+              f'({1 / result["median"]:,.0f}/s)')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print(f'\nCompared with {args.compare}:')
+        for line in compare_results(results, baseline):
+            print(line)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'machine': platform.platform(), 'results': results}, f,
+                      indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
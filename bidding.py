@@ -0,0 +1,364 @@
+import argparse
+import json
+import random
+import time
+
+import numpy as np
+
+import Euchre
+from cache import LRUCache, round_key
+from deals import UP_CARD, deal_hands, random_deals
+from hand_index import FLIPPED_CARD_POINTS, load_table, rank_hands
+from kernel import CARD_STRINGS, NUM_CARDS, TRUMP_MASKS, card_rank, cards_in
+from simulate import BiddingThresholds, computer_round, seat_thresholds
+from solver import DoubleDummySolver
+from symmetry import map_deal, map_suit
+
+
+# Bidding-only simulation: the two passes of computer bidding from play_round, worked out for whole batches of deals
+# at once with NumPy and no card objects, for call rate statistics over millions of deals
+# The decisions are the same ones computer_bidding makes: evaluate_cards strengths, looked up in the hand_index.py
+# bidding table, against the thresholds, the dealer counting the flipped card when deciding to pick it up, and on the
+# second pass the strongest suit other than the one turned down, with the dealer stuck calling one if everyone passes
+#
+# Bidders are counted by position from the dealer: 1st (left of the dealer), 2nd (the dealer's partner), 3rd (right
+# of the dealer) and the dealer. Deals use the deals.py layout with seats 1-4 dealt in order, and the dealer of
+# deal i is seat i % 4 + 1 unless dealers are given
+#
+# The make rate (how often the calling team takes 3 or more tricks) needs the round played out, so it is only worked
+# out when asked for, and only for the first make_limit deals:
+#   'rollout'  plays the round with the computer players (simulate.computer_round), exactly as a game would
+#   'solver'   double dummy result after the dealer discards their lowest card that isn't clincher (solver.py):
+#              what the caller makes with perfect play by all four seats. When the dealer has several lowest cards
+#              (same rank, different suits) the one best for the dealer's team is taken, so the result never depends
+#              on suit names
+# Only solver results can be cached (see RoundFinisher): a rollout depends on the thresholds and on ties the computer
+# players break by suit order, so it isn't the same for all 8 suit renamings of a deal
+
+POSITIONS = ['1st', '2nd', '3rd', 'dealer']
+MAKE_RATE_MODES = ['rollout', 'solver']
+# Cache table for solved rounds. Change the version whenever solve_round can give a different answer for the same key,
+# so a cache file from before never hands back stale results
+SOLVER_TABLE = 'solved_rounds_v1'
+
+FLIPPED_POINTS = np.array([FLIPPED_CARD_POINTS[card_rank(card)] for card in range(NUM_CARDS)], dtype=np.int32)
+
+
+class Bids:
+    # The bidding of a batch of deals, one entry per deal
+    def __init__(self, dealers, caller_positions, trumps, ordered_up):
+        self.dealers = dealers  # Seat number of the dealer
+        self.caller_positions = caller_positions  # Position (0-3, see POSITIONS) of the player who called clincher
+        self.trumps = trumps  # Suit index of clincher
+        self.ordered_up = ordered_up  # True when clincher is the flipped card's suit
+
+    @property
+    def callers(self):
+        # Seat number of the player who called clincher
+        return (self.dealers + self.caller_positions) % 4 + 1
+
+    @property
+    def stuck(self):
+        # True when everyone passed twice and the dealer had to call
+        return ~self.ordered_up & (self.caller_positions == 3)
+
+
+def position_thresholds(pts_to_call_suit, dealers):
+    # The order up (N, 3), pick up (N,) and call (N, 3) thresholds of each deal's bidders in position order
+    order_up = np.empty((len(dealers), 3), dtype=np.int32)
+    pick_up = np.empty(len(dealers), dtype=np.int32)
+    call = np.empty((len(dealers), 3), dtype=np.int32)
+    for dealer in range(1, 5):
+        rows = dealers == dealer
+        if not rows.any():
+            continue
+        bidders = [seat_thresholds(pts_to_call_suit, (dealer + i) % 4 + 1) for i in range(3)]
+        order_up[rows] = [bidder.order_up[i] for i, bidder in enumerate(bidders)]
+        call[rows] = [bidder.call[i] for i, bidder in enumerate(bidders)]
+        pick_up[rows] = seat_thresholds(pts_to_call_suit, dealer).pick_up
+    return order_up, pick_up, call
+
+
+def bid_deals(deals, dealers=None, pts_to_call_suit=None):
+    # Runs both passes of bidding for an (N, 24) array of deals and returns their Bids. dealers is an array of dealer
+    # seat numbers; pts_to_call_suit can be anything simulate.seat_thresholds accepts
+    deals = np.asarray(deals)
+    rows = np.arange(len(deals))
+    if dealers is None:
+        dealers = rows % 4 + 1
+    dealers = np.asarray(dealers)
+    if pts_to_call_suit is None:
+        pts_to_call_suit = Euchre.points_to_call_suit
+    order_up, pick_up, call = position_thresholds(pts_to_call_suit, dealers)
+
+    # Bidding table rows by position: (N, 4 positions, 8 columns), see hand_index.py
+    seats = (dealers[:, None] + np.arange(4)) % 4
+    table_rows = np.take_along_axis(load_table()[rank_hands(deal_hands(deals))], seats[:, :, None], axis=1)
+    strengths = table_rows[:, :, :4].astype(np.int32)
+    up_cards = deals[:, UP_CARD].astype(np.int64)
+    up_suits = up_cards // 6
+
+    # 1st pass: the first bidder strong enough in the flipped card's suit tells the dealer to pick it up
+    up_strengths = strengths[rows, :, up_suits]
+    first_pass = np.empty((len(deals), 4), dtype=bool)
+    first_pass[:, :3] = up_strengths[:, :3] >= order_up
+    first_pass[:, 3] = up_strengths[:, 3] + FLIPPED_POINTS[up_cards] >= pick_up
+    ordered_up = first_pass.any(axis=1)
+
+    # 2nd pass: each bidder's strongest suit other than the flipped card's suit (table column 4 + that suit)
+    best_suits = table_rows[rows, :, 4 + up_suits].astype(np.int64)
+    best_strengths = np.take_along_axis(strengths, best_suits[:, :, None], axis=2)[:, :, 0]
+    second_pass = np.ones((len(deals), 4), dtype=bool)  # The dealer is stuck calling if nobody else does
+    second_pass[:, :3] = best_strengths[:, :3] >= call
+
+    caller_positions = np.where(ordered_up, first_pass.argmax(axis=1), second_pass.argmax(axis=1))
+    trumps = np.where(ordered_up, up_suits, best_suits[rows, caller_positions])
+    return Bids(dealers, caller_positions, trumps, ordered_up)
+
+
+class BiddingStats:
+    def __init__(self):
+        self.deals = 0
+        self.ordered_up = [0, 0, 0, 0]  # By position: called the flipped card's suit on the 1st pass
+        self.called = [0, 0, 0, 0]  # By position: called another suit on the 2nd pass (the dealer's are all stuck)
+        self.up_card_deals = [0] * NUM_CARDS  # By flipped card
+        self.up_card_ordered_up = [0] * NUM_CARDS
+        self.up_card_stuck = [0] * NUM_CARDS
+        # Only for the rounds finished for the make rate
+        self.finished = [0, 0, 0, 0]  # By caller position
+        self.made = [0, 0, 0, 0]
+        self.marches = [0, 0, 0, 0]  # Calling team took all 5 tricks
+        self.up_card_finished = [0] * NUM_CARDS
+        self.up_card_made = [0] * NUM_CARDS
+        self.seconds = 0.0
+
+    @property
+    def stuck(self):
+        return self.called[3]
+
+    def add_bids(self, deals, bids):
+        positions = bids.caller_positions
+        ordered_up = bids.ordered_up
+        up_cards = np.asarray(deals)[:, UP_CARD].astype(np.int64)
+        self.deals += len(positions)
+        for totals, counts in ((self.ordered_up, np.bincount(positions[ordered_up], minlength=4)),
+                               (self.called, np.bincount(positions[~ordered_up], minlength=4)),
+                               (self.up_card_deals, np.bincount(up_cards, minlength=NUM_CARDS)),
+                               (self.up_card_ordered_up, np.bincount(up_cards[ordered_up], minlength=NUM_CARDS)),
+                               (self.up_card_stuck, np.bincount(up_cards[bids.stuck], minlength=NUM_CARDS))):
+            for i, count in enumerate(counts.tolist()):
+                totals[i] += count
+
+    def add_round(self, position, up_card, calling_team_tricks):
+        self.finished[position] += 1
+        self.up_card_finished[up_card] += 1
+        if calling_team_tricks >= 3:
+            self.made[position] += 1
+            self.up_card_made[up_card] += 1
+        if calling_team_tricks == 5:
+            self.marches[position] += 1
+
+    def merge(self, other):
+        self.deals += other.deals
+        self.seconds += other.seconds
+        for name in ('ordered_up', 'called', 'up_card_deals', 'up_card_ordered_up', 'up_card_stuck', 'finished',
+                     'made', 'marches', 'up_card_finished', 'up_card_made'):
+            totals = getattr(self, name)
+            for i, value in enumerate(getattr(other, name)):
+                totals[i] += value
+        return self
+
+    def summary(self):
+        deals = max(self.deals, 1)
+        summary = {
+            'deals': self.deals,
+            'ordered_up_rate': round(sum(self.ordered_up) / deals, 4),
+            'stuck_dealer_rate': round(self.stuck / deals, 4),
+            'deals_per_second': round(self.deals / self.seconds) if self.seconds else None,
+            'positions': {},
+            'up_cards': {},
+        }
+        for i, name in enumerate(POSITIONS):
+            summary['positions'][name] = {
+                'ordered_up': round(self.ordered_up[i] / deals, 4),
+                'called': round(self.called[i] / deals, 4),
+            }
+            if self.finished[i]:
+                summary['positions'][name]['make_rate'] = round(self.made[i] / self.finished[i], 4)
+                summary['positions'][name]['march_rate'] = round(self.marches[i] / self.finished[i], 4)
+        for card in range(NUM_CARDS):
+            if not self.up_card_deals[card]:
+                continue
+            up_card = summary['up_cards'][CARD_STRINGS[card]] = {
+                'deals': self.up_card_deals[card],
+                'ordered_up': round(self.up_card_ordered_up[card] / self.up_card_deals[card], 4),
+                'stuck': round(self.up_card_stuck[card] / self.up_card_deals[card], 4),
+            }
+            if self.up_card_finished[card]:
+                up_card['make_rate'] = round(self.up_card_made[card] / self.up_card_finished[card], 4)
+        if sum(self.finished):
+            summary['make_rate'] = round(sum(self.made) / sum(self.finished), 4)
+            summary['finished'] = sum(self.finished)
+        return summary
+
+    def report(self):
+        # Text tables by position and by flipped card
+        deals = max(self.deals, 1)
+        made = sum(self.finished) > 0
+        lines = [f'{self.deals} deals, ordered up {sum(self.ordered_up) / deals:.1%}, '
+                 f'dealer stuck {self.stuck / deals:.1%}' +
+                 (f', calling team made it {sum(self.made) / sum(self.finished):.1%} of {sum(self.finished)}'
+                  if made else '')]
+        lines.append(f'\n{"position":10} {"ordered up":>11} {"called":>8}' + (f' {"made":>8}' if made else ''))
+        for i, name in enumerate(POSITIONS):
+            line = f'{name:10} {self.ordered_up[i] / deals:>11.1%} {self.called[i] / deals:>8.1%}'
+            if made:
+                line += f' {self.made[i] / max(self.finished[i], 1):>8.1%}'
+            lines.append(line)
+        lines.append(f'\n{"up card":18} {"ordered up":>11} {"stuck":>8}' + (f' {"made":>8}' if made else ''))
+        for card in range(NUM_CARDS):
+            count = max(self.up_card_deals[card], 1)
+            line = (f'{CARD_STRINGS[card]:18} {self.up_card_ordered_up[card] / count:>11.1%} '
+                    f'{self.up_card_stuck[card] / count:>8.1%}')
+            if made:
+                line += f' {self.up_card_made[card] / max(self.up_card_finished[card], 1):>8.1%}'
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def dealer_discards(hand, trump):
+    # The cards the dealer may put down after picking up: their lowest cards that aren't clincher (there can be one of
+    # each suit with the same rank), or their lowest clincher
+    def discard_rank(card):
+        return bool(TRUMP_MASKS[trump] >> card & 1), card_rank(card)
+    lowest = min(discard_rank(card) for card in cards_in(hand))
+    return [card for card in cards_in(hand) if discard_rank(card) == lowest]
+
+
+def solve_round(deal, dealer, trump, ordered_up):
+    # Tricks team 1 takes with perfect play by everyone. A dealer who picked up discards whichever of their lowest
+    # cards is best for their team
+    hands = [0, 0, 0, 0]
+    for i, card in enumerate(deal[:20]):
+        hands[i // 5] |= 1 << card
+    leader = dealer % 4 + 1
+    if not ordered_up:
+        return DoubleDummySolver(hands, trump).team1_tricks(leader)
+    hand = hands[dealer - 1] | 1 << deal[UP_CARD]
+    results = []
+    for card in dealer_discards(hand, trump):
+        hands[dealer - 1] = hand & ~(1 << card)
+        results.append(DoubleDummySolver(list(hands), trump).team1_tricks(leader))
+    return max(results) if dealer in (1, 3) else min(results)
+
+
+class RoundFinisher:
+    # Plays out bid rounds for the make rate. Solved rounds can go through a cache.LRUCache, opened with
+    # table=SOLVER_TABLE: they are worked out on the canonical deal (see cache.round_key), so all 8 suit renamings of a
+    # deal share one entry. A solver result only depends on the deal, dealer, clincher and whether the flipped card
+    # was picked up, all in the key, and not on the bidding thresholds. Rollouts aren't cached (see above)
+    def __init__(self, mode, pts_to_call_suit, cache=None):
+        if mode not in MAKE_RATE_MODES:
+            raise ValueError(f'make rate mode must be one of {MAKE_RATE_MODES}, not {mode!r}')
+        if cache is not None and mode != 'solver':
+            raise ValueError('only solver results can be cached')
+        self.mode = mode
+        self.pts_to_call_suit = pts_to_call_suit
+        self.cache = cache
+        self.players = [Euchre.Player(1), Euchre.Player(2), Euchre.Player(3), Euchre.Player(4)]
+        self.deck = Euchre.Deck()
+
+    def rollout(self, deal, dealer):
+        # (caller, team 1 tricks) of the round played by the computer players
+        for p in self.players:
+            p.hand = []
+        result = computer_round(self.players, self.deck, dealer, dealer % 4 + 1, self.pts_to_call_suit, deal=deal)
+        return result.caller, result.tricks[0]
+
+    def calling_team_tricks(self, deal, dealer, caller, trump, ordered_up):
+        if self.mode == 'rollout':
+            caller, team1_tricks = self.rollout(deal, dealer)
+        elif self.cache is None:
+            team1_tricks = solve_round(deal, dealer, trump, ordered_up)
+        else:
+            key, g = round_key(deal, dealer, trump, ordered_up)
+            team1_tricks = self.cache.get_or_compute(
+                key, lambda: solve_round(map_deal(deal, g), dealer, map_suit(trump, g), ordered_up))
+        return team1_tricks if caller in (1, 3) else 5 - team1_tricks
+
+
+def simulate_bidding(num_deals, pts_to_call_suit=None, seed=None, batch_size=100000, make_rate=None,
+                     make_limit=None, cache=None):
+    # Bids num_deals random deals and returns their BiddingStats. make_rate ('rollout' or 'solver') also plays out
+    # the first make_limit of them (all of them if make_limit is None) for the make rate, looking them up in cache
+    # (a cache.LRUCache) first if one is given
+    # seed seeds both the deals and random, which rollouts use for the computer players' random choices
+    if pts_to_call_suit is None:
+        pts_to_call_suit = Euchre.points_to_call_suit
+    rng = np.random.default_rng(seed)
+    if seed is not None:
+        random.seed(f'bidding:{seed}')
+    finisher = RoundFinisher(make_rate, pts_to_call_suit, cache) if make_rate else None
+    to_finish = num_deals if make_limit is None else make_limit
+    stats = BiddingStats()
+    start = time.perf_counter()
+    while stats.deals < num_deals:
+        deals = random_deals(min(batch_size, num_deals - stats.deals), rng)
+        dealers = (np.arange(len(deals)) + stats.deals) % 4 + 1
+        bids = bid_deals(deals, dealers, pts_to_call_suit)
+        stats.add_bids(deals, bids)
+        if finisher is None or to_finish <= 0:
+            continue
+        count = min(to_finish, len(deals))
+        to_finish -= count
+        for deal, dealer, caller, position, trump, ordered_up in zip(
+                deals[:count].tolist(), bids.dealers[:count].tolist(), bids.callers[:count].tolist(),
+                bids.caller_positions[:count].tolist(), bids.trumps[:count].tolist(),
+                bids.ordered_up[:count].tolist()):
+            tricks = finisher.calling_team_tricks(deal, dealer, caller, trump, ordered_up)
+            stats.add_round(position, deal[UP_CARD], tricks)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Call rate statistics from the bidding alone')
+    parser.add_argument('deals', type=int, nargs='?', default=1000000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=100000)
+    parser.add_argument('--pts', type=int, default=Euchre.points_to_call_suit, help='points to call a suit')
+    parser.add_argument('--thresholds', type=int, nargs=7, metavar='PTS',
+                        help='per-position thresholds (see optimize.py), instead of --pts')
+    parser.add_argument('--make-rate', choices=MAKE_RATE_MODES, help='also play out rounds for the make rate')
+    parser.add_argument('--make-limit', type=int, default=10000, help='rounds played out for the make rate')
+    parser.add_argument('--cache-entries', type=int, default=0, help='cache this many solved rounds in memory')
+    parser.add_argument('--cache-path', metavar='PATH', help='also keep solved rounds in this file between runs')
+    parser.add_argument('--json', action='store_true', help='print the statistics as JSON')
+    args = parser.parse_args()
+
+    pts_to_call_suit = BiddingThresholds.from_values(args.thresholds) if args.thresholds else args.pts
+    cache = None
+    if args.cache_entries or args.cache_path:
+        if args.make_rate != 'solver':
+            parser.error('--cache-entries and --cache-path need --make-rate solver')
+        cache = LRUCache(args.cache_entries or 1000000, path=args.cache_path, table=SOLVER_TABLE)
+    try:
+        stats = simulate_bidding(args.deals, pts_to_call_suit, args.seed, args.batch_size, args.make_rate,
+                                 args.make_limit, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+    summary = stats.summary()
+    if cache is not None:
+        summary['cache'] = cache.counters()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(stats.report())
+        print(f'\n{stats.seconds:.2f}s ({stats.deals / stats.seconds:,.0f} deals/s)')
+        if cache is not None:
+            print('cache: ' + ', '.join(f'{name} {value}' for name, value in summary['cache'].items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import pickle
+import sqlite3
+import sys
+from collections import OrderedDict
+
+from symmetry import canonical_deal, map_suit
+
+
+# Least recently used cache for round results, so deals that come up again (in big deal sets, replays and repeated
+# runs) aren't played out or solved again
+# The memory tier holds at most max_entries entries and about max_bytes bytes; when either is passed the least
+# recently used entries are dropped. Sizes are estimates (sys.getsizeof of the key and value plus the dict's own
+# bookkeeping), good enough to keep a long run inside a memory budget
+# With a path, entries are also kept in an SQLite file that outlives the process: a memory miss looks there before
+# counting as a miss, and new entries are written to it in batches (call flush() or close() at the end of a run)
+# Everything that can change a value and is not in the key belongs in the table name, as a version
+#
+# Round keys come from round_key: the canonical deal (symmetry.py) with the dealer, clincher and whether the flipped
+# card was picked up, packed into one integer. All 8 suit renamings of a round share a key, so a value should be
+# worked out on the canonical deal (map the real deal with the symmetry round_key returns), and only values that are
+# the same for all 8 renamings (nothing that breaks ties by suit order) may be cached this way
+
+ENTRY_OVERHEAD = 100  # Bytes of OrderedDict bookkeeping per entry, roughly
+FLUSH_EVERY = 1000  # New entries held back before they are written to disk
+MISSING = object()  # Default for get when a miss has to be told apart from a cached None
+
+
+class LRUCache:
+    def __init__(self, max_entries=1000000, max_bytes=256 * 2 ** 20, path=None, table='entries'):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size), least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0  # Hits that came from the disk tier (also counted in hits)
+        self.disk_writes = 0
+        self.pending = {}  # key -> pickled value, not written to disk yet
+        self.db = None
+        self.table = table  # Table in the SQLite file, so a file can hold several kinds (or versions) of results
+        if path is not None:
+            if not table.isidentifier():
+                raise ValueError(f'cache table name must be an identifier, not {table!r}')
+            self.db = sqlite3.connect(path)
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} (key INTEGER PRIMARY KEY, value BLOB)')
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if self.db is not None:
+            blob = self.pending.get(key)
+            if blob is None:
+                row = self.db.execute(f'SELECT value FROM {self.table} WHERE key = ?', (key,)).fetchone()
+                blob = row[0] if row is not None else None
+            if blob is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                value = pickle.loads(blob)
+                self.remember(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.remember(key, value)
+        if self.db is not None:
+            self.pending[key] = pickle.dumps(value)
+            if len(self.pending) >= FLUSH_EVERY:
+                self.flush()
+
+    def get_or_compute(self, key, compute):
+        # The cached value for key, or compute() stored under key. None is cached like any other value
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def remember(self, key, value):
+        # Stores in the memory tier as the most recently used entry, then evicts down to the limits
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        size = sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def flush(self):
+        if self.db is not None and self.pending:
+            self.db.executemany(f'INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)',
+                                self.pending.items())
+            self.db.commit()
+            self.disk_writes += len(self.pending)
+            self.pending.clear()
+
+    def close(self):
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def clear(self):
+        # Empties the memory tier. The disk tier and the counters are kept
+        self.entries.clear()
+        self.bytes = 0
+
+    def counters(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'disk_hits': self.disk_hits,
+            'disk_writes': self.disk_writes,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def round_key(deal, dealer, trump=None, ordered_up=False):
+    # Returns (key, g) for a round: the integer key shared by all suit renamings of it and the symmetry g that turns
+    # the deal into the canonical one. trump is the clincher suit index, or None when the round's bidding is part of
+    # what is cached
+    code, g = canonical_deal(deal)
+    suit = 4 if trump is None else map_suit(trump, g)
+    return ((code * 5 + suit) * 4 + dealer - 1) * 2 + bool(ordered_up), g
@@ -0,0 +1,161 @@
+import numpy as np
+
+from hand_index import BINOMIAL, BINOMIAL_ARRAY, all_hands, hand_unrank
+from kernel import NUM_CARDS, card_count
+
+
+# Bulk deal generation with NumPy for simulation workers
+# A deal is a permutation of the 24 card indexes (see kernel.py) laid out the way Deck.deal_from and
+# EuchreEngine.deal read it: 5 cards each for the players in dealing order, then the 4 card kitty with the
+# flipped (up) card first. A batch of deals is an (N, 24) int8 array with one deal per row
+
+HANDS = slice(0, 20)
+KITTY = slice(20, 24)
+UP_CARD = 20
+
+
+def random_deals(n, rng=None):
+    # Returns n random deals as an (n, 24) array. rng is a numpy Generator, or a seed for one
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    deals = np.tile(np.arange(24, dtype=np.int8), (n, 1))
+    return rng.permuted(deals, axis=1)
+
+
+def deal_hands(deals):
+    # (N, 4, 5) view of each player's hand
+    return deals[:, HANDS].reshape(-1, 4, 5)
+
+
+def deal_kitty(deals):
+    return deals[:, KITTY]
+
+
+def deal_up_cards(deals):
+    return deals[:, UP_CARD]
+
+
+def deal_batches(batch_size, rng=None):
+    # Endless generator of deals, made batch_size at a time. Yields one deal (a row of 24 ints) at a time so it can be
+    # passed straight to Deck.deal_from or EuchreEngine.deal
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+    while True:
+        for deal in random_deals(batch_size, rng).tolist():
+            yield deal
+
+
+# Deal numbers. A deal is ranked in the space of all distinct deals: the up card (24 choices), then seat 1's hand out
+# of the 23 cards left (C(23, 5) choices), seat 2's out of the 18 left and so on. The 3 cards left over are the rest
+# of the kitty. That gives 24 * C(23, 5) * C(18, 5) * C(13, 5) * C(8, 5) deals, about 5 * 10^14, so a deal fits in an
+# int64. The order of cards within a hand and within the kitty doesn't change the number; decoding gives the cards of
+# each hand and of the kitty after the up card in increasing order
+# A hand is ranked by where its cards sit among the cards still left (its colex rank, see hand_index.py)
+
+HAND_CHOICES = [BINOMIAL[n][5] for n in (23, 18, 13, 8)]
+NUM_DEALS = NUM_CARDS
+for choices in HAND_CHOICES:
+    NUM_DEALS *= choices
+
+HAND_COLUMNS = np.arange(1, 6)
+BIT_COUNT = np.array([bin(i).count('1') for i in range(1 << 12)], dtype=np.int32)  # Set bits in a 12-bit number
+
+
+def encode_deal(deal):
+    # Deal number of one deal (24 card indexes in the layout above)
+    hands = [0, 0, 0, 0]
+    for position in range(20):
+        hands[position // 5] |= 1 << deal[position]
+    return encode_hands(deal[UP_CARD], hands)
+
+
+def encode_hands(up_card, hands):
+    # Deal number from the up card and the masks of the 4 hands
+    taken = 1 << up_card
+    code = up_card
+    for hand, choices in zip(hands, HAND_CHOICES):
+        rank = 0
+        k = 0
+        left = hand
+        while left:
+            low = left & -left
+            k += 1
+            # Position of the card among the cards not taken yet
+            rank += BINOMIAL[low.bit_length() - 1 - card_count(taken & (low - 1))][k]
+            left ^= low
+        taken |= hand
+        code = code * choices + rank
+    return code
+
+
+def decode_deal(code):
+    # The deal with the given number, as a list of 24 card indexes
+    ranks = []
+    for choices in reversed(HAND_CHOICES):
+        code, rank = divmod(code, choices)
+        ranks.append(rank)
+    up_card = code
+    left = [card for card in range(NUM_CARDS) if card != up_card]
+    deal = []
+    for rank in reversed(ranks):
+        hand = [left[position] for position in hand_unrank(rank)]
+        deal.extend(hand)
+        left = [card for card in left if card not in hand]
+    return deal + [up_card] + left
+
+
+def encode_deals(deals):
+    # Vectorized encode_deal for an (N, 24) array. Returns an (N,) int64 array. encode_deals and decode_deals each
+    # handle somewhat under a million deals a second on one core; the loops are over the 4 seats, not over deals
+    # The cards taken so far are kept as a mask per deal, so a card's position among the cards left is the card
+    # minus the number of taken cards below it
+    deals = np.asarray(deals).astype(np.int32)
+    taken = np.int32(1) << deals[:, UP_CARD]
+    codes = deals[:, UP_CARD].astype(np.int64)
+    for seat, choices in enumerate(HAND_CHOICES):
+        hand = np.sort(deals[:, 5 * seat:5 * seat + 5], axis=1)
+        bits = np.int32(1) << hand
+        below = taken[:, None] & (bits - 1)
+        positions = hand - BIT_COUNT[below & 0xfff] - BIT_COUNT[below >> 12]
+        codes = codes * choices + BINOMIAL_ARRAY[positions, HAND_COLUMNS].sum(axis=1)
+        taken |= np.bitwise_or.reduce(bits, axis=1)
+    return codes
+
+
+def decode_deals(codes):
+    # Vectorized decode_deal. Returns an (N, 24) int8 array
+    codes = np.asarray(codes, dtype=np.int64)
+    ranks = []
+    for choices in reversed(HAND_CHOICES):
+        ranks.append(codes % choices)
+        codes = codes // choices
+    rows = np.arange(len(codes))[:, None]
+    deals = np.empty((len(codes), NUM_CARDS), dtype=np.int8)
+    deals[:, UP_CARD] = codes
+    # The cards left in increasing order for each deal; every hand picks its cards out of them by position
+    left = (np.arange(NUM_CARDS - 1) + (np.arange(NUM_CARDS - 1) >= codes[:, None])).astype(np.int8)
+    hands_by_rank = hand_table()
+    for seat, rank in enumerate(reversed(ranks)):
+        positions = hands_by_rank[rank]
+        deals[:, 5 * seat:5 * seat + 5] = np.take_along_axis(left, positions, axis=1)
+        keep = np.ones(left.shape, dtype=bool)
+        keep[rows, positions] = False
+        left = left[keep].reshape(len(codes), -1)
+    deals[:, UP_CARD + 1:] = left
+    return deals
+
+
+hand_tables = []
+
+
+def hand_table():
+    # all_hands(), worked out the first time it is needed
+    if not hand_tables:
+        hand_tables.append(all_hands())
+    return hand_tables[0]
+
+
+def players_deal(players, deck):
+    # The deal of a Euchre.py round right after deal_cards, from the 4 players' hands (seats 1-4) and the kitty left
+    # in the deck (flipped card first), for encode_deal
+    return [card.index for p in players for card in p.hand] + [card.index for card in deck.cards]
@@ -0,0 +1,249 @@
+import random
+
+from Euchre import score_round
+from kernel import EFFECTIVE_SUIT, FULL_DECK, NUM_CARDS, SUITS, TRICK_RANK, TRUMP_MASKS, card_suit, legal_plays
+
+
+# Euchre as a step-by-step state machine, for using the game as a library (simulation, search, servers)
+# Nothing here prints, sleeps or asks for input. A GameState holds everything about a game; EuchreEngine moves it
+# forward one action at a time: deal(), bid(), discard(), play_card() and score_round()
+# Cards and hands are kernel.py indexes and masks. Seats are numbered 1-4, seats 1 & 3 are team 1
+# Cards never change during a game, so anything that belongs to a round (who holds a card, whether it is clincher,
+# its rank in the current trick) is kept in small per-round arrays and masks on the GameState. That keeps a state
+# cheap to copy
+#
+# A round goes through these phases:
+#   ORDER_UP   first pass of bidding, starting left of the dealer. Actions: PASS or PICK_UP (the dealer takes the
+#              flipped card, whether they were told to by another seat or chose to themselves)
+#   DISCARD    the dealer picked up the flipped card and must discard a card
+#   CALL_SUIT  second pass. Actions: PASS or a suit index other than the flipped card's suit. The dealer may not pass
+#   PLAY       five tricks, the player left of the dealer leads the first
+#   ROUND_OVER waiting for score_round()
+# and after score_round() either DEAL (next round, dealer moves left) or GAME_OVER
+
+DEAL = 'deal'
+ORDER_UP = 'order up'
+DISCARD = 'discard'
+CALL_SUIT = 'call suit'
+PLAY = 'play'
+ROUND_OVER = 'round over'
+GAME_OVER = 'game over'
+
+PASS = 'pass'
+PICK_UP = 'pick up'
+
+
+def next_seat(seat):
+    return seat % 4 + 1
+
+
+def team_of(seat):
+    # 0 for team 1 (seats 1 & 3), 1 for team 2 (seats 2 & 4)
+    return (seat - 1) % 2
+
+
+class GameState:
+    def __init__(self, dealer=1, points_to_win=11):
+        self.points = [0, 0]  # Game score [team 1, team 2]
+        self.points_to_win = points_to_win
+        self.dealer = dealer
+        self.phase = DEAL
+        self.turn = None  # Seat that acts next
+        self.hands = [0, 0, 0, 0]  # Hand masks for seats 1-4
+        self.kitty = 0  # The 4 cards that were not dealt, including the flipped card
+        self.deal = None  # The 24 card indexes in the order they were dealt this round
+        self.flipped = None
+        self.bids = []  # (seat, action) in the order they were made this round
+        self.trump = None  # Suit index of clincher
+        self.caller = None  # Seat that called clincher
+        self.ordered_up = False  # True when clincher is the flipped card's suit
+        self.leader = None  # Seat that led the current trick
+        self.trick = []  # Cards played to the current trick, in order
+        self.tricks = [0, 0]  # Tricks won this round [team 1, team 2]
+        self.history = []  # Finished tricks this round as (leader, [cards])
+        self.round_points = None  # (team 1, team 2) points from the last scored round
+        # Per-round card facts
+        self.owner = bytearray(NUM_CARDS)  # Seat each card was dealt to (or picked up by), 0 for the kitty
+        self.trump_cards = 0  # Mask of the clincher cards, including the left bower
+        self.trick_ranks = None  # kernel.TRICK_RANK row for the current trick once a card has been led
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+        state.__dict__.update(self.__dict__)
+        state.points = list(self.points)
+        state.hands = list(self.hands)
+        state.bids = list(self.bids)
+        state.trick = list(self.trick)
+        state.tricks = list(self.tricks)
+        state.history = [(leader, list(cards)) for leader, cards in self.history]
+        state.owner = bytearray(self.owner)
+        return state
+
+    def card_owner(self, card):
+        return self.owner[card]
+
+    def is_trump(self, card):
+        return self.trump_cards >> card & 1 == 1
+
+    def trick_rank(self, card):
+        # The card's rank in the current trick (0 if it can't win it), or None before a card has been led
+        return self.trick_ranks[card] if self.trick_ranks is not None else None
+
+    def winner(self):
+        # The team (1 or 2) that has won the game, or None
+        if self.points[0] >= self.points_to_win:
+            return 1
+        if self.points[1] >= self.points_to_win:
+            return 2
+        return None
+
+
+class EuchreEngine:
+    def __init__(self, state=None, rng=None):
+        self.state = state if state is not None else GameState()
+        self.rng = rng if rng is not None else random.Random()
+
+    def deal(self, cards=None):
+        # Deals a new round. cards is an optional order of all 24 card indexes: seat 1 gets the first 5 cards, seat 2
+        # the next 5 and so on, and the last 4 are the kitty with the flipped card first. Otherwise the deck is shuffled
+        state = self.state
+        if state.phase != DEAL:
+            raise ValueError(f'Cannot deal during the {state.phase} phase')
+        if cards is None:
+            cards = list(range(NUM_CARDS))
+            self.rng.shuffle(cards)
+        elif sorted(cards) != list(range(NUM_CARDS)):
+            raise ValueError('A deal must contain each of the 24 cards once')
+
+        state.hands = [0, 0, 0, 0]
+        state.owner = bytearray(NUM_CARDS)
+        for position in range(20):
+            state.hands[position // 5] |= 1 << cards[position]
+            state.owner[cards[position]] = position // 5 + 1
+        state.kitty = FULL_DECK & ~(state.hands[0] | state.hands[1] | state.hands[2] | state.hands[3])
+        state.flipped = cards[20]
+        state.deal = list(cards)
+        state.bids = []
+        state.trump = None
+        state.caller = None
+        state.ordered_up = False
+        state.leader = None
+        state.trick = []
+        state.tricks = [0, 0]
+        state.history = []
+        state.round_points = None
+        state.trump_cards = 0
+        state.trick_ranks = None
+        state.phase = ORDER_UP
+        state.turn = next_seat(state.dealer)
+
+    def legal_bids(self):
+        state = self.state
+        if state.phase == ORDER_UP:
+            return [PASS, PICK_UP]
+        if state.phase == CALL_SUIT:
+            suits = [suit for suit in range(4) if suit != card_suit(state.flipped)]
+            return suits if state.turn == state.dealer else [PASS] + suits
+        return []
+
+    def bid(self, action):
+        # Makes a bid for the seat whose turn it is: PASS, PICK_UP (first pass) or a suit index (second pass)
+        state = self.state
+        if action not in self.legal_bids():
+            raise ValueError(f'{action!r} is not a legal bid for seat {state.turn} during the {state.phase} phase')
+        state.bids.append((state.turn, action))
+
+        if action == PASS:
+            if state.turn == state.dealer:
+                state.phase = CALL_SUIT
+            state.turn = next_seat(state.turn)
+        elif action == PICK_UP:
+            state.trump = card_suit(state.flipped)
+            state.trump_cards = TRUMP_MASKS[state.trump]
+            state.caller = state.turn
+            state.ordered_up = True
+            state.hands[state.dealer - 1] |= 1 << state.flipped
+            state.owner[state.flipped] = state.dealer
+            state.kitty &= ~(1 << state.flipped)
+            state.phase = DISCARD
+            state.turn = state.dealer
+        else:
+            state.trump = action
+            state.trump_cards = TRUMP_MASKS[state.trump]
+            state.caller = state.turn
+            self.start_play()
+
+    def discard(self, card):
+        # The dealer puts one card from their 6 card hand into the kitty after picking up the flipped card
+        state = self.state
+        hand = state.hands[state.dealer - 1]
+        if state.phase != DISCARD or not hand >> card & 1:
+            raise ValueError(f'Seat {state.dealer} cannot discard card {card} now')
+        state.hands[state.dealer - 1] = hand & ~(1 << card)
+        state.kitty |= 1 << card
+        state.owner[card] = 0
+        self.start_play()
+
+    def start_play(self):
+        state = self.state
+        state.phase = PLAY
+        state.leader = next_seat(state.dealer)
+        state.turn = state.leader
+
+    def legal_plays(self):
+        # Mask of the cards the seat to play may choose from
+        state = self.state
+        if state.phase != PLAY:
+            return 0
+        led_suit = EFFECTIVE_SUIT[state.trump][state.trick[0]] if state.trick else None
+        return legal_plays(state.hands[state.turn - 1], state.trump, led_suit)
+
+    def play_card(self, card):
+        # Plays a card for the seat whose turn it is. Returns the seat that won the trick when this card completes
+        # one, otherwise None
+        state = self.state
+        if not self.legal_plays() >> card & 1:
+            raise ValueError(f'Seat {state.turn} cannot play card {card}')
+        state.hands[state.turn - 1] &= ~(1 << card)
+        if not state.trick:
+            state.trick_ranks = TRICK_RANK[state.trump][EFFECTIVE_SUIT[state.trump][card]]
+        state.trick.append(card)
+        if len(state.trick) < 4:
+            state.turn = next_seat(state.turn)
+            return None
+
+        ranks = state.trick_ranks
+        winner = 0
+        for position in range(1, 4):
+            if ranks[state.trick[position]] > ranks[state.trick[winner]]:
+                winner = position
+        winning_seat = (state.leader - 1 + winner) % 4 + 1
+        state.tricks[team_of(winning_seat)] += 1
+        state.history.append((state.leader, state.trick))
+        state.trick = []
+        state.trick_ranks = None
+        state.leader = winning_seat
+        state.turn = winning_seat
+        if len(state.history) == 5:
+            state.phase = ROUND_OVER
+            state.turn = None
+        return winning_seat
+
+    def score_round(self):
+        # Adds the round's points to the game score and moves the deal to the left. Returns (team 1, team 2) points
+        state = self.state
+        if state.phase != ROUND_OVER:
+            raise ValueError(f'Cannot score the round during the {state.phase} phase')
+        state.round_points = score_round(state.tricks[0], state.tricks[1], state.caller)
+        state.points[0] += state.round_points[0]
+        state.points[1] += state.round_points[1]
+        state.dealer = next_seat(state.dealer)
+        state.phase = GAME_OVER if state.winner() else DEAL
+        return state.round_points
+
+    def describe(self):
+        # A short text summary of the state, for logs and debugging
+        state = self.state
+        trump = SUITS[state.trump] if state.trump is not None else '-'
+        return (f'{state.phase}: score {state.points[0]}-{state.points[1]}, dealer {state.dealer}, '
+                f'turn {state.turn}, clincher {trump}, tricks {state.tricks[0]}-{state.tricks[1]}')
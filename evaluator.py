@@ -0,0 +1,53 @@
+import numpy as np
+
+from kernel import ACE, KING, LEFT_BOWER, NINE, NUM_CARDS, QUEEN, RIGHT_BOWER, TEN, card_rank, card_suit
+
+
+# Batched version of Player.evaluate_cards for scoring many hands in one NumPy call
+# Hands are given either as an (N, 5) array of card indexes (see kernel.py) or as an (N, 24) one-hot matrix, and the
+# result is an (N, 4) array of suit strengths in [Clubs, Diamonds, Hearts, Spades] order, the same as card_values
+
+TRUMP_BIDDING_POINTS = {ACE: 11, KING: 10, QUEEN: 9, TEN: 8, NINE: 7}
+
+
+def bidding_points(card, trump):
+    # The points evaluate_cards gives a card if trump were clincher: right bower 15, left bower 13,
+    # Ace 11 down to 9 of clincher 7, and 4 for an Ace of any other suit
+    if card == RIGHT_BOWER[trump]:
+        return 15
+    if card == LEFT_BOWER[trump]:
+        return 13
+    if card_suit(card) == trump:
+        return TRUMP_BIDDING_POINTS[card_rank(card)]
+    if card_rank(card) == ACE:
+        return 4
+    return 0
+
+
+# BIDDING_WEIGHTS[card, trump]
+BIDDING_WEIGHTS = np.array([[bidding_points(card, trump) for trump in range(4)] for card in range(NUM_CARDS)],
+                           dtype=np.int32)
+
+
+def evaluate_hands(hands):
+    # hands is an (N, 5) array of card indexes. Returns the (N, 4) suit strengths
+    hands = np.asarray(hands)
+    return BIDDING_WEIGHTS[hands].sum(axis=-2)
+
+
+def evaluate_one_hot(hands):
+    # hands is an (N, 24) array with a 1 for every card held. Returns the (N, 4) suit strengths
+    return np.asarray(hands, dtype=np.int32) @ BIDDING_WEIGHTS
+
+
+def one_hot(hands):
+    # Converts an (N, k) array of card indexes into an (N, 24) one-hot matrix
+    hands = np.asarray(hands)
+    result = np.zeros((hands.shape[0], NUM_CARDS), dtype=np.int8)
+    np.put_along_axis(result, hands, 1, axis=1)
+    return result
+
+
+def best_suits(strengths):
+    # Returns the index of the strongest suit for each hand. Ties go to the first suit, like card_values.index(max())
+    return np.argmax(strengths, axis=-1)
@@ -0,0 +1,176 @@
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+import profiling
+from records import GameRecordWriter, pack_game
+from simulate import play_computer_game
+
+
+# Runs large numbers of headless games across a pool of worker processes
+# Every game gets its own random seed made from the master seed and the game's number, so a game plays out the same
+# way no matter which worker runs it. Workers return integer totals which are added together, so the same master seed
+# gives byte-identical statistics for any number of workers
+
+
+class SimulationStats:
+    def __init__(self):
+        self.games = 0
+        self.rounds = 0
+        self.wins = [0, 0]  # [team 1, team 2]
+        self.points = [0, 0]
+        self.tricks = [0, 0]
+        self.calls_by_seat = [0, 0, 0, 0]  # How many times each seat called clincher
+        self.ordered_up = 0  # Rounds where clincher was the flipped card's suit
+        self.stuck_dealer = 0  # Rounds where the dealer was forced to call clincher
+        self.euchres = 0  # Rounds where the calling team took fewer than 3 tricks
+        self.marches = 0  # Rounds where one team took all 5 tricks
+
+    def add_game(self, game):
+        self.games += 1
+        self.wins[game.winner - 1] += 1
+        for r in game.rounds:
+            self.rounds += 1
+            self.points[0] += r.points[0]
+            self.points[1] += r.points[1]
+            self.tricks[0] += r.tricks[0]
+            self.tricks[1] += r.tricks[1]
+            self.calls_by_seat[r.caller - 1] += 1
+            if r.ordered_up:
+                self.ordered_up += 1
+            elif r.caller == r.dealer:
+                self.stuck_dealer += 1
+            calling_team = 0 if r.caller in (1, 3) else 1
+            if r.tricks[calling_team] < 3:
+                self.euchres += 1
+            if 5 in r.tricks:
+                self.marches += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.rounds += other.rounds
+        self.ordered_up += other.ordered_up
+        self.stuck_dealer += other.stuck_dealer
+        self.euchres += other.euchres
+        self.marches += other.marches
+        for totals, extra in ((self.wins, other.wins), (self.points, other.points), (self.tricks, other.tricks),
+                              (self.calls_by_seat, other.calls_by_seat)):
+            for i in range(len(totals)):
+                totals[i] += extra[i]
+        return self
+
+    def summary(self):
+        # Totals plus rates. Rates are only worked out from the final totals so they never depend on merge order
+        rounds = max(self.rounds, 1)
+        return {
+            'games': self.games,
+            'rounds': self.rounds,
+            'wins': self.wins,
+            'points': self.points,
+            'tricks': self.tricks,
+            'calls_by_seat': self.calls_by_seat,
+            'ordered_up': self.ordered_up,
+            'stuck_dealer': self.stuck_dealer,
+            'euchres': self.euchres,
+            'marches': self.marches,
+            'team1_win_rate': round(self.wins[0] / max(self.games, 1), 6),
+            'euchre_rate': round(self.euchres / rounds, 6),
+            'rounds_per_game': round(self.rounds / max(self.games, 1), 6),
+        }
+
+    def to_json(self):
+        return json.dumps(self.summary(), sort_keys=True)
+
+
+def game_seed(master_seed, game_number):
+    # Seeds are strings so random.seed hashes them with sha512: every game gets an independent stream, and the
+    # result does not change between runs the way hash() of a tuple would
+    return f'{master_seed}:{game_number}'
+
+
+def run_games(task):
+    # Worker function: plays games first_game up to (not including) first_game + count and returns their totals,
+    # the games as packed records (see records.py) if record is set and the profiling.ProfileStats if profile is set
+    master_seed, first_game, count, pts_to_call_suit, record, profile = task
+    stats = SimulationStats()
+    records = []
+    profile_stats = profiling.enable() if profile else None
+    try:
+        for game_number in range(first_game, first_game + count):
+            random.seed(game_seed(master_seed, game_number))
+            game = play_computer_game(pts_to_call_suit)
+            stats.add_game(game)
+            if record:
+                records.append(pack_game(game_number, game))
+    finally:
+        if profile:
+            profiling.disable()
+    return stats, b''.join(records) if record else None, profile_stats
+
+
+def split_games(num_games, chunk_size):
+    # Splits the game numbers 0..num_games-1 into (first_game, count) chunks. Chunks only depend on num_games and
+    # chunk_size, never on the number of workers
+    return [(first, min(chunk_size, num_games - first)) for first in range(0, num_games, chunk_size)]
+
+
+def run_simulation(num_games, master_seed=0, workers=None, chunk_size=250, pts_to_call_suit=None, record_path=None,
+                   profile_stats=None):
+    # Plays num_games games spread across a pool of worker processes and returns the merged SimulationStats
+    # workers defaults to the number of CPUs. With 1 worker the games are played in this process
+    # With record_path every game is appended to that game record file, in game number order
+    # Passing a profiling.ProfileStats turns on profiling in the workers and merges their counters into it
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    record = record_path is not None
+    profile = profile_stats is not None
+    tasks = [(master_seed, first, count, pts_to_call_suit, record, profile)
+             for first, count in split_games(num_games, chunk_size)]
+
+    stats = SimulationStats()
+    writer = GameRecordWriter(record_path) if record else None
+    pool = multiprocessing.Pool(processes=workers) if workers > 1 else None
+    try:
+        for chunk_stats, records, chunk_profile in (pool.imap(run_games, tasks) if pool is not None
+                                                    else map(run_games, tasks)):
+            stats.merge(chunk_stats)
+            if writer is not None:
+                writer.write_bytes(records)
+            if profile:
+                profile_stats.merge(chunk_profile)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if writer is not None:
+            writer.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate computer-only Euchre games across worker processes')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--seed', type=int, default=0, help='master seed (default 0)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=250, help='games handed to a worker at a time')
+    parser.add_argument('--record', metavar='PATH', help='append every game to this game record file')
+    parser.add_argument('--profile', action='store_true', help='count and time the bidding, trick play and scoring')
+    parser.add_argument('--profile-json', metavar='PATH', help='also save the profile counters as JSON')
+    args = parser.parse_args()
+
+    profile_stats = profiling.ProfileStats() if args.profile or args.profile_json else None
+    start = time.perf_counter()
+    stats = run_simulation(args.games, args.seed, args.workers, args.chunk_size, record_path=args.record,
+                           profile_stats=profile_stats)
+    elapsed = time.perf_counter() - start
+    print(stats.to_json())
+    print(f'{stats.games} games in {elapsed:.2f}s ({stats.games / elapsed:.0f} games/s)')
+    if profile_stats is not None:
+        print(profile_stats.report())
+        if args.profile_json:
+            profile_stats.dump(args.profile_json)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+
+from evaluator import evaluate_hands
+from kernel import ACE, JACK, KING, NINE, NUM_CARDS, QUEEN, TEN, cards_in
+
+
+# Combinatorial index for 5-card hands. There are only C(24, 5) = 42,504 different hands, so each one gets a
+# number 0-42503 (its colex rank) and anything that only depends on the hand can be worked out once and stored
+# in a table. Cards are kernel.py indexes
+#
+# The bidding table has one row per hand rank:
+#   columns 0-3  the evaluate_cards suit strengths [Clubs, Diamonds, Hearts, Spades]
+#   columns 4-7  the suit computer_choose_call_suit / computer_must_call_suit names when the flipped card's suit
+#                (column 4 + suit) has been turned down
+# It is saved as an .npy file and memory-mapped when loaded, so worker processes share one copy of it
+# The headless bidding reads its hand strengths from here instead of scoring hands: simulate.computer_round one hand at
+# a time with hand_strengths, bidding.bid_deals whole batches of deals at once
+
+HAND_SIZE = 5
+NUM_HANDS = 42504
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_table.npy')
+
+# BINOMIAL[n][k] = C(n, k) for n up to 24 and k up to 5
+BINOMIAL = [[0] * (HAND_SIZE + 1) for _ in range(NUM_CARDS + 1)]
+for n in range(NUM_CARDS + 1):
+    BINOMIAL[n][0] = 1
+    for k in range(1, min(n, HAND_SIZE) + 1):
+        BINOMIAL[n][k] = BINOMIAL[n - 1][k - 1] + (BINOMIAL[n - 1][k] if k < n else 0)
+BINOMIAL_ARRAY = np.array(BINOMIAL, dtype=np.int64)
+
+# The points computer_pick_up_card adds to the dealer's hand for the flipped card, by rank
+FLIPPED_CARD_POINTS = {JACK: 15, ACE: 11, KING: 10, QUEEN: 9, TEN: 8, NINE: 7}
+
+
+def hand_rank(cards):
+    # Colex rank of a hand: with the cards sorted c0 < c1 < ... < c4 the rank is C(c0, 1) + C(c1, 2) + ... + C(c4, 5)
+    rank = 0
+    for k, card in enumerate(sorted(cards), 1):
+        rank += BINOMIAL[card][k]
+    return rank
+
+
+def hand_rank_mask(mask):
+    # Same as hand_rank for a kernel.py hand mask. cards_in already yields the cards in increasing order
+    rank = 0
+    for k, card in enumerate(cards_in(mask), 1):
+        rank += BINOMIAL[card][k]
+    return rank
+
+
+def hand_unrank(rank):
+    # Returns the sorted list of 5 card indexes with the given colex rank
+    cards = []
+    card = NUM_CARDS
+    for k in range(HAND_SIZE, 0, -1):
+        card -= 1
+        while BINOMIAL[card][k] > rank:
+            card -= 1
+        cards.append(card)
+        rank -= BINOMIAL[card][k]
+    cards.reverse()
+    return cards
+
+
+def rank_hands(hands):
+    # Vectorized hand_rank for an (..., 5) array of card indexes in any order, such as deals.deal_hands
+    hands = np.sort(np.asarray(hands), axis=-1)
+    return BINOMIAL_ARRAY[hands, np.arange(1, HAND_SIZE + 1)].sum(axis=-1)
+
+
+def all_hands():
+    # Every hand as a (42504, 5) array, row i holding the hand with rank i
+    return np.array([hand_unrank(rank) for rank in range(NUM_HANDS)], dtype=np.int8)
+
+
+def build_table(path=TABLE_PATH):
+    # Works out the bidding table for every hand and saves it to path
+    # The table is written to a file of this process's own and renamed into place when complete, so workers building
+    # it at the same time never read a half-written table (each rename swaps in a whole one)
+    scores = evaluate_hands(all_hands())
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    table = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.int8, shape=(NUM_HANDS, 8))
+    try:
+        table[:, :4] = scores
+        for turned_down in range(4):
+            # computer_choose_call_suit sets the turned down suit to 0 then takes the first suit with the most points
+            remaining = scores.copy()
+            remaining[:, turned_down] = 0
+            table[:, 4 + turned_down] = np.argmax(remaining, axis=1)
+        table.flush()
+        os.replace(temp_path, path)
+    except BaseException:
+        del table
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return table
+
+
+loaded_tables = {}
+
+
+def load_table(path=TABLE_PATH):
+    # Memory-maps the bidding table, building it first if the file does not exist yet
+    if path not in loaded_tables:
+        if not os.path.exists(path):
+            build_table(path)
+        loaded_tables[path] = np.load(path, mmap_mode='r')
+    return loaded_tables[path]
+
+
+loaded_strength_rows = {}
+
+
+def strength_rows(path=TABLE_PATH):
+    # The table's suit strength columns as Python lists, one [Clubs, Diamonds, Hearts, Spades] list per hand rank, for
+    # looking hands up one at a time without the cost of NumPy scalar indexing (about 4MB per process)
+    if path not in loaded_strength_rows:
+        loaded_strength_rows[path] = load_table(path)[:, :4].tolist()
+    return loaded_strength_rows[path]
+
+
+def hand_strengths(cards, rows=None):
+    # Player.evaluate_cards for 5 card indexes, by table lookup. Returns a new list, which the bidding may change
+    if rows is None:
+        rows = strength_rows()
+    return list(rows[hand_rank(cards)])
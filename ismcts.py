@@ -0,0 +1,262 @@
+import math
+import multiprocessing
+import random
+import time
+
+from kernel import EFFECTIVE_SUIT, EFFECTIVE_SUIT_MASKS, FULL_DECK, TRICK_RANK, card_count, cards_in
+
+
+# Information set Monte Carlo tree search (ISMCTS) card player
+# Each iteration deals the cards this seat can't see into a random layout that agrees with everything it has seen
+# (cards played, suits other players have shown out of, the flipped card the dealer picked up), then walks one
+# shared tree of card plays and finishes the round with random legal plays. The card tried most often is played
+# It plugs into the headless game as a strategy: simulate.play_computer_game(strategies={2: ISMCTSPlayer()})
+# Internally seats are 0-3 (seat number - 1) so that seat % 2 is the team
+
+
+class Node:
+    __slots__ = ('card', 'team', 'children', 'visits', 'reward', 'avails')
+
+    def __init__(self, card=None, team=None):
+        self.card = card  # Card played to reach this node
+        self.team = team  # Team (0 or 1) of the seat that played it
+        self.children = {}  # Card index -> Node
+        self.visits = 0
+        self.reward = 0.0  # Total share of the remaining tricks won by team, over all visits
+        self.avails = 0  # How many times this card was legal when its parent was visited
+
+
+class ISMCTSPlayer:
+    def __init__(self, iterations=None, time_limit=0.1, exploration=0.7, rng=None):
+        # Stops after iterations playouts, or after time_limit seconds, whichever comes first. Give iterations and
+        # time_limit=None for a fixed amount of search that doesn't depend on the speed of the machine
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.rng = rng if rng is not None else random.Random()
+        self.last_iterations = 0  # Playouts run for the most recent decision
+
+    def choose_card(self, view):
+        root = self.search(view)
+        return max(root.children.values(), key=lambda child: child.visits).card
+
+    def search(self, view, root=None):
+        # Runs the search for one decision and returns the root node. Passing a root adds more playouts to it
+        if root is None:
+            root = Node()
+        legal = legal_cards(view.hand, view.context.trump, view.trick)
+        if legal & (legal - 1) == 0:  # Only one card can be played, no need to think
+            root.children[legal.bit_length() - 1] = Node(legal.bit_length() - 1, (view.seat - 1) % 2)
+            root.children[legal.bit_length() - 1].visits = 1
+            return root
+
+        knowledge = Knowledge(view)
+        trump = view.context.trump
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        count = 0
+        while self.iterations is None or count < self.iterations:
+            if deadline is not None and count % 16 == 0 and time.perf_counter() >= deadline:
+                break
+            hands = knowledge.sample(self.rng)
+            self.iterate(root, hands, trump, view.leader - 1, list(view.trick))
+            count += 1
+        self.last_iterations = count
+        return root
+
+    def iterate(self, root, hands, trump, leader, trick):
+        # One ISMCTS iteration on a determinized deal: select/expand in the tree, play out randomly, back up
+        rng = self.rng
+        ranks = TRICK_RANK[trump]
+        tricks = [0, 0]
+        path = []
+        node = root
+        in_tree = True
+
+        while hands[(leader + len(trick)) % 4] or trick:
+            seat = (leader + len(trick)) % 4
+            hand = hands[seat]
+            legal = hand & EFFECTIVE_SUIT_MASKS[trump][EFFECTIVE_SUIT[trump][trick[0]]] if trick else hand
+            if not legal:
+                legal = hand
+
+            if in_tree:
+                moves = list(cards_in(legal))
+                untried = [card for card in moves if card not in node.children]
+                for card in moves:
+                    if card in node.children:
+                        node.children[card].avails += 1
+                if untried:
+                    card = rng.choice(untried)
+                    child = Node(card, seat % 2)
+                    child.avails = 1
+                    node.children[card] = child
+                    in_tree = False
+                else:
+                    child = self.select(node, moves)
+                    card = child.card
+                node = child
+                path.append(node)
+            else:
+                moves = list(cards_in(legal))
+                card = moves[rng.randrange(len(moves))] if len(moves) > 1 else moves[0]
+
+            hands[seat] &= ~(1 << card)
+            trick.append(card)
+            if len(trick) == 4:
+                trick_ranks = ranks[EFFECTIVE_SUIT[trump][trick[0]]]
+                winner = 0
+                for position in range(1, 4):
+                    if trick_ranks[trick[position]] > trick_ranks[trick[winner]]:
+                        winner = position
+                leader = (leader + winner) % 4
+                tricks[leader % 2] += 1
+                trick = []
+
+        total = max(tricks[0] + tricks[1], 1)
+        for node in path:
+            node.visits += 1
+            node.reward += tricks[node.team] / total
+        root.visits += 1
+
+    def select(self, node, moves):
+        # UCB1, using how often a card was available instead of the parent's visits (cards aren't always legal)
+        best = None
+        best_score = -1.0
+        for card in moves:
+            child = node.children[card]
+            score = child.reward / child.visits + self.exploration * math.sqrt(math.log(child.avails) / child.visits)
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+
+def root_statistics(task):
+    # Worker function for RootParallelPlayer: searches one independent tree and returns its root move statistics
+    view, iterations, time_limit, exploration, seed = task
+    player = ISMCTSPlayer(iterations, time_limit, exploration, random.Random(seed))
+    root = player.search(view)
+    return {card: (child.visits, child.reward) for card, child in root.children.items()}, player.last_iterations
+
+
+class RootParallelPlayer:
+    # Root parallel ISMCTS: every worker process searches its own tree for the same decision with its own random
+    # determinizations, then the visit counts and rewards of the root moves are added together and the most visited
+    # card is played. With a time limit each worker gets the full budget, so playouts per decision grow with workers
+    # The pool is started on the first decision and kept for the rest; call close() (or use a with block) when done
+    def __init__(self, workers=None, iterations=None, time_limit=0.1, exploration=0.7, seed=None):
+        # iterations is per worker
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.seeds = random.Random(seed)
+        self.pool = None
+        self.last_iterations = 0  # Playouts run for the most recent decision, across all workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def choose_card(self, view):
+        legal = legal_cards(view.hand, view.context.trump, view.trick)
+        if legal & (legal - 1) == 0:
+            self.last_iterations = 0
+            return legal.bit_length() - 1
+
+        tasks = [(view, self.iterations, self.time_limit, self.exploration, self.seeds.getrandbits(64))
+                 for _ in range(self.workers)]
+        if self.workers <= 1:
+            results = [root_statistics(task) for task in tasks]
+        else:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(processes=self.workers)
+            results = self.pool.map(root_statistics, tasks)
+
+        visits = {}
+        rewards = {}
+        self.last_iterations = 0
+        for statistics, iterations in results:
+            self.last_iterations += iterations
+            for card, (card_visits, card_reward) in statistics.items():
+                visits[card] = visits.get(card, 0) + card_visits
+                rewards[card] = rewards.get(card, 0.0) + card_reward
+        # Most visits wins; the total reward breaks ties so the choice doesn't depend on dict order
+        return max(visits, key=lambda card: (visits[card], rewards[card], -card))
+
+
+def legal_cards(hand, trump, trick):
+    if trick:
+        follow = hand & EFFECTIVE_SUIT_MASKS[trump][EFFECTIVE_SUIT[trump][trick[0]]]
+        if follow:
+            return follow
+    return hand
+
+
+class Knowledge:
+    # Works out what one seat knows about where the unseen cards are, then deals random layouts that agree with it
+    def __init__(self, view):
+        context = view.context
+        trump = context.trump
+        me = view.seat - 1
+        played = 0
+        played_count = [0, 0, 0, 0]
+        self.voids = [0, 0, 0, 0]  # Mask of the suits each seat has shown out of
+
+        tricks = list(context.history) + [(view.leader, view.trick)]
+        for leader, cards in tricks:
+            if not cards:
+                continue
+            led_suit = EFFECTIVE_SUIT[trump][cards[0]]
+            for position, card in enumerate(cards):
+                seat = (leader - 1 + position) % 4
+                played |= 1 << card
+                played_count[seat] += 1
+                if EFFECTIVE_SUIT[trump][card] != led_suit:
+                    self.voids[seat] |= EFFECTIVE_SUIT_MASKS[trump][led_suit]
+
+        self.known = [0, 0, 0, 0]  # Cards known to be in each hand
+        self.known[me] = view.hand
+        unseen = FULL_DECK & ~played & ~view.hand
+        flipped = 1 << context.flipped
+        if unseen & flipped:
+            unseen &= ~flipped
+            # Turned down, the flipped card is out of play. Picked up, it is in the dealer's hand
+            if context.ordered_up and context.dealer - 1 != me and played_count[context.dealer - 1] < 5:
+                self.known[context.dealer - 1] |= flipped
+
+        self.unseen = unseen
+        self.me = me
+        self.need = [5 - played_count[seat] - card_count(self.known[seat]) for seat in range(4)]
+        self.need[me] = 0
+        # Deal to the seats with the fewest possible cards first
+        self.order = sorted((seat for seat in range(4) if seat != me),
+                            key=lambda seat: card_count(unseen & ~self.voids[seat]))
+
+    def sample(self, rng, attempts=20):
+        # Returns 4 hand masks. If the void constraints can't be met by random dealing, they are dropped
+        for attempt in range(attempts + 1):
+            hands = list(self.known)
+            available = self.unseen
+            for seat in self.order:
+                need = self.need[seat]
+                if not need:
+                    continue
+                allowed = available if attempt == attempts else available & ~self.voids[seat]
+                choices = list(cards_in(allowed))
+                if len(choices) < need:
+                    break
+                for card in rng.sample(choices, need):
+                    hands[seat] |= 1 << card
+                    available &= ~(1 << card)
+            else:
+                return hands
+        return hands
@@ -0,0 +1,149 @@
+# Bitmask rules kernel for Euchre
+# Each of the 24 cards is an integer index: suit * 6 + rank, using the same suit and rank order that Deck.build uses,
+# so index 0 is the 9 of Clubs and index 23 is the Ace of Spades. A hand (or any set of cards) is a 24-bit integer
+# with bit i set when card i is in it
+# Suits are integers too (0 Clubs, 1 Diamonds, 2 Hearts, 3 Spades). The other suit of the same color is always
+# 3 - suit, which is where the left bower comes from
+# Follow suit, clincher membership and left bower remapping are answered with masks built once at import
+
+SUITS = ['Clubs', 'Diamonds', 'Hearts', 'Spades']
+RANKS = ['9', '10', 'Jack', 'Queen', 'King', 'Ace']
+NUM_CARDS = 24
+
+NINE, TEN, JACK, QUEEN, KING, ACE = range(6)
+CLUBS, DIAMONDS, HEARTS, SPADES = range(4)
+
+FULL_DECK = (1 << NUM_CARDS) - 1
+
+
+def card_index(suit, rank):
+    # suit and rank may be given as names ('Hearts', 'Queen') or as integers
+    if isinstance(suit, str):
+        suit = SUITS.index(suit)
+    if isinstance(rank, str):
+        rank = RANKS.index(rank)
+    return suit * 6 + rank
+
+
+def card_suit(card):
+    return card // 6
+
+
+def card_rank(card):
+    return card % 6
+
+
+def same_color_suit(suit):
+    # Clubs <-> Spades, Diamonds <-> Hearts
+    return 3 - suit
+
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+CARD_STRINGS = [f'{rank} of {suit}' for suit in SUITS for rank in RANKS]  # Matches Card.card_string
+CARD_INDEX = {card_string: i for i, card_string in enumerate(CARD_STRINGS)}
+
+SUIT_MASKS = [0b111111 << (6 * suit) for suit in range(4)]  # The natural suit of each card, ignoring clincher
+
+RIGHT_BOWER = [card_index(suit, JACK) for suit in range(4)]  # Indexed by clincher suit
+LEFT_BOWER = [card_index(same_color_suit(suit), JACK) for suit in range(4)]
+
+TRUMP_MASKS = [SUIT_MASKS[trump] | (1 << LEFT_BOWER[trump]) for trump in range(4)]
+
+# EFFECTIVE_SUIT_MASKS[trump][suit] holds the cards that count as suit once clincher is known:
+# the left bower moves from its own suit into the clincher suit
+EFFECTIVE_SUIT_MASKS = [[TRUMP_MASKS[trump] if suit == trump else SUIT_MASKS[suit] & ~TRUMP_MASKS[trump]
+                         for suit in range(4)] for trump in range(4)]
+
+# EFFECTIVE_SUIT[trump][card] is the suit a card follows as, the same as Card.left_bower_suit
+EFFECTIVE_SUIT = [[trump if card == LEFT_BOWER[trump] else card_suit(card) for card in range(NUM_CARDS)]
+                  for trump in range(4)]
+
+
+def bit(card):
+    return 1 << card
+
+
+def cards_in(mask):
+    # Yields the card indexes in a mask from lowest to highest
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def card_count(mask):
+    return mask.bit_count()
+
+
+def mask_from_strings(card_strings):
+    mask = 0
+    for card_string in card_strings:
+        mask |= 1 << CARD_INDEX[card_string]
+    return mask
+
+
+def mask_from_cards(cards):
+    # Converts a list of Card objects (such as Player.hand) into a mask
+    return mask_from_strings(c.card_string for c in cards)
+
+
+def strings_from_mask(mask):
+    return [CARD_STRINGS[card] for card in cards_in(mask)]
+
+
+def is_trump(card, trump):
+    return TRUMP_MASKS[trump] >> card & 1 == 1
+
+
+def effective_suit(card, trump):
+    return EFFECTIVE_SUIT[trump][card]
+
+
+def legal_plays(hand, trump, led_suit=None):
+    # Returns the mask of cards that may be played. The leader may play anything. Everyone else must follow the
+    # effective suit that was led if they can, otherwise they may play anything
+    if led_suit is None:
+        return hand
+    follow = hand & EFFECTIVE_SUIT_MASKS[trump][led_suit]
+    return follow if follow else hand
+
+
+def can_follow_suit(hand, trump, led_suit):
+    return hand & EFFECTIVE_SUIT_MASKS[trump][led_suit] != 0
+
+
+# Trick ranking, the same point values assign_points gives cards: clincher cards score 7-13 (9 up to the right bower),
+# cards of the suit that was led score 1-6 (9 up to Ace) and everything else scores 0 and can't win the trick
+TRUMP_POINTS = {NINE: 7, TEN: 8, QUEEN: 9, KING: 10, ACE: 11}
+LEAD_POINTS = {NINE: 1, TEN: 2, JACK: 3, QUEEN: 4, KING: 5, ACE: 6}
+
+
+def trick_points(card, trump, led_suit):
+    if card == RIGHT_BOWER[trump]:
+        return 13
+    if card == LEFT_BOWER[trump]:
+        return 12
+    if card_suit(card) == trump:
+        return TRUMP_POINTS[card_rank(card)]
+    if EFFECTIVE_SUIT[trump][card] == led_suit:
+        return LEAD_POINTS[card_rank(card)]
+    return 0
+
+
+# TRICK_RANK[trump][led_suit][card] is the point value of a card in a trick, built once here instead of every trick
+TRICK_RANK = [[[trick_points(card, trump, led_suit) for card in range(NUM_CARDS)] for led_suit in range(4)]
+              for trump in range(4)]
+
+
+def trick_winner(played, trump):
+    # played is a list of card indexes in the order they were played. The first card sets the suit that was led
+    # Returns the position in played of the winning card
+    ranks = TRICK_RANK[trump][EFFECTIVE_SUIT[trump][played[0]]]
+    winner = 0
+    best = ranks[played[0]]
+    for position in range(1, len(played)):
+        points = ranks[played[position]]
+        if points > best:
+            winner = position
+            best = points
+    return winner
@@ -0,0 +1,145 @@
+import argparse
+import json
+import multiprocessing
+import time
+
+import Euchre
+from simulate import BiddingThresholds
+from tournament import Entrant, PairingResult, play_pair
+
+
+# Searches for the computer's best bidding thresholds (see simulate.BiddingThresholds): ordering up by position,
+# the dealer picking up and calling on the second pass by position
+# A candidate is scored by playing it as a partnership against the standard computer (points_to_call_suit for every
+# bid) in mirrored pairs of games (see tournament.py). Every candidate plays the same pairs, with the same deals and
+# randomness, so differences between candidates come from the bidding and not from the cards
+# The search is coordinate descent: each threshold in turn is tried at every value in values while the others stay
+# put, the best value is kept, and passes repeat until nothing improves. The candidates of a sweep are spread over a
+# pool of worker processes. The winner is then measured again on fresh deals, since the score that picked it is
+# biased upwards by the picking
+
+NAMES = ['order up 1st', 'order up 2nd', 'order up 3rd', 'dealer pick up', 'call 1st', 'call 2nd', 'call 3rd']
+
+
+def evaluate_pairs(task):
+    # Worker function: first's pair scores against the baseline for pairs first_pair up to first_pair + count
+    values, baseline, seed, first_pair, count = task
+    candidate = Entrant('candidate', pts_to_call_suit=BiddingThresholds.from_values(values))
+    standard = Entrant('standard', pts_to_call_suit=baseline)
+    return [play_pair(candidate, standard, f'{seed}:{pair}', pair % 4 + 1)
+            for pair in range(first_pair, first_pair + count)]
+
+
+class Evaluation(PairingResult):
+    # A candidate's pair scores against the standard computer
+    def __init__(self, values, scores):
+        super().__init__('candidate', 'standard')
+        self.values = list(values)
+        self.pair_scores = scores
+
+
+class ThresholdOptimizer:
+    def __init__(self, pairs=200, values=range(20, 42, 2), passes=3, seed=0, workers=None, baseline=None,
+                 chunk_pairs=25):
+        self.pairs = pairs  # Mirrored pairs (2 games each) per candidate
+        self.values = list(values)
+        self.passes = passes
+        self.seed = seed
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.baseline = baseline if baseline is not None else Euchre.points_to_call_suit
+        self.chunk_pairs = chunk_pairs
+        self.cache = {}  # Tuple of values -> Evaluation, for the search deals
+        self.pool = None
+
+    def evaluate(self, candidates, seed=None, pairs=None):
+        # Evaluations of a list of threshold value lists, worked out in parallel
+        seed = self.seed if seed is None else seed
+        pairs = self.pairs if pairs is None else pairs
+        tasks = []
+        for values in candidates:
+            for first in range(0, pairs, self.chunk_pairs):
+                count = min(self.chunk_pairs, pairs - first)
+                tasks.append((list(values), self.baseline, f'optimize:{seed}', first, count))
+        if self.pool is None and self.workers > 1:
+            self.pool = multiprocessing.Pool(processes=self.workers)
+        results = self.pool.map(evaluate_pairs, tasks) if self.pool is not None else list(map(evaluate_pairs, tasks))
+
+        evaluations = []
+        chunks = len(tasks) // max(len(candidates), 1)
+        for i, values in enumerate(candidates):
+            scores = [score for chunk in results[i * chunks:(i + 1) * chunks] for score in chunk]
+            evaluations.append(Evaluation(values, scores))
+        return evaluations
+
+    def evaluate_cached(self, candidates):
+        missing = [values for values in candidates if tuple(values) not in self.cache]
+        for evaluation in self.evaluate(missing) if missing else []:
+            self.cache[tuple(evaluation.values)] = evaluation
+        return [self.cache[tuple(values)] for values in candidates]
+
+    def run(self, verify_pairs=None, log=print):
+        # Returns (best BiddingThresholds, Evaluation on the search deals, Evaluation on fresh deals)
+        try:
+            current = BiddingThresholds.uniform(self.baseline).values()
+            best = self.evaluate_cached([current])[0]
+            log(f'start {current}: {best.win_rate:.1%}')
+            for number in range(self.passes):
+                improved = False
+                for position, name in enumerate(NAMES):
+                    candidates = []
+                    for value in self.values:
+                        candidate = list(current)
+                        candidate[position] = value
+                        candidates.append(candidate)
+                    for evaluation in self.evaluate_cached(candidates):
+                        if evaluation.win_rate > best.win_rate:
+                            best = evaluation
+                            improved = True
+                    current = best.values
+                    log(f'pass {number + 1} {name:15} -> {current}: {best.win_rate:.1%}')
+                if not improved:
+                    break
+            verified = self.evaluate([current], seed=f'{self.seed}:verify', pairs=verify_pairs or self.pairs)[0]
+            return BiddingThresholds.from_values(current), best, verified
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+                self.pool = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Optimize the computer bidding thresholds')
+    parser.add_argument('--pairs', type=int, default=200, help='mirrored pairs of games per candidate')
+    parser.add_argument('--passes', type=int, default=3)
+    parser.add_argument('--min', type=int, default=20, help='lowest threshold tried')
+    parser.add_argument('--max', type=int, default=40, help='highest threshold tried')
+    parser.add_argument('--step', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--output', metavar='PATH', help='save the best configuration as JSON')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    optimizer = ThresholdOptimizer(args.pairs, range(args.min, args.max + 1, args.step), args.passes, args.seed,
+                                   args.workers)
+    thresholds, searched, verified = optimizer.run()
+    low, high = verified.interval()
+    result = {
+        'thresholds': dict(zip(NAMES, thresholds.values())),
+        'baseline': optimizer.baseline,
+        'search_win_rate': round(searched.win_rate, 4),
+        'win_rate': round(verified.win_rate, 4),
+        'ci95': [round(low, 4), round(high, 4)],
+        'games': verified.games,
+        'candidates': len(optimizer.cache),
+        'seconds': round(time.perf_counter() - start, 1),
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
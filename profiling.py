@@ -0,0 +1,166 @@
+import importlib
+import json
+import os
+import sys
+import time
+
+
+# Opt-in call counts and timings for the phases of a round: bidding, trick play and scoring
+# enable() swaps the functions listed in INSTRUMENTED for timing wrappers everywhere they are referenced in this
+# project's modules (the module that defines them and modules that imported them by name), and disable() puts the
+# originals back. Modules from outside the project directory are never touched. While disabled nothing is wrapped, so
+# leaving this module in costs nothing
+#
+#   profiling.enable()
+#   simulate.play_computer_games(1000)
+#   profiling.disable()
+#   print(profiling.stats.report())
+#
+# Times are inclusive, so play_trick's time also holds the time of the helpers it calls. A phase's time only counts
+# the outermost instrumented call, so nested calls in the same phase are not counted twice
+
+BIDDING = 'bidding'
+TRICK_PLAY = 'trick play'
+SCORING = 'scoring'
+
+# (module, function, phase)
+INSTRUMENTED = [
+    ('Euchre', 'computer_order_up_card', BIDDING),
+    ('Euchre', 'computer_pick_up_card', BIDDING),
+    ('Euchre', 'computer_choose_call_suit', BIDDING),
+    ('Euchre', 'computer_must_call_suit', BIDDING),
+    ('simulate', 'computer_bidding', BIDDING),
+    ('Euchre', 'play_trick', TRICK_PLAY),
+    ('simulate', 'computer_trick', TRICK_PLAY),
+    ('Euchre', 'assign_clincher', TRICK_PLAY),
+    ('Euchre', 'assign_points', TRICK_PLAY),
+    ('Euchre', 'computer_lead_card', TRICK_PLAY),
+    ('Euchre', 'computer_play_card', TRICK_PLAY),
+    ('Euchre', 'following_cards', TRICK_PLAY),
+    ('Euchre', 'follow_suit_card', TRICK_PLAY),
+    ('Euchre', 'clincher_card', TRICK_PLAY),
+    ('Euchre', 'discard_card', TRICK_PLAY),
+    ('Euchre', 'determine_trick_winner', TRICK_PLAY),
+    ('Euchre', 'best_card_played', TRICK_PLAY),
+    ('Euchre', 'score_round', SCORING),
+]
+
+
+class ProfileStats:
+    def __init__(self):
+        self.calls = {}  # 'module.function' -> number of calls
+        self.seconds = {}  # 'module.function' -> total time inside the function
+        self.phase_calls = {}  # Phase -> number of outermost calls
+        self.phase_seconds = {}
+
+    def add(self, name, phase, seconds, outermost):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        if outermost:
+            self.phase_calls[phase] = self.phase_calls.get(phase, 0) + 1
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+    def merge(self, other):
+        for totals, extra in ((self.calls, other.calls), (self.seconds, other.seconds),
+                              (self.phase_calls, other.phase_calls), (self.phase_seconds, other.phase_seconds)):
+            for key, value in extra.items():
+                totals[key] = totals.get(key, 0) + value
+        return self
+
+    def summary(self):
+        return {
+            'phases': {phase: {'calls': self.phase_calls[phase], 'seconds': round(self.phase_seconds[phase], 6)}
+                       for phase in sorted(self.phase_calls)},
+            'functions': {name: {'calls': self.calls[name], 'seconds': round(self.seconds[name], 6)}
+                          for name in sorted(self.calls)},
+        }
+
+    def report(self):
+        # A text table of the phases, then the functions from most to least time
+        lines = [f'{"phase / function":40} {"calls":>10} {"total s":>10} {"per call":>10}']
+        rows = sorted(self.phase_calls, key=self.phase_seconds.get, reverse=True)
+        rows = [(phase, self.phase_calls[phase], self.phase_seconds[phase]) for phase in rows]
+        rows += [(name, self.calls[name], self.seconds[name])
+                 for name in sorted(self.calls, key=self.seconds.get, reverse=True)]
+        for name, calls, seconds in rows:
+            lines.append(f'{name:40} {calls:>10} {seconds:>10.3f} {seconds / calls * 1e6:>8.2f}us')
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
+
+
+stats = ProfileStats()
+patched = []  # (namespace dict, key, original function) for everything enable() replaced
+depth = {}  # Phase -> how many instrumented calls of that phase are running
+
+
+def timed(function, name, phase):
+    def wrapper(*args, **kwargs):
+        outermost = not depth.get(phase)
+        depth[phase] = depth.get(phase, 0) + 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.add(name, phase, time.perf_counter() - start, outermost)
+            depth[phase] -= 1
+    wrapper.__wrapped__ = function
+    wrapper.__name__ = function.__name__
+    return wrapper
+
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def project_modules():
+    # Names of the loaded modules that are files in this project's directory
+    names = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == PROJECT_DIR:
+            names.append(name)
+    return names
+
+
+def namespaces(modules=None):
+    # Every place a reference to an instrumented function may be kept: the namespaces of the named modules (the
+    # project's modules by default) that are loaded. Default arguments and ComputerPolicy instances don't hold them:
+    # the computer's card play looks its functions up in Euchre when it is called
+    if modules is None:
+        modules = project_modules()
+    return [vars(sys.modules[name]) for name in modules if sys.modules.get(name) is not None]
+
+
+def enable(new_stats=None, modules=None):
+    # Starts collecting into stats (a new ProfileStats if new_stats is None). Returns the stats object
+    # modules optionally names the modules to patch instead of every project module; the modules defining the
+    # INSTRUMENTED functions are always patched
+    global stats
+    disable()
+    stats = new_stats if new_stats is not None else ProfileStats()
+    wrappers = {}
+    for module_name, function_name, phase in INSTRUMENTED:
+        original = getattr(importlib.import_module(module_name), function_name)
+        wrappers[id(original)] = (original, timed(original, f'{module_name}.{function_name}', phase))
+    if modules is not None:
+        modules = list(dict.fromkeys([module_name for module_name, _, _ in INSTRUMENTED] + list(modules)))
+    for space in namespaces(modules):
+        for key, value in list(space.items()):
+            if callable(value) and id(value) in wrappers and wrappers[id(value)][0] is value:
+                space[key] = wrappers[id(value)][1]
+                patched.append((space, key, value))
+    return stats
+
+
+def disable():
+    # Puts the original functions back. The stats collected so far are kept
+    while patched:
+        space, key, original = patched.pop()
+        space[key] = original
+    depth.clear()
+
+
+def enabled():
+    return bool(patched)
@@ -0,0 +1,205 @@
+import struct
+
+from deals import UP_CARD, decode_deal, encode_deal
+from engine import PASS, PICK_UP, next_seat
+from kernel import SUIT_INDEX, trick_winner
+
+
+# Compact binary game records. Every round of a game is one fixed-width record of ROUND.size (51) bytes:
+#   game     uint32  game number, so the rounds of a game can be grouped back together
+#   deal     int64   deal number (deals.encode_deal): the 4 hands and the kitty with the flipped card
+#   dealer   uint8   seat 1-4
+#   passes   uint8   passes before clincher was called: 0-3 means it was ordered up on the first pass, 4-7 that it
+#                    was called on the second pass
+#   caller   uint8   seat 1-4
+#   trump    uint8   suit index of clincher
+#   plays    20 bytes  card indexes of the 5 tricks in the order they were played. Who led each trick follows from
+#                    who won the one before, starting left of the dealer
+#   points   2 x int8  points scored by team 1 and team 2
+#   order    5 bytes  the order the cards were dealt in, which the deal number leaves out: the permutation index
+#                    (0-119, see permutation_index) of each seat's 5 cards, then of the 3 kitty cards after the flipped
+#                    card (0-5)
+#   seed     uint64   what random was seeded with for the round (simulate.computer_round), 0 if it wasn't. Rounds
+#                    are seeded from 1 up, so 0 is never a real seed and reads back as None
+# The deal number, order and seed are everything needed to play a round again exactly (see replay.py)
+# A file is a HEADER followed by records. Writers only ever append, and read_records streams a file in blocks so files
+# of tens of millions of rounds never have to fit in memory
+
+MAGIC = b'EUCHREGR'
+VERSION = 1
+HEADER = struct.Struct('<8sHH')  # Magic, version, record size
+ROUND = struct.Struct('<IqBBBB20sbb5sQ')
+NO_SEED = 0
+READ_BLOCK = 4096  # Records read at a time
+
+
+class RoundRecord:
+    __slots__ = ('game', 'deal', 'dealer', 'passes', 'caller', 'trump', 'plays', 'points', 'order', 'seed')
+
+    def __init__(self, game, deal, dealer, passes, caller, trump, plays, points, order, seed=None):
+        self.game = game
+        self.deal = deal  # Deal number
+        self.dealer = dealer
+        self.passes = passes
+        self.caller = caller
+        self.trump = trump
+        self.plays = plays  # bytes, 4 cards per trick
+        self.points = points  # (team 1 points, team 2 points)
+        self.order = order  # bytes, see deal_order
+        self.seed = seed  # None if the round wasn't seeded
+
+    @property
+    def ordered_up(self):
+        return self.passes < 4
+
+    def cards(self):
+        # The deal as 24 card indexes, in the order they were dealt
+        return ordered_deal(decode_deal(self.deal), self.order)
+
+    def bids(self):
+        # The bidding as (seat, action) in engine.py terms: PASS, PICK_UP or the suit called
+        bids = []
+        seat = next_seat(self.dealer)
+        for _ in range(self.passes):
+            bids.append((seat, PASS))
+            seat = next_seat(seat)
+        bids.append((seat, PICK_UP if self.ordered_up else self.trump))
+        return bids
+
+    def tricks(self):
+        # The tricks as (seat that led, [card indexes in the order played])
+        tricks = []
+        leader = next_seat(self.dealer)
+        for start in range(0, len(self.plays), 4):
+            cards = list(self.plays[start:start + 4])
+            tricks.append((leader, cards))
+            leader = (leader - 1 + trick_winner(cards, self.trump)) % 4 + 1
+        return tricks
+
+    def pack(self):
+        return ROUND.pack(self.game, self.deal, self.dealer, self.passes, self.caller, self.trump, self.plays,
+                          self.points[0], self.points[1], self.order,
+                          NO_SEED if self.seed is None else self.seed)
+
+    @classmethod
+    def unpack(cls, data, offset=0):
+        return cls.from_fields(ROUND.unpack_from(data, offset))
+
+    @classmethod
+    def from_fields(cls, fields):
+        # From a tuple of ROUND fields
+        seed = fields[10]
+        return cls(*fields[:7], fields[7:9], fields[9], None if seed == NO_SEED else seed)
+
+
+def permutation_index(cards):
+    # The rank (Lehmer code) of this order of the cards among all orders of the same cards, 0 for increasing order
+    index = 0
+    for i, card in enumerate(cards):
+        index = index * (len(cards) - i) + sum(1 for later in cards[i + 1:] if later < card)
+    return index
+
+
+def permuted(cards, index):
+    # The order of the increasing cards with the given permutation_index
+    digits = []
+    for radix in range(1, len(cards) + 1):
+        index, digit = divmod(index, radix)
+        digits.append(digit)
+    left = list(cards)
+    return [left.pop(digit) for digit in reversed(digits)]
+
+
+def deal_order(deal):
+    # The order field for a deal (24 card indexes as dealt)
+    return bytes([permutation_index(deal[start:start + 5]) for start in range(0, 20, 5)] +
+                 [permutation_index(deal[UP_CARD + 1:])])
+
+
+def ordered_deal(cards, order):
+    # Undoes deal_order: cards is the deal with each hand and the rest of the kitty in increasing order
+    deal = []
+    for seat in range(4):
+        deal.extend(permuted(cards[seat * 5:seat * 5 + 5], order[seat]))
+    return deal + [cards[UP_CARD]] + permuted(cards[UP_CARD + 1:], order[4])
+
+
+def passes_before(dealer, caller, ordered_up):
+    # Every seat from the one left of the dealer passes until the caller speaks
+    passes = (caller - dealer - 1) % 4
+    return passes if ordered_up else passes + 4
+
+
+def plays_bytes(history):
+    return bytes(card for _, cards in history for card in cards)
+
+
+def round_from_result(game, result):
+    # RoundRecord for a simulate.RoundResult
+    return RoundRecord(game, encode_deal(result.deal), result.dealer,
+                       passes_before(result.dealer, result.caller, result.ordered_up), result.caller,
+                       SUIT_INDEX[result.trump], plays_bytes(result.history), result.points, deal_order(result.deal),
+                       result.seed)
+
+
+def round_from_state(game, state):
+    # RoundRecord for an engine.GameState once the round has been scored
+    # score_round has already moved the deal on, so the dealer is the seat before the first bidder
+    # The engine makes no random choices after the deal, so there is no seed to keep
+    dealer = (state.bids[0][0] - 2) % 4 + 1
+    passes = sum(1 for _, action in state.bids if action == PASS)
+    return RoundRecord(game, encode_deal(state.deal), dealer, passes, state.caller, state.trump,
+                       plays_bytes(state.history), state.round_points, deal_order(state.deal))
+
+
+def pack_game(game, result):
+    # All the rounds of a simulate.GameResult as bytes
+    return b''.join(round_from_result(game, r).pack() for r in result.rounds)
+
+
+class GameRecordWriter:
+    # Appends round records to a file, writing the header if the file is new. Use as a with block or call close()
+    # Only files of the current version can be appended to
+    def __init__(self, path):
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, ROUND.size))
+        else:
+            with open(path, 'rb') as f:
+                if f.read(HEADER.size) != HEADER.pack(MAGIC, VERSION, ROUND.size):
+                    self.file.close()
+                    raise ValueError(f'{path} is not a version {VERSION} game record file')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def write_round(self, record):
+        self.file.write(record.pack())
+
+    def write_game(self, game, result):
+        self.file.write(pack_game(game, result))
+
+    def write_bytes(self, data):
+        # Records that were already packed, such as pack_game output from a worker process
+        self.file.write(data)
+
+
+def read_records(path):
+    # Generator of RoundRecords from a file, in the order they were written
+    with open(path, 'rb') as f:
+        if f.read(HEADER.size) != HEADER.pack(MAGIC, VERSION, ROUND.size):
+            raise ValueError(f'{path} is not a version {VERSION} game record file')
+        while True:
+            block = f.read(READ_BLOCK * ROUND.size)
+            if not block:
+                break
+            if len(block) % ROUND.size:
+                raise ValueError(f'{path} ends with a partial record')
+            for fields in ROUND.iter_unpack(block):
+                yield RoundRecord.from_fields(fields)
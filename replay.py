@@ -0,0 +1,108 @@
+import argparse
+import time
+
+import Euchre
+from Euchre import Deck, Player
+from engine import next_seat
+from records import read_records
+from simulate import computer_round
+
+
+# Replays recorded rounds (see records.py) from their stored deals, optionally with some seats playing a different
+# strategy or ComputerPolicy, so strategies can be compared on exactly the same deals (common random numbers)
+# Every round is replayed on its own with the recorded dealer; game scores are not carried from round to round,
+# because a different strategy changes how long a game lasts. The cards are dealt in the recorded order and random is
+# reseeded with the round's recorded seed, so whatever randomness the computer players use is also the same for every
+# strategy, and a replay with the original players plays exactly the recorded cards. Rounds recorded without a seed
+# (engine.py games) are played without reseeding
+
+
+class Replayer:
+    def __init__(self, strategies=None, pts_to_call_suit=None):
+        self.strategies = strategies
+        self.pts_to_call_suit = pts_to_call_suit if pts_to_call_suit is not None else Euchre.points_to_call_suit
+        self.players = [Player(1), Player(2), Player(3), Player(4)]
+        self.deck = Deck()
+
+    def replay_round(self, record):
+        # Plays the recorded deal again and returns a simulate.RoundResult
+        return computer_round(self.players, self.deck, record.dealer, next_seat(record.dealer),
+                              self.pts_to_call_suit, self.strategies, record.cards(), record.seed)
+
+
+def replay(records, strategies=None, pts_to_call_suit=None):
+    # Generator of (record, RoundResult) for every record. records is an iterable of RoundRecords or a file path
+    if isinstance(records, str):
+        records = read_records(records)
+    replayer = Replayer(strategies, pts_to_call_suit)
+    for record in records:
+        yield record, replayer.replay_round(record)
+
+
+class Comparison:
+    # Totals from replaying the same rounds two ways, a and b
+    def __init__(self):
+        self.rounds = 0
+        self.points_a = [0, 0]  # [team 1, team 2]
+        self.points_b = [0, 0]
+        self.tricks_a = [0, 0]
+        self.tricks_b = [0, 0]
+        self.changed = 0  # Rounds where the points came out differently
+
+    def add(self, a, b):
+        self.rounds += 1
+        for team in range(2):
+            self.points_a[team] += a.points[team]
+            self.points_b[team] += b.points[team]
+            self.tricks_a[team] += a.tricks[team]
+            self.tricks_b[team] += b.tricks[team]
+        if a.points != b.points:
+            self.changed += 1
+
+    def summary(self):
+        rounds = max(self.rounds, 1)
+        return {
+            'rounds': self.rounds,
+            'changed': self.changed,
+            'points_a': self.points_a,
+            'points_b': self.points_b,
+            'tricks_a': self.tricks_a,
+            'tricks_b': self.tricks_b,
+            # Net points per round for team 1 (b minus a), positive when b is better for team 1
+            'team1_gain_per_round': round(((self.points_b[0] - self.points_b[1]) -
+                                           (self.points_a[0] - self.points_a[1])) / rounds, 6),
+        }
+
+
+def compare(records, strategies_a=None, strategies_b=None, pts_to_call_suit=None):
+    # Replays every record with strategies_a and with strategies_b (None is the plain computer player for every
+    # seat) and returns a Comparison. The file is only read once
+    if isinstance(records, str):
+        records = read_records(records)
+    replay_a = Replayer(strategies_a, pts_to_call_suit)
+    replay_b = Replayer(strategies_b, pts_to_call_suit)
+    comparison = Comparison()
+    for record in records:
+        comparison.add(replay_a.replay_round(record), replay_b.replay_round(record))
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a game record file with the computer players')
+    parser.add_argument('path', help='game record file written by farm.py --record')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rounds = 0
+    points = [0, 0]
+    for record, result in replay(args.path):
+        rounds += 1
+        points[0] += result.points[0]
+        points[1] += result.points[1]
+    elapsed = time.perf_counter() - start
+    print(f'Replayed {rounds} rounds in {elapsed:.2f}s ({rounds / elapsed:.0f} rounds/s). '
+          f'Points {points[0]}-{points[1]}')
+
+
+if __name__ == '__main__':
+    main()
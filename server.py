@@ -0,0 +1,339 @@
+import argparse
+import asyncio
+import random
+import time
+
+import Euchre
+from Euchre import Deck, Trick, assign_clincher, assign_left_bower, assign_points
+from engine import CALL_SUIT, DISCARD, GAME_OVER, ORDER_UP, PASS, PICK_UP, PLAY, EuchreEngine, GameState
+from hand_index import FLIPPED_CARD_POINTS, hand_strengths
+from kernel import NUM_CARDS, SUITS, card_rank, card_suit, cards_in
+from simulate import COMPUTER_POLICY, partner_of
+
+
+# Asyncio server that hosts many Euchre tables in one process. Every connection gets its own table where the client
+# plays seat 1 against 3 computer seats, the same seating as the interactive game, and games are dealt one after
+# another until the client leaves. A table is a coroutine running engine.py's state machine: where the interactive
+# game calls input() the table sends a question and awaits the answer line, and the time.sleep pacing is an
+# asyncio.sleep (scaled by pace, 0 turns it off), so an idle table costs nothing but its socket
+#
+# The protocol is one line of text per message. Cards are written as rank and suit letter: 9C 10D JH QS KC AD
+# Server to client:
+#   WELCOME <table number>
+#   DEAL dealer=<seat> up=<card> hand=<card>,<card>,...
+#   BID seat=<seat> action=<pass|pickup|suit name>
+#   HAND <card>,<card>,...                    seat 1's hand, after it changes other than by playing a card
+#   TRUMP suit=<suit name> caller=<seat>
+#   PLAY seat=<seat> card=<card>
+#   TRICK winner=<seat> tricks=<team 1>-<team 2>
+#   ROUND points=<team 1>-<team 2> score=<team 1>-<team 2>
+#   GAMEOVER winner=<team> score=<team 1>-<team 2>
+#   ASK <bid|call|discard|play> <option> <option> ...
+#   ERROR <message>
+# Client to server: one of the options of the last ASK, or QUIT
+
+HUMAN = 1  # The client's seat
+RANK_CODES = ['9', '10', 'J', 'Q', 'K', 'A']
+CARD_CODES = [RANK_CODES[card_rank(card)] + SUITS[card_suit(card)][0] for card in range(NUM_CARDS)]
+CARD_FROM_CODE = {code: card for card, code in enumerate(CARD_CODES)}
+
+# Seconds the interactive game sleeps at each step, multiplied by the table's pace
+PAUSES = {'deal': 1.5, 'trump': 1.3, 'card': 0.4, 'trick': 1.0, 'round': 2.5}
+
+
+def card_list(mask):
+    return ','.join(CARD_CODES[card] for card in cards_in(mask))
+
+
+def bid_text(action):
+    if action == PASS:
+        return 'pass'
+    if action == PICK_UP:
+        return 'pickup'
+    return SUITS[action]
+
+
+# The computer seats make the decisions of the simulate.py computer players from engine states. Bidding reads the suit
+# strengths from the hand table as computer_round does, the discard follows computer_order_up_card and
+# computer_pick_up_card, and card play sets up Card objects the way computer_trick does and asks COMPUTER_POLICY
+# Hands here are masks, so the Card lists are in card index order instead of the order the cards were dealt. Where
+# the Euchre.py functions take the first of two equally good cards in the hand, the pick can differ
+
+def computer_bid(engine, pts_to_call_suit):
+    state = engine.state
+    points = hand_strengths(cards_in(state.hands[state.turn - 1]))
+    flipped_suit = card_suit(state.flipped)
+    if state.phase == ORDER_UP:
+        if state.turn == state.dealer:
+            points[flipped_suit] += FLIPPED_CARD_POINTS[card_rank(state.flipped)]
+        return PICK_UP if points[flipped_suit] >= pts_to_call_suit else PASS
+    points[flipped_suit] = 0
+    best = points.index(max(points))
+    return best if state.turn == state.dealer or points[best] >= pts_to_call_suit else PASS
+
+
+def computer_discard(engine, rng):
+    # A dealer who picked up for themselves drops their lowest card outside the flipped card's suit (the left bower
+    # counts as outside it). computer_order_up_card looks the dealer's discard up in the bidder's hand instead, never
+    # finds it and drops a random card, so that is what a dealer who was ordered up does, as does one with no other
+    # suit
+    state = engine.state
+    hand = list(cards_in(state.hands[state.dealer - 1]))
+    off_suit = [card for card in hand if card_suit(card) != state.trump]
+    if state.caller == state.dealer and off_suit:
+        return min(off_suit, key=card_rank)
+    return rng.choice(hand)
+
+
+def computer_card(engine, deck):
+    # The card COMPUTER_POLICY plays for the seat to play. deck is a Deck whose Card objects are used for the hand
+    # and the trick
+    state = engine.state
+    seat = state.turn
+    trump = SUITS[state.trump]
+    for card in deck.all_cards:
+        card.reset()
+    hand = [deck.all_cards[card] for card in cards_in(state.hands[seat - 1])]
+    trick = [deck.all_cards[card] for card in state.trick]
+    for card in hand:
+        card.owner = seat
+    for i, card in enumerate(trick):
+        card.owner = (state.leader + i - 1) % 4 + 1
+    assign_left_bower(trump, hand + trick)
+    assign_clincher(trump, hand + trick)
+    if not trick:
+        return COMPUTER_POLICY.lead(hand)[0].index
+    assign_points(hand + trick, trump, trick[0])
+    played = Trick(trick)
+    return COMPUTER_POLICY.play_card(hand, trick[0], played, played.winner == partner_of(seat), trump)[0].index
+
+
+class ClientLeft(Exception):
+    pass
+
+
+class Table:
+    def __init__(self, number, reader, writer, pace=1.0, pts_to_call_suit=None, idle_timeout=None, rng=None):
+        self.number = number
+        self.reader = reader
+        self.writer = writer
+        self.pace = pace
+        self.pts_to_call_suit = pts_to_call_suit if pts_to_call_suit is not None else Euchre.points_to_call_suit
+        self.idle_timeout = idle_timeout  # Seconds to wait for an answer before the table is closed
+        self.rng = rng if rng is not None else random.Random()
+        self.deck = Deck()  # Card objects for the computer seats' card play
+        self.games = 0
+
+    async def send(self, line):
+        self.writer.write(line.encode() + b'\n')
+        await self.writer.drain()
+
+    async def pause(self, step):
+        if self.pace:
+            await asyncio.sleep(PAUSES[step] * self.pace)
+
+    async def ask(self, kind, options):
+        # Sends a question and waits for one of the options (case doesn't matter). Returns the option as given
+        by_text = {option.lower(): option for option in options}
+        await self.send(f'ASK {kind} {" ".join(options)}')
+        while True:
+            try:
+                line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                raise ClientLeft from None
+            if not line:
+                raise ClientLeft
+            answer = line.decode(errors='replace').strip().lower()
+            if answer == 'quit':
+                raise ClientLeft
+            if answer in by_text:
+                return by_text[answer]
+            await self.send(f'ERROR {answer!r} is not one of: {" ".join(options)}')
+
+    async def run(self):
+        await self.send(f'WELCOME {self.number}')
+        while True:
+            await self.play_game()
+            self.games += 1
+
+    async def play_game(self):
+        engine = EuchreEngine(GameState(dealer=self.rng.randint(1, 4)), self.rng)
+        state = engine.state
+        while state.phase != GAME_OVER:
+            engine.deal()
+            await self.send(f'DEAL dealer={state.dealer} up={CARD_CODES[state.flipped]} '
+                            f'hand={card_list(state.hands[HUMAN - 1])}')
+            await self.pause('deal')
+            await self.bidding(engine)
+            await self.send(f'TRUMP suit={SUITS[state.trump]} caller={state.caller}')
+            await self.pause('trump')
+
+            while state.phase == PLAY:
+                seat = state.turn
+                if seat == HUMAN:
+                    options = [CARD_CODES[card] for card in cards_in(engine.legal_plays())]
+                    card = CARD_FROM_CODE[await self.ask('play', options)]
+                else:
+                    card = computer_card(engine, self.deck)
+                winner = engine.play_card(card)
+                await self.send(f'PLAY seat={seat} card={CARD_CODES[card]}')
+                await self.pause('card')
+                if winner is not None:
+                    await self.send(f'TRICK winner={winner} tricks={state.tricks[0]}-{state.tricks[1]}')
+                    await self.pause('trick')
+
+            points = engine.score_round()
+            await self.send(f'ROUND points={points[0]}-{points[1]} score={state.points[0]}-{state.points[1]}')
+            await self.pause('round')
+        await self.send(f'GAMEOVER winner={state.winner()} score={state.points[0]}-{state.points[1]}')
+
+    async def bidding(self, engine):
+        state = engine.state
+        while state.phase in (ORDER_UP, CALL_SUIT, DISCARD):
+            if state.phase == DISCARD:
+                if state.dealer == HUMAN:
+                    await self.send(f'HAND {card_list(state.hands[HUMAN - 1])}')
+                    options = [CARD_CODES[card] for card in cards_in(state.hands[HUMAN - 1])]
+                    engine.discard(CARD_FROM_CODE[await self.ask('discard', options)])
+                    await self.send(f'HAND {card_list(state.hands[HUMAN - 1])}')
+                else:
+                    engine.discard(computer_discard(engine, self.rng))
+                continue
+
+            seat = state.turn
+            if seat == HUMAN:
+                options = [bid_text(action) for action in engine.legal_bids()]
+                answer = await self.ask('bid' if state.phase == ORDER_UP else 'call', options)
+                action = engine.legal_bids()[options.index(answer)]
+            else:
+                action = computer_bid(engine, self.pts_to_call_suit)
+            engine.bid(action)
+            await self.send(f'BID seat={seat} action={bid_text(action)}')
+
+
+class EuchreServer:
+    def __init__(self, pace=1.0, pts_to_call_suit=None, idle_timeout=None):
+        self.pace = pace
+        self.pts_to_call_suit = pts_to_call_suit
+        self.idle_timeout = idle_timeout
+        self.tables = 0  # Tables opened so far
+        self.open_tables = 0
+        self.games = 0  # Games finished on tables that have closed
+
+    async def handle(self, reader, writer):
+        self.tables += 1
+        self.open_tables += 1
+        table = Table(self.tables, reader, writer, self.pace, self.pts_to_call_suit, self.idle_timeout)
+        try:
+            await table.run()
+        except (ClientLeft, ConnectionError):
+            pass
+        finally:
+            self.open_tables -= 1
+            self.games += table.games
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        return await asyncio.start_server(self.handle, host, port, backlog=4096)
+
+
+class LoadStats:
+    def __init__(self):
+        self.games = 0
+        self.answers = 0
+        self.waits = []  # Seconds from sending an answer to the server's next line
+        self.errors = 0
+
+
+async def load_client(host, port, games, think, stats, rng):
+    # One simulated player: answers every question with a random option after thinking for up to think seconds,
+    # and leaves after playing games games
+    reader, writer = await asyncio.open_connection(host, port)
+    played = 0
+    answered = None
+    try:
+        while played < games:
+            line = await reader.readline()
+            if not line:
+                break
+            if answered is not None:
+                stats.waits.append(time.perf_counter() - answered)
+                answered = None
+            words = line.decode().split()
+            if words[0] == 'ASK':
+                if think:
+                    await asyncio.sleep(rng.random() * think)
+                writer.write(rng.choice(words[2:]).encode() + b'\n')
+                await writer.drain()
+                answered = time.perf_counter()
+                stats.answers += 1
+            elif words[0] == 'GAMEOVER':
+                played += 1
+                stats.games += 1
+            elif words[0] == 'ERROR':
+                stats.errors += 1
+        writer.write(b'QUIT\n')
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, games, think, seed=0, spawn_server=False, connect_rate=500):
+    # Connects clients simulated players, connect_rate per second, and waits for them all to finish. With
+    # spawn_server the server runs in this same event loop with no pacing (port 0 lets it pick a free port)
+    server = None
+    if spawn_server:
+        server = await EuchreServer(pace=0).start(host, port)
+        port = server.sockets[0].getsockname()[1]
+    stats = LoadStats()
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    tasks = []
+    for i in range(clients):
+        tasks.append(asyncio.create_task(load_client(host, port, games, think, stats, random.Random(rng.random()))))
+        if connect_rate and i % connect_rate == connect_rate - 1:
+            await asyncio.sleep(1)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    waits = sorted(stats.waits) or [0.0]
+    print(f'{clients} clients, {stats.games} games, {stats.answers} answers in {elapsed:.1f}s '
+          f'({stats.answers / elapsed:.0f} answers/s), {failed} failed connections, {stats.errors} errors')
+    print(f'reply time: median {waits[len(waits) // 2] * 1e3:.2f} ms, '
+          f'99th percentile {waits[int(len(waits) * 0.99)] * 1e3:.2f} ms')
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-table Euchre server and load generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='run the server')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--pace', type=float, default=1.0, help='multiplies the pauses of the interactive game')
+    serve.add_argument('--idle-timeout', type=float, default=None, help='close tables idle for this many seconds')
+    load = commands.add_parser('load', help='connect many simulated players to a server')
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=8765)
+    load.add_argument('--clients', type=int, default=1000)
+    load.add_argument('--games', type=int, default=1, help='games each client plays')
+    load.add_argument('--think', type=float, default=0.5, help='most seconds a client waits before answering')
+    load.add_argument('--spawn', action='store_true', help='run an unpaced server in the same process')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        async def serve_forever():
+            server = await EuchreServer(args.pace, idle_timeout=args.idle_timeout).start(args.host, args.port)
+            async with server:
+                await server.serve_forever()
+        asyncio.run(serve_forever())
+    else:
+        asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.think, spawn_server=args.spawn))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,302 @@
+import random
+import time
+
+import Euchre
+from Euchre import (Deck, Player, Team, Trick, assign_clincher, assign_left_bower, assign_points,
+                    computer_choose_call_suit, computer_must_call_suit, computer_order_up_card, computer_pick_up_card,
+                    computer_play_card, score_round)
+from hand_index import hand_strengths, strength_rows
+from kernel import SUIT_INDEX, mask_from_cards
+
+
+# Headless Euchre. Every seat is played by the computer_* functions from Euchre.py, nothing is printed and nothing
+# sleeps, so complete games to 11 can be run in bulk to evaluate computer strategy
+# Seats are numbered 1-4 the same way as the interactive game: seats 1 & 3 are team 1, seats 2 & 4 are team 2
+# Any seat's card play can be handed to a strategy object instead (see ismcts.py). A strategy has a
+# choose_card(view) method that is given a PlayView and returns the kernel.py index of the card to play
+# A seat can also be given a ComputerPolicy, which keeps the computer's way of playing but with any of its decision
+# functions swapped for a variant
+
+
+class RoundResult:
+    def __init__(self, dealer, flipped, caller, trump, ordered_up, tricks, points, deal=None, history=None, seed=None):
+        self.dealer = dealer  # Seat number of the dealer
+        self.flipped = flipped  # card_string of the flipped card
+        self.caller = caller  # Seat number of the player who called clincher
+        self.trump = trump  # The clincher suit for the round
+        self.ordered_up = ordered_up  # True if clincher was the flipped card's suit, False if called on the 2nd pass
+        self.tricks = tricks  # (team 1 tricks, team 2 tricks)
+        self.points = points  # (team 1 points, team 2 points) scored this round
+        self.deal = deal  # The 24 card indexes as dealt: hands of seats 1-4, then the kitty with the flipped card first
+        self.history = history  # The tricks as (seat that led, [card indexes in the order played])
+        self.seed = seed  # What random was seeded with for the round, if anything
+
+
+class GameResult:
+    def __init__(self, winner, score, rounds):
+        self.winner = winner  # 1 or 2, the team that reached 11 points first
+        self.score = score  # Final (team 1 points, team 2 points)
+        self.rounds = rounds  # List of RoundResult, in the order they were played
+
+
+class RoundContext:
+    # The public facts of a round after bidding, in kernel.py terms. history grows by one trick at a time
+    def __init__(self, dealer, flipped, ordered_up, trump, caller):
+        self.dealer = dealer  # Seat number of the dealer
+        self.flipped = flipped  # Index of the flipped card
+        self.ordered_up = ordered_up  # True if the dealer picked up the flipped card
+        self.trump = trump  # Suit index of clincher
+        self.caller = caller  # Seat number of the player who called clincher
+        self.history = []  # Finished tricks as (seat that led, [card indexes in the order played])
+
+
+class PlayView:
+    # What one seat can see when it is their turn to play: their own hand and every card played so far this round
+    def __init__(self, seat, hand, leader, trick, context, winner=None, winning_card=None):
+        self.seat = seat
+        self.hand = hand  # Mask of the cards in the seat's hand
+        self.leader = leader  # Seat that led the current trick
+        self.trick = trick  # Card indexes played to the current trick so far, in order
+        self.context = context
+        self.winner = winner  # Seat winning the current trick so far, None when leading
+        self.winning_card = winning_card  # Index of the card winning the current trick so far
+
+
+class ComputerPolicy:
+    # The functions the computer uses to play cards, e.g. ComputerPolicy(follow_suit=my_follow_suit). lead_card has the
+    # signature of Euchre.computer_lead_card. The others choose a card without removing it from the hand, with the
+    # signatures of Euchre.follow_suit_card (given the cards that follow suit), Euchre.clincher_card (returns None to
+    # discard instead) and Euchre.discard_card
+    # A function left as None is the Euchre one of that name, looked up on every call, so every policy picks up
+    # functions replaced in Euchre (profiling.enable does this)
+    def __init__(self, lead_card=None, follow_suit=None, play_clincher=None, discard_bad_card=None):
+        self.lead_card = lead_card
+        self.follow_suit = follow_suit
+        self.play_clincher = play_clincher
+        self.discard_bad_card = discard_bad_card
+
+    def lead(self, hand):
+        return (self.lead_card or Euchre.computer_lead_card)(hand)
+
+    def play_card(self, hand, lead_card, played, partner_winning, suit):
+        return computer_play_card(hand, lead_card, played, partner_winning, suit, self.follow_suit,
+                                  self.play_clincher, self.discard_bad_card)
+
+
+COMPUTER_POLICY = ComputerPolicy()
+
+
+def partner_of(seat):
+    # Teammates sit across the table from each other: 1 & 3, 2 & 4
+    return (seat + 1) % 4 + 1
+
+
+class BiddingThresholds:
+    # The points in a suit a computer player needs to bid, for each point in the bidding where they might. Positions
+    # count from the player left of the dealer (0) to the player right of the dealer (2)
+    def __init__(self, order_up=(30, 30, 30), pick_up=30, call=(30, 30, 30)):
+        self.order_up = tuple(order_up)  # First pass, telling the dealer to pick up, by position
+        self.pick_up = pick_up  # First pass, the dealer picking up the flipped card
+        self.call = tuple(call)  # Second pass, calling another suit, by position (the dealer has to call anyway)
+
+    @classmethod
+    def uniform(cls, pts_to_call_suit):
+        return cls((pts_to_call_suit,) * 3, pts_to_call_suit, (pts_to_call_suit,) * 3)
+
+    def values(self):
+        return list(self.order_up) + [self.pick_up] + list(self.call)
+
+    @classmethod
+    def from_values(cls, values):
+        return cls(values[:3], values[3], values[4:7])
+
+    def __eq__(self, other):
+        return isinstance(other, BiddingThresholds) and self.values() == other.values()
+
+    def __hash__(self):
+        return hash(tuple(self.values()))
+
+    def __repr__(self):
+        return f'BiddingThresholds(order_up={self.order_up}, pick_up={self.pick_up}, call={self.call})'
+
+
+def seat_thresholds(pts_to_call_suit, seat):
+    # pts_to_call_suit is a number for every seat and every bid, a BiddingThresholds for every seat, or a dict of
+    # either by seat number
+    if isinstance(pts_to_call_suit, dict):
+        pts_to_call_suit = pts_to_call_suit[seat]
+    if isinstance(pts_to_call_suit, BiddingThresholds):
+        return pts_to_call_suit
+    return BiddingThresholds.uniform(pts_to_call_suit)
+
+
+def computer_bidding(players, dealer_index, flipped_card, pts_to_call_suit):
+    # Runs both passes of bidding with every seat played by the computer, starting with the player left of the dealer
+    # Returns the clincher suit, the player who called it and whether it was the flipped card's suit
+    # pts_to_call_suit can be anything seat_thresholds accepts
+    dealer = players[dealer_index - 1]
+    bidders = [players[(dealer_index + i) % 4] for i in range(3)]  # Everyone except the dealer, in bidding order
+    best_suit = ''
+    if isinstance(pts_to_call_suit, int):
+        order_up = call = (pts_to_call_suit,) * 3
+        pick_up = pts_to_call_suit
+    else:
+        order_up = [seat_thresholds(pts_to_call_suit, p.number).order_up[i] for i, p in enumerate(bidders)]
+        call = [seat_thresholds(pts_to_call_suit, p.number).call[i] for i, p in enumerate(bidders)]
+        pick_up = seat_thresholds(pts_to_call_suit, dealer_index).pick_up
+
+    for i, p in enumerate(bidders):
+        p, best_suit, was_suit_picked, dealer, caller = \
+            computer_order_up_card(p, flipped_card, best_suit, dealer, order_up[i])
+        if was_suit_picked:
+            return best_suit, caller, True
+    dealer, best_suit, was_suit_picked, caller = computer_pick_up_card(dealer, flipped_card, best_suit, pick_up)
+    if was_suit_picked:
+        return best_suit, caller, True
+
+    for i, p in enumerate(bidders):
+        best_suit, was_suit_picked, caller = computer_choose_call_suit(p, flipped_card, best_suit, call[i])
+        if was_suit_picked:
+            return best_suit, caller, False
+    best_suit, was_suit_picked, caller = computer_must_call_suit(dealer, flipped_card, best_suit)  # Stick the dealer
+    return best_suit, caller, False
+
+
+def strategy_card(strategy, p, round_leader, played_cards, context):
+    # Asks a strategy object which card to play and takes it out of the player's hand
+    view = PlayView(p.number, mask_from_cards(p.hand), round_leader, [c.index for c in played_cards], context,
+                    played_cards.winner, played_cards.winning_card.index if played_cards else None)
+    index = strategy.choose_card(view)
+    for card in p.hand:
+        if card.index == index:
+            p.hand.remove(card)
+            return card
+    raise ValueError(f'{p.name} does not hold card {index}')
+
+
+def computer_trick(players, round_leader, best_suit, caller, strategies=None, context=None):
+    # Plays one trick with the same decisions play_trick makes for the computer seats. Each follower tries to follow
+    # suit, then to win with a clincher (unless their partner is already winning), then discards their worst card
+    # Seats listed in strategies (seat number -> strategy or ComputerPolicy) choose their own cards, a strategy from
+    # what context shows it
+    # Returns the seat number of the trick winner, who leads the next trick
+    if strategies is None:
+        strategies = {}
+    for p in players:
+        p.hand = assign_clincher(best_suit, p.hand)
+
+    leader = players[round_leader - 1]
+    strategy = strategies.get(round_leader, COMPUTER_POLICY)
+    if isinstance(strategy, ComputerPolicy):
+        lead_card, leader.hand = strategy.lead(leader.hand)
+    else:
+        lead_card = strategy_card(strategy, leader, round_leader, Trick(), context)
+
+    for p in players:
+        p.hand = assign_points(p.hand, best_suit, lead_card)
+    played_cards = Trick([lead_card])
+
+    for i in range(1, 4):
+        p = players[(round_leader + i - 1) % 4]
+        strategy = strategies.get(p.number, COMPUTER_POLICY)
+        if not isinstance(strategy, ComputerPolicy):
+            card = strategy_card(strategy, p, round_leader, played_cards, context)
+        else:
+            card, p.hand = strategy.play_card(p.hand, lead_card, played_cards,
+                                              played_cards.winner == partner_of(p.number), best_suit)
+        played_cards.append(card)
+
+    if context is not None:
+        context.history.append((round_leader, [c.index for c in played_cards]))
+    winner = played_cards.winner
+    players[winner - 1].tricks_won += 1
+    return winner
+
+
+def computer_round(players, deck, dealer_index, leader_index, pts_to_call_suit, strategies=None, deal=None,
+                   seed=None):
+    # Deals, bids and plays the 5 tricks of one round. Returns a RoundResult; the caller adds the points to the teams
+    # deal is an optional order of the 24 card indexes to deal from (see deals.py) instead of the shuffled deck
+    # seed, if given, reseeds random once the deck is dealt, so the round's random choices (a computer dealer's
+    # discard) come out the same whenever the same deal is played with the same seed. Nothing is printed
+    with Euchre.Quiet():
+        if deal is not None:
+            deck.deal_from(deal)
+        if seed is not None:
+            random.seed(seed)
+        for p in players:
+            deck.deal_cards(p)
+            p.tricks_won = 0
+        flipped_card = deck.flip_card()
+        dealt = [c.index for p in players for c in p.hand] + [c.index for c in deck.cards]
+
+        rows = strength_rows()
+        for p in players:
+            p.card_values = hand_strengths([c.index for c in p.hand], rows)  # Player.evaluate_cards, from the table
+        best_suit, calling_player, ordered_up = computer_bidding(players, dealer_index, flipped_card, pts_to_call_suit)
+
+        for p in players:
+            for c in p.hand:
+                c.owner = p.number
+            p.hand = assign_left_bower(best_suit, p.hand)
+
+        context = RoundContext(dealer_index, flipped_card.index, ordered_up, SUIT_INDEX[best_suit],
+                               calling_player.number)
+        for _ in range(5):
+            leader_index = computer_trick(players, leader_index, best_suit, calling_player, strategies, context)
+
+        tricks = (players[0].tricks_won + players[2].tricks_won, players[1].tricks_won + players[3].tricks_won)
+        points = score_round(tricks[0], tricks[1], calling_player.number)
+        return RoundResult(dealer_index, flipped_card.card_string, calling_player.number, best_suit, ordered_up,
+                           tricks, points, dealt, context.history, seed)
+
+
+def play_computer_game(pts_to_call_suit=None, dealer_index=None, points_to_win=11, strategies=None, deals=None):
+    # Plays a full game between 4 computer players and returns a GameResult
+    # The first dealer is chosen at random unless dealer_index is given, and the deal rotates left every round
+    # strategies optionally maps seat numbers to strategy objects that play the cards for those seats
+    # deals is an optional iterator of deals (such as deals.deal_batches) used for the rounds instead of shuffling
+    # pts_to_call_suit can also be a BiddingThresholds or a dict of thresholds by seat (see seat_thresholds)
+    # Every round gets its own seed drawn from random (kept in RoundResult.seed), so a recorded round can be replayed
+    # exactly from its deal and seed. Seeds start at 1 because game records store 0 for no seed
+    if pts_to_call_suit is None:
+        pts_to_call_suit = Euchre.points_to_call_suit
+    if dealer_index is None:
+        dealer_index = random.randint(1, 4)
+    leader_index = dealer_index % 4 + 1
+
+    players = [Player(1), Player(2), Player(3), Player(4)]
+    team1 = Team(players[0], players[2], 0, 0)
+    team2 = Team(players[1], players[3], 0, 0)
+    deck = Deck()
+    rounds = []
+
+    while team1.points < points_to_win and team2.points < points_to_win:
+        deal = next(deals) if deals is not None else None
+        result = computer_round(players, deck, dealer_index, leader_index, pts_to_call_suit, strategies, deal,
+                                random.randrange(1, 2 ** 64))
+        team1.tricks, team2.tricks = result.tricks
+        team1.points += result.points[0]
+        team2.points += result.points[1]
+        rounds.append(result)
+        dealer_index = dealer_index % 4 + 1
+        leader_index = leader_index % 4 + 1
+        deck.destroy()
+        deck.build()
+
+    winner = 1 if team1.points >= points_to_win else 2
+    return GameResult(winner, (team1.points, team2.points), rounds)
+
+
+def play_computer_games(num_games, pts_to_call_suit=None):
+    # Plays num_games games back to back and returns the list of GameResults
+    return [play_computer_game(pts_to_call_suit) for _ in range(num_games)]
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    results = play_computer_games(1000)
+    elapsed = time.perf_counter() - start
+    team1_wins = sum(1 for g in results if g.winner == 1)
+    print(f'Played {len(results)} games in {elapsed:.2f}s ({len(results) / elapsed:.0f} games/s). '
+          f'Team 1 won {team1_wins}, team 2 won {len(results) - team1_wins}')
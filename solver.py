@@ -0,0 +1,214 @@
+from kernel import EFFECTIVE_SUIT, EFFECTIVE_SUIT_MASKS, NUM_CARDS, SUIT_INDEX, TRICK_RANK, card_count, cards_in
+
+
+# Double dummy solver: with all four hands face up, works out how many tricks each team can force from a position
+# Uses alpha-beta search over card plays with a transposition table at the start of each trick. Because the deal is
+# fixed for a solver, the cards left in play (one 24-bit mask) and the seat on lead identify a position exactly
+# Seats are numbered 1-4 like the rest of the game; team 1 is seats 1 & 3. Hands are kernel.py masks
+
+
+# SUIT_ORDER[trump][suit] lists the cards that follow as suit from highest to lowest
+SUIT_ORDER = [[sorted((c for c in range(NUM_CARDS) if EFFECTIVE_SUIT[trump][c] == suit),
+                      key=lambda c: TRICK_RANK[trump][suit][c], reverse=True) for suit in range(4)]
+              for trump in range(4)]
+
+
+class DoubleDummySolver:
+    def __init__(self, hands, trump):
+        # hands is a list of 4 masks for seats 1-4, trump a suit index (0-3) or name
+        if isinstance(trump, str):
+            trump = SUIT_INDEX[trump]
+        self.hands = list(hands)
+        self.trump = trump
+        self.ranks = TRICK_RANK[trump]
+        self.effective_suit = EFFECTIVE_SUIT[trump]
+        self.suit_masks = EFFECTIVE_SUIT_MASKS[trump]
+        self.suit_order = SUIT_ORDER[trump]
+        self.lead_rank = [self.ranks[self.effective_suit[c]][c] for c in range(NUM_CARDS)]  # Rank of a card if led
+        self.table = {}  # (cards left << 2 | seat on lead) -> (lower bound, upper bound) on team 1 tricks
+        self.nodes = 0
+
+    def team1_tricks(self, leader, played=(), remaining=None):
+        # Most tricks team 1 can take from here with perfect play by both teams. leader is the seat that led the
+        # current trick, played the cards already played to it (in order) and remaining the cards still in hands
+        # The answer is found with a binary search of null window searches ("can team 1 take at least k tricks?"),
+        # which cut off far more of the tree than one wide search. Bounds are shared through the table
+        if remaining is None:
+            remaining = self.hands[0] | self.hands[1] | self.hands[2] | self.hands[3]
+        low, high = 0, (card_count(remaining) + len(played)) // 4
+        while low < high:
+            k = (low + high + 1) // 2
+            if self.root_search(leader, played, remaining, k - 1, k) >= k:
+                low = k
+            else:
+                high = k - 1
+        return low
+
+    def root_search(self, leader, played, remaining, alpha, beta):
+        if not played:
+            return self.search(remaining, leader - 1, alpha, beta)
+        led_suit = self.effective_suit[played[0]]
+        winner = 0
+        best = -1
+        for position, card in enumerate(played):
+            if self.ranks[led_suit][card] > best:
+                winner = position
+                best = self.ranks[led_suit][card]
+        return self.search_trick(remaining, leader - 1, len(played), led_suit, (leader - 1 + winner) % 4, best,
+                                 alpha, beta)
+
+    def search(self, remaining, leader, alpha, beta):
+        # Value (team 1 tricks) of the position at the start of a trick, leader is 0-3
+        if not remaining:
+            return 0
+        if card_count(remaining) == 4:
+            return self.last_trick(remaining, leader)
+        key = remaining << 2 | leader
+        entry = self.table.get(key)
+        if entry is not None:
+            lower, upper = entry
+            if lower >= beta or lower == upper:
+                return lower
+            if upper <= alpha:
+                return upper
+            alpha = max(alpha, lower)
+            beta = min(beta, upper)
+        else:
+            lower, upper = 0, card_count(remaining) // 4
+
+        value = self.search_trick(remaining, leader, 0, -1, leader, -1, alpha, beta)
+
+        if value <= alpha:
+            upper = value
+        elif value >= beta:
+            lower = value
+        else:
+            lower = upper = value
+        self.table[key] = (lower, upper)
+        return value
+
+    def search_trick(self, remaining, leader, position, led_suit, winner, best, alpha, beta):
+        # position is how many cards have been played to the trick, winner/best the seat and rank winning it so far
+        self.nodes += 1
+        seat = (leader + position) % 4
+        hand = self.hands[seat] & remaining
+        if position and hand & self.suit_masks[led_suit]:
+            hand &= self.suit_masks[led_suit]
+        maximizing = seat % 2 == 0
+        value = -1 if maximizing else 99
+
+        for card in self.order_moves(hand, remaining, position, led_suit, best):
+            left = remaining & ~(1 << card)
+            if position == 0:
+                card_led_suit = self.effective_suit[card]
+                card_winner, card_best = seat, self.ranks[card_led_suit][card]
+            else:
+                card_led_suit = led_suit
+                rank = self.ranks[led_suit][card]
+                card_winner, card_best = (seat, rank) if rank > best else (winner, best)
+
+            if position == 3:
+                won = 1 if card_winner % 2 == 0 else 0
+                result = won + self.search(left, card_winner, alpha - won, beta - won)
+            else:
+                result = self.search_trick(left, leader, position + 1, card_led_suit, card_winner, card_best,
+                                           alpha, beta)
+
+            if maximizing:
+                if result > value:
+                    value = result
+                    if value > alpha:
+                        alpha = value
+            else:
+                if result < value:
+                    value = result
+                    if value < beta:
+                        beta = value
+            if alpha >= beta:
+                break
+        return value
+
+    def last_trick(self, remaining, leader):
+        # Everyone has one card left, so there is nothing to search
+        played = [(self.hands[(leader + i) % 4] & remaining).bit_length() - 1 for i in range(4)]
+        ranks = self.ranks[self.effective_suit[played[0]]]
+        winner = 0
+        for position in range(1, 4):
+            if ranks[played[position]] > ranks[played[winner]]:
+                winner = position
+        return 1 if (leader + winner) % 2 == 0 else 0
+
+    def order_moves(self, hand, remaining, position, led_suit, best):
+        # Cards in a hand that are next to each other in a suit, once the cards already played are taken out, are
+        # worth the same, so only the highest of each run is searched. A run is also split where it crosses the card
+        # currently winning the trick
+        # Leads go highest first. When following, cards that take the lead come first (cheapest first), then the rest
+        # from lowest up, so the search finds good lines early and cuts off more of the tree
+        if hand & (hand - 1) == 0:
+            return [hand.bit_length() - 1]
+        trick_ranks = self.ranks[led_suit] if position else None
+        cards = []
+        for suit in range(4):
+            if not hand & self.suit_masks[suit]:
+                continue
+            in_run = False
+            run_wins = False
+            for card in self.suit_order[suit]:
+                if hand >> card & 1:
+                    wins = position and trick_ranks[card] > best
+                    if not in_run or wins != run_wins:
+                        cards.append(card)
+                    in_run = True
+                    run_wins = wins
+                elif remaining >> card & 1:
+                    in_run = False
+
+        if position == 0:
+            cards.sort(key=self.lead_rank.__getitem__, reverse=True)
+        else:
+            cards.sort(key=lambda c: (trick_ranks[c] <= best, trick_ranks[c] if trick_ranks[c] > best else c % 6))
+        return cards
+
+
+def solve(hands, trump, leader, played=()):
+    # Returns (team 1 tricks, team 2 tricks) that each team can force from the position, with perfect play
+    # hands are masks for seats 1-4, trump a suit index or name and leader the seat (1-4) that leads the trick
+    solver = DoubleDummySolver(hands, trump)
+    remaining = hands[0] | hands[1] | hands[2] | hands[3]
+    tricks_left = (card_count(remaining) + len(played)) // 4
+    team1 = solver.team1_tricks(leader, played, remaining)
+    return team1, tricks_left - team1
+
+
+def solve_players(players, best_suit, leader_index):
+    # Solves the round for 4 Player objects after bidding, the way play_round sets it up
+    hands = [0, 0, 0, 0]
+    for i, p in enumerate(players):
+        for c in p.hand:
+            hands[i] |= 1 << c.index
+    return solve(hands, best_suit, leader_index)
+
+
+def card_values(hands, trump, leader, played=()):
+    # For the seat to play next, returns {card: team 1 tricks with perfect play after playing it} for each legal card
+    # Comparing a heuristic's choice against the best of these grades it against optimal play
+    solver = DoubleDummySolver(hands, trump)
+    hand = hands[(leader - 1 + len(played)) % 4]
+    legal = hand & solver.suit_masks[solver.effective_suit[played[0]]] if played else hand
+    if not legal:
+        legal = hand
+
+    remaining = hands[0] | hands[1] | hands[2] | hands[3]
+    values = {}
+    for card in cards_in(legal):
+        after = list(played) + [card]
+        left = remaining & ~(1 << card)
+        if len(after) == 4:
+            ranks = solver.ranks[solver.effective_suit[after[0]]]
+            winner = max(range(4), key=lambda position: ranks[after[position]])
+            winning_seat = (leader - 1 + winner) % 4 + 1
+            won = 1 if winning_seat in (1, 3) else 0
+            values[card] = won + solver.team1_tricks(winning_seat, (), left)
+        else:
+            values[card] = solver.team1_tricks(leader, after, left)
+    return values
@@ -0,0 +1,94 @@
+import numpy as np
+
+from deals import UP_CARD, encode_deals, encode_hands
+from kernel import NUM_CARDS, card_rank, card_suit, same_color_suit
+
+
+# Suit symmetry. Renaming the suits changes nothing in the rules as long as the two suits of each color stay a pair
+# (the left bower is the Jack of the other suit of the same color): swap Clubs and Spades, swap Diamonds and Hearts,
+# swap the colors, or any mix of those. That is a group of 8 suit permutations, so up to 8 deals or positions play
+# out exactly the same way with the suits renamed, and a cache or table only needs one of them, the canonical one
+# Anything decided by the rules and by card ranks alone is the same for all 8 (the double dummy solver, trick
+# winners, evaluate_cards strengths). The computer players break ties between equal suits and cards by suit order,
+# so their choices can differ between two symmetric deals when there is a tie
+#
+# A symmetry is a number 0-7 (0 leaves everything alone). map_card, map_mask and map_suit apply one, and
+# INVERSE[g] undoes g, e.g. to turn a card chosen in the canonical position back into the real one
+
+# SUIT_PERMUTATIONS[g][suit] is the suit that suit becomes
+SUIT_PERMUTATIONS = [(a, b, same_color_suit(b), same_color_suit(a)) for a in range(4) for b in range(4)
+                     if a != b and a != same_color_suit(b)]
+
+INVERSE = [SUIT_PERMUTATIONS.index(tuple(permutation.index(suit) for suit in range(4)))
+           for permutation in SUIT_PERMUTATIONS]
+
+# CARD_MAPS[g][card] is the card that card becomes, also as an array for mapping batches of deals
+CARD_MAPS = [[permutation[card_suit(card)] * 6 + card_rank(card) for card in range(NUM_CARDS)]
+             for permutation in SUIT_PERMUTATIONS]
+CARD_MAP_ARRAY = np.array(CARD_MAPS, dtype=np.int8)
+
+# A mask is mapped 12 bits (2 suits) at a time: MASK_MAPS[g][0][low 12 bits] | MASK_MAPS[g][1][high 12 bits]
+MASK_MAPS = [[[sum(1 << card_map[card + 12 * half] for card in range(12) if bits >> card & 1) for bits in range(4096)]
+              for half in range(2)] for card_map in CARD_MAPS]
+
+# The 2 symmetries that turn each suit into Clubs. Every orbit has a member with the up card (or trump) in Clubs
+TO_CLUBS = [[g for g, permutation in enumerate(SUIT_PERMUTATIONS) if permutation[suit] == 0] for suit in range(4)]
+TO_CLUBS_ARRAY = np.array(TO_CLUBS, dtype=np.int8)
+
+
+def map_suit(suit, g):
+    return SUIT_PERMUTATIONS[g][suit]
+
+
+def map_card(card, g):
+    return CARD_MAPS[g][card]
+
+
+def map_mask(mask, g):
+    low, high = MASK_MAPS[g]
+    return low[mask & 0xfff] | high[mask >> 12]
+
+
+def map_deal(deal, g):
+    card_map = CARD_MAPS[g]
+    return [card_map[card] for card in deal]
+
+
+def canonical_deal(deal):
+    # Returns (deal number of the canonical deal, g), where g is the symmetry that turns deal into it (decode the
+    # number with deals.decode_deal). The canonical deal is the one with the lowest number, so its up card is a Club
+    # and only the 2 symmetries that make it one need trying
+    # With the same up card, deal numbers compare the same way as the seats' hand masks do, seat 1 first (a hand's
+    # colex rank grows with its mask), so only the winner needs encoding
+    hands = [0, 0, 0, 0]
+    for position in range(20):
+        hands[position // 5] |= 1 << deal[position]
+    first, second = TO_CLUBS[card_suit(deal[UP_CARD])]
+    first_hands = [map_mask(hand, first) for hand in hands]
+    second_hands = [map_mask(hand, second) for hand in hands]
+    if second_hands < first_hands:
+        return encode_hands(CARD_MAPS[second][deal[UP_CARD]], second_hands), second
+    return encode_hands(CARD_MAPS[first][deal[UP_CARD]], first_hands), first
+
+
+def canonical_deals(deals):
+    # Vectorized canonical_deal for an (N, 24) array. Returns (N,) int64 deal numbers and (N,) symmetries
+    deals = np.asarray(deals)
+    first, second = TO_CLUBS_ARRAY[deals[:, UP_CARD] // 6].T
+    first_codes = encode_deals(CARD_MAP_ARRAY[first[:, None], deals])
+    second_codes = encode_deals(CARD_MAP_ARRAY[second[:, None], deals])
+    use_first = first_codes <= second_codes
+    return np.where(use_first, first_codes, second_codes), np.where(use_first, first, second)
+
+
+def canonical_position(hands, trump, trick=()):
+    # A mid-round position: hands are masks (any number of them, in seat order), trump the clincher suit and trick
+    # the cards played to the current trick so far. Returns (hands, trick, g) for the canonical position, which
+    # always has Clubs as clincher. Seats don't change, so anything kept by seat (leader, caller, scores) goes with
+    # the result as it is
+    best = None
+    for g in TO_CLUBS[trump]:
+        key = tuple(map_mask(hand, g) for hand in hands), tuple(CARD_MAPS[g][card] for card in trick)
+        if best is None or key < best[:2]:
+            best = key + (g,)
+    return best
@@ -0,0 +1,42 @@
+import numpy as np
+
+import Euchre
+from Euchre import Deck, Player
+from bidding import POSITIONS, bid_deals
+from deals import random_deals
+from hand_index import hand_strengths
+from kernel import SUIT_INDEX
+from simulate import BiddingThresholds, computer_bidding
+
+THRESHOLDS = [
+    30,
+    BiddingThresholds(order_up=(26, 33, 29), pick_up=24, call=(35, 22, 28)),
+    {1: 27, 2: BiddingThresholds((32, 30, 28), 31, (24, 26, 38)), 3: 34, 4: BiddingThresholds.uniform(21)},
+]
+
+
+def computer_bids(deal, dealer, pts_to_call_suit, deck):
+    # (caller, trump, ordered up) from simulate.computer_bidding on Player objects dealt the deal
+    players = [Player(1), Player(2), Player(3), Player(4)]
+    deck.deal_from(deal)
+    for p in players:
+        deck.deal_cards(p)
+        p.card_values = hand_strengths([c.index for c in p.hand])
+    suit, caller, ordered_up = computer_bidding(players, dealer, deck.flip_card(), pts_to_call_suit)
+    return caller.number, SUIT_INDEX[suit], ordered_up
+
+
+def test_bid_deals_matches_computer_bidding():
+    deck = Deck()
+    deals = random_deals(3000, np.random.default_rng(23))
+    dealers = np.random.default_rng(24).integers(1, 5, len(deals))
+    with Euchre.Quiet():
+        for pts_to_call_suit in THRESHOLDS:
+            bids = bid_deals(deals, dealers, pts_to_call_suit)
+            stuck = 0
+            for i, deal in enumerate(deals.tolist()):
+                expected = computer_bids(deal, int(dealers[i]), pts_to_call_suit, deck)
+                assert (bids.callers[i], bids.trumps[i], bids.ordered_up[i]) == expected
+                stuck += not expected[2] and expected[0] == dealers[i]
+            assert bids.stuck.sum() == stuck
+            assert set(bids.caller_positions.tolist()) == set(range(len(POSITIONS)))
@@ -0,0 +1,77 @@
+import random
+import sys
+
+import numpy as np
+
+from bidding import SOLVER_TABLE
+from cache import ENTRY_OVERHEAD, LRUCache, round_key
+from deals import random_deals
+from symmetry import map_deal, map_suit
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LRUCache(max_entries=3)
+    for key in range(3):
+        cache.put(key, str(key))
+    assert cache.get(0) == '0'  # 1 is now the least recently used
+    cache.put(3, '3')
+    assert 1 not in cache and len(cache) == 3
+    assert [cache.get(key) for key in (0, 2, 3)] == ['0', '2', '3']
+    assert cache.get(1) is None
+    assert cache.counters()['evictions'] == 1
+    assert (cache.hits, cache.misses) == (4, 1)
+
+
+def test_max_bytes_limits_the_memory_tier():
+    value = 'x' * 1000
+    size = sys.getsizeof(0) + sys.getsizeof(value) + ENTRY_OVERHEAD
+    cache = LRUCache(max_bytes=3 * size)
+    for key in range(10):
+        cache.put(key, value)
+        assert cache.bytes <= 3 * size
+    assert len(cache) == 3 and 9 in cache
+    assert cache.bytes == sum(entry[1] for entry in cache.entries.values())
+    cache.put(9, 'y')  # Replacing an entry gives back the old size
+    assert cache.bytes == sum(entry[1] for entry in cache.entries.values())
+    big = LRUCache(max_bytes=10)
+    big.put(1, value)
+    assert 1 in big  # The newest entry is kept even when it alone is over the limit
+
+
+def test_disk_tier_outlives_the_cache(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    with LRUCache(max_entries=2, path=path, table=SOLVER_TABLE) as cache:
+        for key in range(5):
+            cache.put(key, {'tricks': key})
+        assert cache.get(0) == {'tricks': 0}  # Evicted from memory, still pending for disk
+        assert cache.disk_hits == 1
+    with LRUCache(path=path, table=SOLVER_TABLE) as cache:
+        assert cache.get(3) == {'tricks': 3}
+        assert cache.counters()['disk_hits'] == 1
+        assert 3 in cache  # Disk hits are brought into memory
+    with LRUCache(path=path, table='solved_rounds_v0') as cache:
+        assert cache.get(3) is None  # Another version's table doesn't share entries
+
+
+def test_get_or_compute_caches_none():
+    cache = LRUCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute('key', lambda: calls.append(1)) is None
+    assert len(calls) == 1
+    assert cache.get_or_compute('other', lambda: 7) == 7
+    assert cache.get_or_compute('other', lambda: 8) == 7
+
+
+def test_round_key_is_shared_by_suit_renamings():
+    rng = random.Random(4)
+    for deal in random_deals(100, np.random.default_rng(4)).tolist():
+        dealer = rng.randint(1, 4)
+        trump = rng.randrange(4)
+        ordered_up = rng.random() < 0.5
+        key, g = round_key(deal, dealer, trump, ordered_up)
+        for h in range(8):
+            assert round_key(map_deal(deal, h), dealer, map_suit(trump, h), ordered_up)[0] == key
+        assert round_key(deal, dealer, None, ordered_up)[0] != key
+        assert round_key(deal, dealer % 4 + 1, trump, ordered_up)[0] != key
+        assert round_key(map_deal(deal, g), dealer, map_suit(trump, g), ordered_up)[0] == key
@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from Euchre import score_round
+from engine import (CALL_SUIT, DEAL, DISCARD, GAME_OVER, ORDER_UP, PASS, PICK_UP, PLAY, ROUND_OVER, EuchreEngine,
+                    GameState, next_seat)
+from kernel import NUM_CARDS, SUIT_INDEX, card_suit, cards_in
+from simulate import play_computer_game
+
+
+def dealt_engine(dealer=1, seed=0):
+    engine = EuchreEngine(GameState(dealer), random.Random(seed))
+    engine.deal()
+    return engine
+
+
+def play_out(engine):
+    # Plays the lowest legal card for every seat until the round is over
+    while engine.state.phase == PLAY:
+        engine.play_card(min(cards_in(engine.legal_plays())))
+
+
+def test_illegal_deals():
+    engine = dealt_engine()
+    with pytest.raises(ValueError):
+        engine.deal()
+    with pytest.raises(ValueError):
+        EuchreEngine().deal([0] * NUM_CARDS)
+    with pytest.raises(ValueError):
+        EuchreEngine().deal(list(range(23)))
+
+
+def test_illegal_bids_and_discards():
+    engine = dealt_engine()
+    state = engine.state
+    flipped_suit = card_suit(state.flipped)
+    with pytest.raises(ValueError):
+        engine.bid(flipped_suit)  # Suits are only named on the 2nd pass
+    with pytest.raises(ValueError):
+        engine.discard(next(cards_in(state.hands[state.dealer - 1])))
+    with pytest.raises(ValueError):
+        engine.play_card(next(cards_in(state.hands[state.turn - 1])))
+    with pytest.raises(ValueError):
+        engine.score_round()
+    for _ in range(4):
+        engine.bid(PASS)
+    assert state.phase == CALL_SUIT
+    with pytest.raises(ValueError):
+        engine.bid(PICK_UP)
+    with pytest.raises(ValueError):
+        engine.bid(flipped_suit)  # The turned down suit can't be called
+
+
+def test_discard_must_come_from_the_dealers_hand():
+    engine = dealt_engine(dealer=2)
+    state = engine.state
+    engine.bid(PICK_UP)
+    assert state.phase == DISCARD and state.turn == 2
+    dealer_hand = state.hands[1]
+    assert dealer_hand >> state.flipped & 1
+    with pytest.raises(ValueError):
+        engine.discard(next(cards_in(state.hands[0])))
+    card = next(cards_in(dealer_hand))
+    engine.discard(card)
+    assert state.kitty >> card & 1
+    assert state.phase == PLAY and state.turn == 3
+    with pytest.raises(ValueError):
+        engine.discard(card)
+
+
+def test_must_follow_suit():
+    rng = random.Random(3)
+    checked = 0
+    while checked < 50:
+        engine = dealt_engine(seed=rng.random())
+        engine.bid(PASS)
+        engine.bid(PASS)
+        engine.bid(PASS)
+        engine.bid(PASS)
+        engine.bid(next(suit for suit in range(4) if suit != card_suit(engine.state.flipped)))
+        state = engine.state
+        engine.play_card(min(cards_in(engine.legal_plays())))
+        hand = state.hands[state.turn - 1]
+        illegal = hand & ~engine.legal_plays()
+        if illegal:
+            checked += 1
+            with pytest.raises(ValueError):
+                engine.play_card(next(cards_in(illegal)))
+        with pytest.raises(ValueError):
+            engine.play_card(state.trick[0])
+
+
+def test_stick_the_dealer():
+    engine = dealt_engine(dealer=3)
+    state = engine.state
+    for seat in (4, 1, 2, 3):
+        assert state.turn == seat
+        engine.bid(PASS)
+    for seat in (4, 1, 2):
+        assert PASS in engine.legal_bids()
+        engine.bid(PASS)
+    assert state.turn == 3
+    assert PASS not in engine.legal_bids()
+    with pytest.raises(ValueError):
+        engine.bid(PASS)
+    suit = engine.legal_bids()[0]
+    engine.bid(suit)
+    assert state.caller == 3 and state.trump == suit and not state.ordered_up
+    assert state.phase == PLAY and state.leader == 4
+
+
+def test_round_scoring_matches_score_round():
+    rng = random.Random(4)
+    for _ in range(200):
+        engine = dealt_engine(dealer=rng.randint(1, 4), seed=rng.random())
+        state = engine.state
+        while state.phase in (ORDER_UP, CALL_SUIT):
+            engine.bid(rng.choice(engine.legal_bids()))
+        if state.phase == DISCARD:
+            engine.discard(rng.choice(list(cards_in(state.hands[state.dealer - 1]))))
+        caller = state.caller
+        play_out(engine)
+        assert state.phase == ROUND_OVER
+        assert sum(state.tricks) == 5
+        before = list(state.points)
+        points = engine.score_round()
+        assert points == score_round(state.tricks[0], state.tricks[1], caller)
+        assert state.points == [before[0] + points[0], before[1] + points[1]]
+        assert state.phase in (DEAL, GAME_OVER)
+
+
+def test_engine_agrees_with_simulated_rounds():
+    # Plays the rounds of computer games through the engine: every bid, discard and card must be legal, and the
+    # tricks and points must come out the same
+    random.seed(5)
+    for _ in range(20):
+        for result in play_computer_game().rounds:
+            engine = EuchreEngine(GameState(result.dealer))
+            engine.deal(result.deal)
+            state = engine.state
+            seat = next_seat(result.dealer)
+            while seat != result.caller or (not result.ordered_up and state.phase == ORDER_UP):
+                engine.bid(PASS)
+                seat = next_seat(seat)
+            engine.bid(PICK_UP if result.ordered_up else SUIT_INDEX[result.trump])
+            if result.ordered_up:
+                played = {card for _, cards in result.history for card in cards}
+                engine.discard(next(card for card in cards_in(state.hands[result.dealer - 1]) if card not in played))
+            for leader, cards in result.history:
+                assert state.leader == leader
+                for card in cards:
+                    engine.play_card(card)
+            assert tuple(state.tricks) == tuple(result.tricks)
+            assert engine.score_round() == tuple(result.points)
@@ -0,0 +1,63 @@
+import os
+import random
+
+import numpy as np
+
+import Euchre
+from Euchre import Deck, Player
+from hand_index import (NUM_HANDS, build_table, hand_rank, hand_strengths, hand_unrank, load_table, rank_hands,
+                        strength_rows)
+from kernel import NUM_CARDS, SUITS
+
+
+def player_with(deck, cards):
+    p = Player(1)
+    p.hand = [deck.all_cards[card] for card in cards]
+    return p
+
+
+def test_ranks_round_trip():
+    rng = random.Random(2)
+    hands = np.array([rng.sample(range(NUM_CARDS), 5) for _ in range(1000)])
+    ranks = rank_hands(hands)
+    for hand, rank in zip(hands.tolist(), ranks.tolist()):
+        assert rank == hand_rank(hand)
+        assert hand_unrank(rank) == sorted(hand)
+    assert (rank_hands(hands.reshape(-1, 4, 5)) == ranks.reshape(-1, 4)).all()
+
+
+def test_strengths_match_evaluate_cards():
+    table = load_table()
+    deck = Deck()
+    for rank in range(NUM_HANDS):
+        p = player_with(deck, hand_unrank(rank))
+        assert table[rank, :4].tolist() == p.evaluate_cards()
+    rows = strength_rows()
+    for rank in range(0, NUM_HANDS, 97):
+        hand = hand_unrank(rank)
+        assert hand_strengths(reversed(hand), rows) == player_with(deck, hand).evaluate_cards()
+
+
+def test_called_suits_match_computer_bidding():
+    table = load_table()
+    deck = Deck()
+    with Euchre.Quiet():
+        for rank in range(0, NUM_HANDS, 7):
+            hand = hand_unrank(rank)
+            for turned_down in range(4):
+                flipped = deck.all_cards[turned_down * 6]
+                p = player_with(deck, hand)
+                p.evaluate_cards()
+                called = Euchre.computer_must_call_suit(p, flipped, None)[0]
+                assert SUITS[table[rank, 4 + turned_down]] == called
+                p.evaluate_cards()
+                suit, was_called, _ = Euchre.computer_choose_call_suit(p, flipped, None, 0)
+                assert was_called and suit == called
+
+
+def test_build_table_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'table.npy')
+    table = build_table(path)
+    assert os.listdir(tmp_path) == ['table.npy']
+    assert (np.load(path) == load_table()).all()
+    assert (table == load_table()).all()
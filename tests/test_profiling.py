@@ -0,0 +1,44 @@
+import random
+import sys
+import types
+
+import pytest
+
+import Euchre
+import profiling
+import simulate
+
+
+@pytest.fixture
+def outside_module():
+    # A module from outside the project holding its own reference to an instrumented function
+    module = types.ModuleType('outside_module')
+    module.score_round = Euchre.score_round
+    sys.modules[module.__name__] = module
+    yield module
+    del sys.modules[module.__name__]
+    profiling.disable()
+
+
+def test_enable_patches_project_modules_only(outside_module):
+    original = Euchre.score_round
+    stats = profiling.enable()
+    assert profiling.enabled()
+    assert Euchre.score_round is not original and Euchre.score_round.__wrapped__ is original
+    assert outside_module.score_round is original
+    random.seed(1)
+    simulate.play_computer_game()
+    assert stats.calls['Euchre.score_round'] > 0
+    assert stats.phase_calls[profiling.BIDDING] > 0
+    profiling.disable()
+    assert Euchre.score_round is original
+    assert not profiling.enabled()
+
+
+def test_enable_with_a_module_list(outside_module):
+    original = Euchre.score_round
+    profiling.enable(modules=['outside_module'])
+    assert outside_module.score_round is not original
+    assert Euchre.score_round is not original  # The defining module is always patched
+    profiling.disable()
+    assert outside_module.score_round is original
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from deals import decode_deal, encode_deal
+from engine import PICK_UP, PLAY, EuchreEngine, GameState
+from kernel import cards_in
+from records import (HEADER, MAGIC, ROUND, GameRecordWriter, RoundRecord, deal_order, ordered_deal, read_records,
+                     round_from_state)
+
+
+def test_deal_order_round_trip():
+    rng = random.Random(1)
+    deal = list(range(24))
+    for _ in range(200):
+        rng.shuffle(deal)
+        assert ordered_deal(decode_deal(encode_deal(deal)), deal_order(deal)) == deal
+
+
+def test_records_survive_a_file(tmp_path):
+    path = str(tmp_path / 'round.bin')
+    deal = list(range(23, -1, -1))
+    seeded = RoundRecord(3, encode_deal(deal), 2, 1, 4, 0, bytes(range(20)), (0, 2), deal_order(deal), 2 ** 64 - 1)
+    unseeded = RoundRecord(3, encode_deal(deal), 3, 5, 1, 2, bytes(range(20)), (4, 0), deal_order(deal))
+    with GameRecordWriter(path) as writer:
+        writer.write_round(seeded)
+        writer.write_round(unseeded)
+    first, second = read_records(path)
+    assert first.cards() == deal
+    assert first.seed == seeded.seed
+    assert first.points == (0, 2)
+    assert second.seed is None
+    assert (second.dealer, second.passes, second.caller, second.trump) == (3, 5, 1, 2)
+    assert not second.ordered_up
+
+
+def test_engine_rounds_have_no_seed():
+    engine = EuchreEngine(GameState(1), random.Random(2))
+    engine.deal()
+    state = engine.state
+    engine.bid(PICK_UP)
+    engine.discard(min(cards_in(state.hands[0])))
+    while state.phase == PLAY:
+        engine.play_card(min(cards_in(engine.legal_plays())))
+    engine.score_round()
+    record = round_from_state(0, state)
+    assert record.seed is None
+    assert RoundRecord.unpack(record.pack()).seed is None
+    assert (record.dealer, record.passes, record.caller) == (1, 0, 2)
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(HEADER.pack(MAGIC, 2, ROUND.size))
+    with pytest.raises(ValueError):
+        list(read_records(str(path)))
+    with pytest.raises(ValueError):
+        GameRecordWriter(str(path))
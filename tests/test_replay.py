@@ -0,0 +1,40 @@
+import Euchre
+from farm import run_simulation
+from records import plays_bytes, read_records
+from replay import Replayer, compare, replay
+
+
+def recorded_games(tmp_path, games=20):
+    path = str(tmp_path / 'games.bin')
+    run_simulation(games, master_seed=5, workers=1, record_path=path)
+    return path
+
+
+def test_replay_reproduces_recorded_games(tmp_path):
+    rounds = 0
+    for record, result in replay(recorded_games(tmp_path)):
+        rounds += 1
+        assert record.cards() == result.deal
+        assert plays_bytes(result.history) == record.plays
+        assert tuple(result.points) == record.points
+        assert result.caller == record.caller
+    assert rounds > 20
+
+
+def test_compare_same_players_changes_nothing(tmp_path):
+    path = recorded_games(tmp_path, 5)
+    comparison = compare(path)
+    assert comparison.rounds == len(list(read_records(path)))
+    assert comparison.changed == 0
+    assert comparison.summary()['team1_gain_per_round'] == 0
+
+
+def test_replay_round_leaves_verbose_alone(tmp_path):
+    record = next(read_records(recorded_games(tmp_path, 1)))
+    verbose = Euchre.verbose
+    try:
+        Euchre.verbose = True
+        Replayer().replay_round(record)
+        assert Euchre.verbose is True
+    finally:
+        Euchre.verbose = verbose
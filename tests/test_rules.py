@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+import Euchre
+from Euchre import Deck, Trick, assign_clincher, assign_left_bower, assign_points, determine_trick_winner
+from kernel import (CARD_STRINGS, EFFECTIVE_SUIT, NUM_CARDS, SUITS, TRICK_RANK, legal_plays, mask_from_cards,
+                    trick_winner)
+
+
+# The kernel.py rules checked against the Card based functions in Euchre.py they replace
+
+
+@pytest.fixture
+def no_sleep(monkeypatch, capsys):
+    monkeypatch.setattr(Euchre.time, 'sleep', lambda seconds: None)
+
+
+def trick_cards(deck, indexes, trump):
+    # Card objects for the cards of a trick, played by seats 1-4 in order, with clincher and points assigned
+    for card in deck.all_cards:
+        card.reset()
+    cards = [deck.all_cards[i] for i in indexes]
+    for seat, card in enumerate(cards, 1):
+        card.owner = seat
+        card.show()
+    best = SUITS[trump]
+    assign_left_bower(best, cards)
+    assign_clincher(best, cards)
+    assign_points(cards, best, cards[0])
+    return cards
+
+
+def dict_points(best, lead_suit):
+    # The point tables assign_points used to build for every trick: a dict of card strings for clincher, updated with
+    # the suit of the 1st card (less its Jack when that is the left bower)
+    other = {'Clubs': 'Spades', 'Spades': 'Clubs', 'Diamonds': 'Hearts', 'Hearts': 'Diamonds'}[best]
+    clincher = {f'Jack of {best}': 13, f'Jack of {other}': 12, f'Ace of {best}': 11, f'King of {best}': 10,
+                f'Queen of {best}': 9, f'10 of {best}': 8, f'9 of {best}': 7}
+    lead = {f'Ace of {lead_suit}': 6, f'King of {lead_suit}': 5, f'Queen of {lead_suit}': 4,
+            f'Jack of {lead_suit}': 3, f'10 of {lead_suit}': 2, f'9 of {lead_suit}': 1}
+    if lead_suit == other:
+        lead.pop(f'Jack of {lead_suit}')
+    if lead_suit != best:
+        clincher.update(lead)
+    return clincher
+
+
+def test_trick_rank_matches_dict_points():
+    deck = Deck()
+    for trump in range(4):
+        for lead_card in range(NUM_CARDS):
+            lead_suit = EFFECTIVE_SUIT[trump][lead_card]
+            points = dict_points(SUITS[trump], SUITS[lead_suit])
+            for card in range(NUM_CARDS):
+                assert TRICK_RANK[trump][lead_suit][card] == points.get(CARD_STRINGS[card], 0)
+            cards = trick_cards(deck, [lead_card] + [card for card in range(NUM_CARDS) if card != lead_card], trump)
+            assert [card.point for card in cards] == [points.get(card.card_string, 0) for card in cards]
+
+
+def test_trick_winner_matches_determine_trick_winner(no_sleep):
+    rng = random.Random(4)
+    deck = Deck()
+    for _ in range(3000):
+        indexes = rng.sample(range(NUM_CARDS), 4)
+        trump = rng.randrange(4)
+        cards = trick_cards(deck, indexes, trump)
+        assert trick_winner(indexes, trump) + 1 == determine_trick_winner(cards)
+        assert Trick(cards).winner == determine_trick_winner(cards)
+
+
+def test_legal_plays_matches_following_cards():
+    rng = random.Random(5)
+    deck = Deck()
+    for _ in range(3000):
+        indexes = rng.sample(range(NUM_CARDS), 6)
+        trump = rng.randrange(4)
+        cards = trick_cards(deck, indexes, trump)
+        lead, hand = cards[0], cards[1:]
+        following = Euchre.following_cards(lead, hand)
+        legal = legal_plays(mask_from_cards(hand), trump, EFFECTIVE_SUIT[trump][lead.index])
+        assert legal == mask_from_cards(following or hand)
+
+
+def test_playable_cards_are_the_legal_plays():
+    rng = random.Random(6)
+    deck = Deck()
+    for _ in range(3000):
+        indexes = rng.sample(range(NUM_CARDS), 1 + rng.randint(1, 5))
+        trump = rng.randrange(4)
+        cards = trick_cards(deck, indexes, trump)
+        lead, hand = cards[0], cards[1:]
+        playable = Euchre.playable_cards(lead, hand)
+        assert mask_from_cards(playable) == legal_plays(mask_from_cards(hand), trump, EFFECTIVE_SUIT[trump][lead.index])
+        assert all(card in hand for card in playable)
+
+
+def test_trick_tracks_the_best_card_played():
+    rng = random.Random(7)
+    deck = Deck()
+    for _ in range(3000):
+        cards = trick_cards(deck, rng.sample(range(NUM_CARDS), 4), rng.randrange(4))
+        trick = Trick()
+        for card in cards:
+            trick.append(card)
+            assert trick.winning_card is Euchre.best_card_played(trick)
+            assert trick.winner == trick.winning_card.owner
+
+
+def test_clincher_card_reads_the_tracked_winner():
+    # Clubs are trump. The 9 of Hearts is led, the 2nd seat trumps with the Ace of Clubs and the 3rd throws off a
+    # Spade. Comparing only the last card with the lead (the old rule) takes the 9 of Hearts for the winner, so the
+    # last seat would trump its partner's trick with the King of Clubs; the tracked winner is the partner's Ace
+    deck = Deck()
+    cards = trick_cards(deck, [12, 5, 18, 4, 7], 0)
+    trick = Trick(cards[:3])
+    hand = cards[3:]
+    last_against_lead = trick[-1] if trick[-1].point > trick[0].point else trick[0]
+    assert last_against_lead is cards[0]
+    assert trick.winning_card is cards[1] and trick.winner == 2
+    assert Euchre.clincher_card(hand, trick) is None
+    # With the lead still winning, the King of Clubs is the lowest card that takes it
+    trick = Trick([cards[0]])
+    assert Euchre.clincher_card(hand, trick) is cards[3]
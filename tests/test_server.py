@@ -0,0 +1,67 @@
+import asyncio
+import random
+
+from Euchre import Deck
+from engine import DISCARD, PICK_UP, PLAY, EuchreEngine, GameState
+from kernel import SUIT_INDEX, cards_in
+from server import computer_bid, computer_card, computer_discard, run_load
+from simulate import play_computer_game
+
+
+def sorted_deals(rng):
+    # Deals with every hand in card index order, the order server.py's computer seats hold their cards in
+    while True:
+        deal = list(range(24))
+        rng.shuffle(deal)
+        yield [card for start in range(0, 20, 5) for card in sorted(deal[start:start + 5])] + deal[20:]
+
+
+def test_computer_seats_match_simulated_players():
+    # Plays simulated rounds again through the engine with the server's computer seats deciding: they must bid, pick
+    # up and play the cards the simulate.py computer players did. A dealer who picks up holds the flipped card last,
+    # so their cards aren't compared, and one who was ordered up drops a random card
+    rng = random.Random(11)
+    deck = Deck()
+    plays = 0
+    for _ in range(30):
+        for result in play_computer_game(pts_to_call_suit=30, deals=sorted_deals(rng)).rounds:
+            engine = EuchreEngine(GameState(result.dealer))
+            engine.deal(result.deal)
+            state = engine.state
+            while state.phase not in (PLAY, DISCARD):
+                engine.bid(computer_bid(engine, 30))
+            assert (state.caller, state.trump, state.ordered_up) == \
+                   (result.caller, SUIT_INDEX[result.trump], result.ordered_up)
+            played = {card for _, cards in result.history for card in cards}
+            if state.phase == DISCARD:
+                discard = next(card for card in cards_in(state.hands[result.dealer - 1]) if card not in played)
+                if result.caller == result.dealer:
+                    assert computer_discard(engine, rng) == discard
+                engine.discard(discard)
+            skip = result.dealer if result.ordered_up else None
+            for _, cards in result.history:
+                for card in cards:
+                    if state.turn != skip:
+                        assert computer_card(engine, deck) == card
+                        plays += 1
+                    engine.play_card(card)
+    assert plays > 3000
+
+
+def test_computer_discard_when_ordered_up_is_random():
+    rng = random.Random(12)
+    discards = set()
+    for _ in range(60):
+        engine = EuchreEngine(GameState(4), random.Random(5))
+        engine.deal()
+        engine.bid(PICK_UP)
+        discards.add(computer_discard(engine, rng))
+    assert discards == set(cards_in(engine.state.hands[3]))
+
+
+def test_load_generator_plays_full_games(capsys):
+    stats = asyncio.run(run_load('127.0.0.1', 0, clients=4, games=2, think=0, seed=3, spawn_server=True))
+    assert stats.games == 8
+    assert stats.errors == 0
+    assert stats.answers > 0 and len(stats.waits) == stats.answers
+    assert '4 clients, 8 games' in capsys.readouterr().out
@@ -0,0 +1,21 @@
+import random
+
+import Euchre
+from simulate import play_computer_game
+
+
+def test_headless_game_leaves_verbose_alone():
+    random.seed(1)
+    assert Euchre.verbose
+    game = play_computer_game()
+    assert max(game.score) >= 11
+    assert Euchre.verbose
+
+
+def test_quiet_restores_verbose():
+    with Euchre.Quiet():
+        assert not Euchre.verbose
+        with Euchre.Quiet():
+            assert not Euchre.verbose
+        assert not Euchre.verbose
+    assert Euchre.verbose
@@ -0,0 +1,69 @@
+import random
+
+from kernel import EFFECTIVE_SUIT, NUM_CARDS, cards_in, legal_plays, trick_winner
+from solver import card_values, solve
+
+
+# The solver against plain minimax over every legal play, on small deals where that is quick enough
+
+
+def minimax(hands, trump, leader, played=()):
+    # Team 1 tricks from the position with perfect play: seats 1 & 3 maximize, seats 2 & 4 minimize
+    hands = list(hands)
+    if len(played) == 4:
+        winner = (leader - 1 + trick_winner(list(played), trump)) % 4 + 1
+        return (winner in (1, 3)) + minimax(hands, trump, winner)
+    seat = (leader - 1 + len(played)) % 4
+    if not hands[seat]:
+        return 0
+    led_suit = EFFECTIVE_SUIT[trump][played[0]] if played else None
+    results = []
+    for card in cards_in(legal_plays(hands[seat], trump, led_suit)):
+        hands[seat] &= ~(1 << card)
+        results.append(minimax(hands, trump, leader, tuple(played) + (card,)))
+        hands[seat] |= 1 << card
+    return max(results) if seat in (0, 2) else min(results)
+
+
+def random_position(rng, hand_size, to_play):
+    # Hands of hand_size cards, then to_play random legal cards played to the first trick
+    cards = rng.sample(range(NUM_CARDS), 4 * hand_size)
+    hands = [sum(1 << card for card in cards[i:i + hand_size]) for i in range(0, 4 * hand_size, hand_size)]
+    trump = rng.randrange(4)
+    leader = rng.randint(1, 4)
+    played = []
+    for _ in range(to_play):
+        seat = (leader - 1 + len(played)) % 4
+        led_suit = EFFECTIVE_SUIT[trump][played[0]] if played else None
+        card = rng.choice(list(cards_in(legal_plays(hands[seat], trump, led_suit))))
+        hands[seat] &= ~(1 << card)
+        played.append(card)
+    return hands, trump, leader, played
+
+
+def test_solve_matches_minimax_from_the_lead():
+    rng = random.Random(8)
+    for hand_size in (1, 2, 3, 3, 4):
+        for _ in range(40 if hand_size < 4 else 10):
+            hands, trump, leader, _ = random_position(rng, hand_size, 0)
+            team1, team2 = solve(hands, trump, leader)
+            assert team1 == minimax(hands, trump, leader)
+            assert team1 + team2 == hand_size
+
+
+def test_solve_matches_minimax_mid_trick():
+    rng = random.Random(9)
+    for _ in range(150):
+        hands, trump, leader, played = random_position(rng, 3, rng.randint(1, 3))
+        assert solve(hands, trump, leader, played)[0] == minimax(hands, trump, leader, played)
+
+
+def test_card_values_match_minimax():
+    rng = random.Random(10)
+    for _ in range(60):
+        hands, trump, leader, played = random_position(rng, 3, rng.randint(0, 3))
+        seat = (leader - 1 + len(played)) % 4
+        for card, value in card_values(hands, trump, leader, played).items():
+            after = list(hands)
+            after[seat] &= ~(1 << card)
+            assert value == minimax(after, trump, leader, played + [card])
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+
+from deals import encode_deal, random_deals
+from kernel import NUM_CARDS, card_rank, card_suit, same_color_suit
+from symmetry import (INVERSE, SUIT_PERMUTATIONS, canonical_deal, canonical_deals, canonical_position, map_card,
+                      map_deal, map_mask, map_suit)
+
+
+def compose(g, h):
+    # The symmetry that applies h, then g
+    return SUIT_PERMUTATIONS.index(tuple(map_suit(map_suit(suit, h), g) for suit in range(4)))
+
+
+def test_permutations_keep_colors_paired():
+    assert len(set(SUIT_PERMUTATIONS)) == 8
+    assert SUIT_PERMUTATIONS[0] == (0, 1, 2, 3)
+    for g in range(8):
+        for suit in range(4):
+            assert map_suit(same_color_suit(suit), g) == same_color_suit(map_suit(suit, g))
+
+
+def test_group_closure_and_inverse():
+    for g in range(8):
+        assert compose(g, INVERSE[g]) == 0
+        assert compose(INVERSE[g], g) == 0
+        for h in range(8):
+            compose(g, h)  # Raises ValueError if the product is not one of the 8
+
+
+def test_map_card_and_mask():
+    rng = random.Random(3)
+    for g in range(8):
+        for card in range(NUM_CARDS):
+            mapped = map_card(card, g)
+            assert card_rank(mapped) == card_rank(card)
+            assert card_suit(mapped) == map_suit(card_suit(card), g)
+            assert map_card(mapped, INVERSE[g]) == card
+        for _ in range(100):
+            mask = rng.getrandbits(NUM_CARDS)
+            assert map_mask(mask, g) == sum(1 << map_card(card, g) for card in range(NUM_CARDS) if mask >> card & 1)
+            assert map_mask(map_mask(mask, g), INVERSE[g]) == mask
+
+
+def test_canonical_deal_is_lowest_image():
+    for deal in random_deals(300, np.random.default_rng(5)).tolist():
+        code, g = canonical_deal(deal)
+        assert code == min(encode_deal(map_deal(deal, h)) for h in range(8))
+        assert code == encode_deal(map_deal(deal, g))
+        for h in range(8):
+            assert canonical_deal(map_deal(deal, h))[0] == code
+
+
+def test_canonical_deals_matches_canonical_deal():
+    deals = random_deals(500, np.random.default_rng(6))
+    codes, symmetries = canonical_deals(deals)
+    for deal, code, g in zip(deals.tolist(), codes.tolist(), symmetries.tolist()):
+        assert (code, g) == canonical_deal(deal)
+
+
+def test_canonical_position_has_clubs_trump():
+    rng = random.Random(7)
+    for _ in range(200):
+        cards = rng.sample(range(NUM_CARDS), 13)
+        hands = [sum(1 << card for card in cards[i:i + 4]) for i in range(0, 12, 4)]
+        trump = rng.randrange(4)
+        trick = cards[12:]
+        mapped_hands, mapped_trick, g = canonical_position(hands, trump, trick)
+        assert map_suit(trump, g) == 0
+        assert list(mapped_hands) == [map_mask(hand, g) for hand in hands]
+        assert list(mapped_trick) == [map_card(card, g) for card in trick]
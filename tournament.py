@@ -0,0 +1,175 @@
+import argparse
+import math
+import random
+import time
+
+import Euchre
+from ismcts import ISMCTSPlayer
+from kernel import NUM_CARDS
+from simulate import ComputerPolicy, play_computer_game
+
+
+# Round robin tournament between named strategy configurations, each playing as a partnership (seats 1 & 3 against
+# seats 2 & 4)
+# Games are played in mirrored pairs: both games of a pair use the same deals and the same randomness, and the
+# partnerships swap seats for the second game, so each side plays both sets of cards. The first dealer rotates from
+# pair to pair. A pairing is scored by pair: 1 if the first entrant won both games, 0.5 for a split, 0 for two losses
+#
+# Instead of a fixed number of games, a pairing stops as soon as it is decided: every check_every pairs the confidence
+# interval of the mean pair score is worked out with z_stop (wider than the 95% interval that is reported, because
+# the result is looked at many times). It stops when the interval is entirely above or below 0.5, or when it is
+# narrower than margin around 0.5 (the entrants are even), or at max_pairs
+
+
+class Entrant:
+    def __init__(self, name, strategy=None, pts_to_call_suit=None):
+        # strategy is what simulate.play_computer_game accepts for a seat: a ComputerPolicy, or an object with a
+        # choose_card(view) method. None is the standard computer player
+        # pts_to_call_suit is the entrant's bidding, a number or a simulate.BiddingThresholds. None is the default
+        self.name = name
+        self.strategy = strategy if strategy is not None else ComputerPolicy()
+        self.pts_to_call_suit = pts_to_call_suit
+
+
+# Named configurations that can be picked from the command line
+ENTRANTS = {
+    'computer': lambda: Entrant('computer'),
+    'ismcts': lambda: Entrant('ismcts', ISMCTSPlayer(iterations=200, time_limit=None, rng=random.Random(1))),
+}
+
+
+class PairingResult:
+    def __init__(self, first, second):
+        self.first = first  # Entrant names
+        self.second = second
+        self.pair_scores = []  # Score of each mirrored pair for first (0, 0.5 or 1)
+        self.decision = None  # Name of the better entrant, 'even' or 'undecided'
+        self.seconds = 0.0
+
+    @property
+    def pairs(self):
+        return len(self.pair_scores)
+
+    @property
+    def games(self):
+        return 2 * len(self.pair_scores)
+
+    @property
+    def win_rate(self):
+        # first's share of the games
+        return sum(self.pair_scores) / max(self.pairs, 1)
+
+    def interval(self, z=1.96):
+        # Normal confidence interval for first's win rate, from the spread of the pair scores
+        n = self.pairs
+        mean = self.win_rate
+        if n < 2:
+            return 0.0, 1.0
+        variance = sum((score - mean) ** 2 for score in self.pair_scores) / (n - 1)
+        half_width = z * math.sqrt(variance / n)
+        return max(0.0, mean - half_width), min(1.0, mean + half_width)
+
+    def summary(self):
+        low, high = self.interval()
+        return {
+            'first': self.first,
+            'second': self.second,
+            'games': self.games,
+            'win_rate': round(self.win_rate, 4),
+            'ci95': [round(low, 4), round(high, 4)],
+            'decision': self.decision,
+            'seconds': round(self.seconds, 2),
+        }
+
+
+def seeded_deals(seed):
+    # Endless stream of deals (24 card indexes, see deals.py) that only depends on seed
+    rng = random.Random(seed)
+    cards = list(range(NUM_CARDS))
+    while True:
+        rng.shuffle(cards)
+        yield list(cards)
+
+
+def play_pair(first, second, seed, dealer_index, pts_to_call_suit=None):
+    # Plays the two mirrored games of a pair and returns first's score for the pair. pts_to_call_suit is the bidding
+    # of entrants that don't have their own
+    if pts_to_call_suit is None:
+        pts_to_call_suit = Euchre.points_to_call_suit
+    wins = 0
+    for first_seats, second_seats in (((1, 3), (2, 4)), ((2, 4), (1, 3))):
+        strategies = {}
+        thresholds = {}
+        for seats, entrant in ((first_seats, first), (second_seats, second)):
+            for seat in seats:
+                strategies[seat] = entrant.strategy
+                thresholds[seat] = entrant.pts_to_call_suit if entrant.pts_to_call_suit is not None \
+                    else pts_to_call_suit
+        random.seed(f'pair:{seed}')
+        game = play_computer_game(thresholds, dealer_index, strategies=strategies, deals=seeded_deals(seed))
+        if (game.winner == 1) == (first_seats == (1, 3)):
+            wins += 1
+    return wins / 2
+
+
+def run_pairing(first, second, seed=0, min_pairs=20, max_pairs=2000, check_every=10, z_stop=3.0, margin=0.02,
+                pts_to_call_suit=None):
+    # Plays mirrored pairs between two entrants until the result is decided. Returns a PairingResult
+    result = PairingResult(first.name, second.name)
+    start = time.perf_counter()
+    while result.pairs < max_pairs:
+        pair = result.pairs
+        result.pair_scores.append(play_pair(first, second, f'{seed}:{pair}', pair % 4 + 1, pts_to_call_suit))
+        if result.pairs < min_pairs or result.pairs % check_every:
+            continue
+        low, high = result.interval(z_stop)
+        if low > 0.5:
+            result.decision = first.name
+        elif high < 0.5:
+            result.decision = second.name
+        elif high - low < 2 * margin and abs(result.win_rate - 0.5) < margin:
+            result.decision = 'even'
+        if result.decision is not None:
+            break
+    if result.decision is None:
+        result.decision = 'undecided'
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_tournament(entrants, seed=0, **pairing_options):
+    # Round robin between all the entrants. Returns the PairingResults and the standings as (name, average win rate)
+    # from best to worst
+    results = []
+    for i, first in enumerate(entrants):
+        for second in entrants[i + 1:]:
+            results.append(run_pairing(first, second, seed, **pairing_options))
+
+    rates = {entrant.name: [] for entrant in entrants}
+    for result in results:
+        rates[result.first].append(result.win_rate)
+        rates[result.second].append(1 - result.win_rate)
+    standings = sorted(((name, sum(r) / max(len(r), 1)) for name, r in rates.items()), key=lambda s: -s[1])
+    return results, standings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Round robin tournament between computer strategies')
+    parser.add_argument('entrants', nargs='+', choices=sorted(ENTRANTS), help='strategies to play')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-pairs', type=int, default=2000, help='most mirrored pairs per pairing')
+    parser.add_argument('--margin', type=float, default=0.02, help='win rates this close to 50%% count as even')
+    args = parser.parse_args()
+
+    entrants = [ENTRANTS[name]() for name in args.entrants]
+    results, standings = run_tournament(entrants, args.seed, max_pairs=args.max_pairs, margin=args.margin)
+    for result in results:
+        s = result.summary()
+        print(f'{s["first"]} vs {s["second"]}: {s["win_rate"]:.1%} over {s["games"]} games '
+              f'(95% CI {s["ci95"][0]:.1%}-{s["ci95"][1]:.1%}), {s["decision"]}, {s["seconds"]}s')
+    for name, rate in standings:
+        print(f'{name:20} {rate:.1%}')
+
+
+if __name__ == '__main__':
+    main()